@@ -1,5 +1,6 @@
 """Agents for analyzing different aspects of Spark jobs"""
 
+from typing import Callable, Dict
 from agents.metadata_agent import MetadataAgent
 from agents.partition_agent import PartitionAgent
 from agents.runtime_agent import RuntimeAgent
@@ -7,11 +8,31 @@ from agents.skew_agent import SkewAgent
 from agents.delta_agent import DeltaAgent
 from agents.cost_agent import CostAgent
 
+
+def create_default_agents() -> Dict[str, Callable]:
+    """
+    Create the standard optimization agents.
+    
+    Returns:
+        Agents keyed by their graph node name
+    """
+    agents = [
+        MetadataAgent(),
+        PartitionAgent(),
+        RuntimeAgent(),
+        SkewAgent(),
+        DeltaAgent(),
+        CostAgent()
+    ]
+    return {agent.name: agent for agent in agents}
+
+
 __all__ = [
     "MetadataAgent",
     "PartitionAgent",
     "RuntimeAgent",
     "SkewAgent",
     "DeltaAgent",
-    "CostAgent"
+    "CostAgent",
+    "create_default_agents"
 ]
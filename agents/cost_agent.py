@@ -1,12 +1,61 @@
 """Agent for cost analysis and optimization"""
 
 import logging
-from orchestration.state_model import AgentState
+from typing import Any, Dict
+import numpy as np
+from orchestration.job_batch import BatchUpdate, JobBatch
+from orchestration.state_model import AgentState, AgentUpdate
 
 logger = logging.getLogger(__name__)
 
+# Simulated prices shared by the per-job and batch paths
+CPU_COST_PER_SECOND = 0.10
+MEMORY_COST_PER_GB_SECOND = 0.05
+SAVINGS_PERCENTAGE = 30
+CORE_COST_PER_HOUR = 0.05
 
-async def cost_agent(state: AgentState) -> AgentState:
+# Share of executor time spent without a running task that is reported
+IDLE_EXECUTOR_SHARE = 0.3
+LOW_SLOT_UTILIZATION = 0.5
+
+_SAVINGS_TEXT = "Estimated cost savings: $%.2f (" + f"{SAVINGS_PERCENTAGE}%%)"
+
+
+def _savings_recommendation(total_cost: float) -> str:
+    """Recommendation text for a job's estimated cost"""
+    return _SAVINGS_TEXT % (total_cost * SAVINGS_PERCENTAGE / 100)
+
+
+def _idle_update(timeline: Dict[str, Any]) -> AgentUpdate:
+    """Findings for the idle capacity of a job's executor timeline"""
+    recommendations = []
+    issues = []
+    executor_ms = timeline.get("executor_ms", 0)
+    idle_share = timeline.get("idle_executor_ms", 0) / executor_ms if executor_ms else 0.0
+    
+    if idle_share >= IDLE_EXECUTOR_SHARE:
+        idle_cost = timeline["idle_core_ms"] / 3_600_000 * CORE_COST_PER_HOUR
+        issues.append({
+            "type": "cost",
+            "severity": "warning",
+            "description": (
+                f"Executors were idle for {timeline['idle_executor_ms'] / 1000:.0f} executor-seconds "
+                f"({idle_share:.0%} of their lifetime), costing ${idle_cost:.2f}"
+            )
+        })
+        recommendations.append(
+            "Enable spark.dynamicAllocation.enabled so idle executors are released"
+        )
+    if timeline.get("slot_ms") and timeline.get("slot_utilization", 0) < LOW_SLOT_UTILIZATION:
+        recommendations.append(
+            f"Task slots were busy {timeline['slot_utilization']:.0%} of the time - "
+            f"reduce spark.executor.instances or spark.executor.cores"
+        )
+    
+    return {"recommendations": recommendations, "issues_detected": issues}
+
+
+async def cost_agent(state: AgentState) -> AgentUpdate:
     """
     Analyze and optimize costs.
     
@@ -14,46 +63,98 @@ async def cost_agent(state: AgentState) -> AgentState:
         state: Current workflow state
         
     Returns:
-        Updated state with cost analysis
+        Partial state update with cost analysis
     """
     logger.info(f"CostAgent: Analyzing costs for job {state.get('job_id')}")
     
+    recommendations = []
+    issues = []
+    
     try:
-        cpu_util = state.get("cpu_utilization", 0)
+        timeline = state.get("executor_timeline")
+        if timeline:
+            # Measured slot occupancy replaces the reported utilization
+            cpu_util = timeline.get("slot_utilization", 0)
+            idle = _idle_update(timeline)
+            recommendations.extend(idle["recommendations"])
+            issues.extend(idle["issues_detected"])
+        else:
+            cpu_util = state.get("cpu_utilization", 0)
         exec_time = state.get("execution_time_ms", 0)
         memory_mb = state.get("memory_used_mb", 0)
         
         # Calculate estimated costs (simulated)
-        cpu_cost = cpu_util * exec_time / 1000 * 0.10
-        memory_cost = memory_mb / 1024 * exec_time / 1000 * 0.05
+        cpu_cost = cpu_util * exec_time / 1000 * CPU_COST_PER_SECOND
+        memory_cost = memory_mb / 1024 * exec_time / 1000 * MEMORY_COST_PER_GB_SECOND
         total_cost = cpu_cost + memory_cost
         
         # Provide cost optimization recommendations
-        savings_percentage = 30
-        state["recommendations"].append(
-            f"Estimated cost savings: ${total_cost * savings_percentage / 100:.2f} ({savings_percentage}%)"
-        )
+        recommendations.append(_savings_recommendation(total_cost))
         
-        logger.info(f"CostAgent: Cost analysis completed, estimated savings: {savings_percentage}%")
+        logger.info(f"CostAgent: Cost analysis completed, estimated savings: {SAVINGS_PERCENTAGE}%")
         
     except Exception as e:
         logger.error(f"CostAgent: Error analyzing costs: {str(e)}")
-        state["issues_detected"].append({
+        issues.append({
             "type": "cost",
             "severity": "error",
             "description": str(e)
         })
     
-    return state
+    return {"recommendations": recommendations, "issues_detected": issues}
+
+
+def cost_agent_batch(batch: JobBatch) -> BatchUpdate:
+    """
+    Analyze costs for a whole batch of jobs.
+    
+    Costs are computed on the metric columns at once; only the per-job
+    recommendation text is formatted job by job. Jobs with an executor
+    timeline use its slot utilization and get their own idle findings.
+    
+    Args:
+        batch: Columnar job metrics
+        
+    Returns:
+        BatchUpdate equivalent to running cost_agent on every job
+    """
+    logger.info(f"CostAgent: Analyzing costs for a batch of {len(batch)} jobs")
+    
+    codes = np.zeros(len(batch), dtype=np.int64)
+    templates = [{"recommendations": [], "issues_detected": []}]
+    cpu_util = batch.cpu_utilization
+    if batch.executor_timeline is not None:
+        cpu_util = cpu_util.copy()
+        for index, timeline in enumerate(batch.executor_timeline):
+            if timeline:
+                cpu_util[index] = timeline.get("slot_utilization", 0)
+                codes[index] = len(templates)
+                templates.append(_idle_update(timeline))
+    
+    # Same operation order as cost_agent so both paths round identically
+    exec_time = batch.execution_time_ms
+    cpu_cost = cpu_util * exec_time / 1000 * CPU_COST_PER_SECOND
+    memory_cost = batch.memory_used_mb / 1024 * exec_time / 1000 * MEMORY_COST_PER_GB_SECOND
+    total_cost = cpu_cost + memory_cost
+    savings = total_cost * SAVINGS_PERCENTAGE / 100
+    
+    return BatchUpdate(
+        codes=codes,
+        templates=templates,
+        job_recommendations=list(map(_SAVINGS_TEXT.__mod__, savings.tolist()))
+    )
 
 
 class CostAgent:
     """LangGraph-compatible cost agent wrapper"""
     
+    reads = ("cpu_utilization", "execution_time_ms", "memory_used_mb", "executor_timeline")
+    
     def __init__(self):
         """Initialize cost agent"""
         self.name = "cost_agent"
+        self.version = "1.1.0"
     
-    async def __call__(self, state: AgentState) -> AgentState:
+    async def __call__(self, state: AgentState) -> AgentUpdate:
         """Call the agent"""
         return await cost_agent(state)
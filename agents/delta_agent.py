@@ -1,12 +1,12 @@
 """Agent for analyzing Delta Lake operations"""
 
 import logging
-from orchestration.state_model import AgentState
+from orchestration.state_model import AgentState, AgentUpdate
 
 logger = logging.getLogger(__name__)
 
 
-async def delta_agent(state: AgentState) -> AgentState:
+async def delta_agent(state: AgentState) -> AgentUpdate:
     """
     Analyze Delta Lake operations.
     
@@ -14,37 +14,43 @@ async def delta_agent(state: AgentState) -> AgentState:
         state: Current workflow state
         
     Returns:
-        Updated state with Delta-specific recommendations
+        Partial state update with Delta-specific recommendations
     """
     logger.info(f"DeltaAgent: Analyzing Delta Lake operations for {state.get('table_name')}")
     
+    recommendations = []
+    issues = []
+    
     try:
         # Check if table uses Delta format
         if state.get("source_type") == "delta":
-            state["recommendations"].append("Enable Delta Lake Z-ordering for faster scans")
-            state["recommendations"].append("Run OPTIMIZE command to compact small files")
-            state["recommendations"].append("Configure auto-compaction for WRITE operations")
+            recommendations.append("Enable Delta Lake Z-ordering for faster scans")
+            recommendations.append("Run OPTIMIZE command to compact small files")
+            recommendations.append("Configure auto-compaction for WRITE operations")
             
             logger.info("DeltaAgent: Delta Lake recommendations generated")
         
     except Exception as e:
         logger.error(f"DeltaAgent: Error analyzing Delta operations: {str(e)}")
-        state["issues_detected"].append({
+        issues.append({
             "type": "delta",
             "severity": "error",
             "description": str(e)
         })
     
-    return state
+    return {"recommendations": recommendations, "issues_detected": issues}
 
 
 class DeltaAgent:
     """LangGraph-compatible Delta Lake agent wrapper"""
     
+    reads = ("source_type",)
+    
     def __init__(self):
         """Initialize delta agent"""
         self.name = "delta_agent"
+        self.version = "1.0.0"
     
-    async def __call__(self, state: AgentState) -> AgentState:
+    async def __call__(self, state: AgentState) -> AgentUpdate:
         """Call the agent"""
         return await delta_agent(state)
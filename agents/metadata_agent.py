@@ -2,12 +2,12 @@
 
 import logging
 from typing import Optional
-from orchestration.state_model import AgentState
+from orchestration.state_model import AgentState, AgentUpdate
 
 logger = logging.getLogger(__name__)
 
 
-async def metadata_agent(state: AgentState) -> AgentState:
+async def metadata_agent(state: AgentState) -> AgentUpdate:
     """
     Analyze table metadata.
     
@@ -15,10 +15,12 @@ async def metadata_agent(state: AgentState) -> AgentState:
         state: Current workflow state
         
     Returns:
-        Updated state with metadata information
+        Partial state update with metadata information
     """
     logger.info(f"MetadataAgent: Analyzing metadata for {state.get('table_name')}")
     
+    update: AgentUpdate = {}
+    
     try:
         # Extract schema information
         schema_info = {
@@ -33,27 +35,30 @@ async def metadata_agent(state: AgentState) -> AgentState:
             "size_gb": 2.5
         }
         
-        state["schema_info"] = schema_info
+        update["schema_info"] = schema_info
         logger.info(f"MetadataAgent: Found {len(schema_info['columns'])} columns")
         
     except Exception as e:
         logger.error(f"MetadataAgent: Error analyzing metadata: {str(e)}")
-        state["issues_detected"].append({
+        update["issues_detected"] = [{
             "type": "metadata",
             "severity": "error",
             "description": str(e)
-        })
+        }]
     
-    return state
+    return update
 
 
 class MetadataAgent:
     """LangGraph-compatible metadata agent wrapper"""
     
+    reads = ("table_name",)
+    
     def __init__(self):
         """Initialize metadata agent"""
         self.name = "metadata_agent"
+        self.version = "1.0.0"
     
-    async def __call__(self, state: AgentState) -> AgentState:
+    async def __call__(self, state: AgentState) -> AgentUpdate:
         """Call the agent"""
         return await metadata_agent(state)
@@ -1,12 +1,131 @@
 """Agent for analyzing partition strategy"""
 
 import logging
-from orchestration.state_model import AgentState
+from typing import Any, Dict
+import numpy as np
+from orchestration.job_batch import BatchUpdate, JobBatch
+from orchestration.state_model import AgentState, AgentUpdate
 
 logger = logging.getLogger(__name__)
 
+# Thresholds shared by the per-job and batch paths
+MIN_PARTITIONS = 10
+MAX_PARTITIONS = 1000
 
-async def partition_agent(state: AgentState) -> AgentState:
+# Shuffle findings: partition counts this far from the recommended one, and
+# stages waiting this share of their run time on shuffle fetches
+PARTITION_MISMATCH_FACTOR = 2
+HIGH_FETCH_WAIT_SHARE = 0.2
+
+# Partition strategies in batch code order
+STRATEGIES = ("unpartitioned", "under-partitioned", "over-partitioned", "optimal")
+
+
+def _partition_strategy(partition_count: int) -> str:
+    """Classify a partition count"""
+    if partition_count == 0:
+        return "unpartitioned"
+    elif partition_count < MIN_PARTITIONS:
+        return "under-partitioned"
+    elif partition_count > MAX_PARTITIONS:
+        return "over-partitioned"
+    return "optimal"
+
+
+def _partition_update(strategy: str) -> AgentUpdate:
+    """Findings for one partition strategy"""
+    recommendations = []
+    issues = []
+    
+    if strategy == "unpartitioned":
+        issues.append({
+            "type": "partition",
+            "severity": "warning",
+            "description": "No partition information available"
+        })
+    elif strategy == "under-partitioned":
+        recommendations.append("Increase partition count for better parallelism")
+    elif strategy == "over-partitioned":
+        recommendations.append("Consider reducing partition count to avoid overhead")
+    
+    return {"recommendations": recommendations, "issues_detected": issues, "partition_strategy": strategy}
+
+
+def _gb(size: float) -> str:
+    return f"{size / 1024 ** 3:.1f} GB"
+
+
+def _shuffle_update(analysis: Dict[str, Any]) -> AgentUpdate:
+    """Findings for the per-stage shuffle and spill of a job's event log"""
+    recommendations = []
+    issues = []
+    stages = analysis.get("stages") or {}
+    recommended = analysis.get("recommended_shuffle_partitions")
+    
+    sizing = stages.get(analysis.get("sizing_stage"))
+    if recommended and sizing and sizing["partitions"]:
+        ratio = recommended / sizing["partitions"]
+        if ratio >= PARTITION_MISMATCH_FACTOR or ratio <= 1 / PARTITION_MISMATCH_FACTOR:
+            issues.append({
+                "type": "partition",
+                "severity": "warning",
+                "stage": str(sizing["stage_id"]),
+                "description": (
+                    f"Stage {sizing['stage_id']} reads {_gb(sizing['shuffle_read_bytes'])} of shuffle data "
+                    f"in {sizing['partitions']} partitions "
+                    f"({sizing['shuffle_read_bytes'] / sizing['partitions'] / 1024 ** 2:.0f} MB each)"
+                )
+            })
+            recommendations.append(f"Set spark.sql.shuffle.partitions to {recommended}")
+    
+    spilled = [stage for stage in stages.values() if stage["disk_spilled_bytes"]]
+    for stage in spilled:
+        issues.append({
+            "type": "spill",
+            "severity": "warning",
+            "stage": str(stage["stage_id"]),
+            "description": (
+                f"Stage {stage['stage_id']} spilled {_gb(stage['disk_spilled_bytes'])} to disk "
+                f"({_gb(stage['memory_spilled_bytes'])} in memory)"
+            )
+        })
+    if spilled:
+        recommendations.append(
+            "Shuffle partitions do not fit in execution memory - use more partitions "
+            "or raise spark.executor.memory"
+        )
+    
+    waiting = [stage for stage in stages.values() if stage["fetch_wait_share"] >= HIGH_FETCH_WAIT_SHARE]
+    for stage in waiting:
+        issues.append({
+            "type": "shuffle",
+            "severity": "info",
+            "stage": str(stage["stage_id"]),
+            "description": (
+                f"Stage {stage['stage_id']} spent {stage['fetch_wait_share']:.0%} of its run time "
+                f"waiting for shuffle blocks"
+            )
+        })
+    if waiting:
+        recommendations.append(
+            "Raise spark.reducer.maxSizeInFlight and check the shuffle service and network load"
+        )
+    
+    return {"recommendations": recommendations, "issues_detected": issues}
+
+
+def _combine(first: AgentUpdate, second: AgentUpdate) -> AgentUpdate:
+    """Findings of two updates, in order, keeping the first's other keys"""
+    combined = dict(first)
+    combined["recommendations"] = first["recommendations"] + second["recommendations"]
+    combined["issues_detected"] = first["issues_detected"] + second["issues_detected"]
+    return combined
+
+
+_NO_FINDINGS: AgentUpdate = {"recommendations": [], "issues_detected": []}
+
+
+async def partition_agent(state: AgentState) -> AgentUpdate:
     """
     Analyze partition strategy.
     
@@ -14,50 +133,79 @@ async def partition_agent(state: AgentState) -> AgentState:
         state: Current workflow state
         
     Returns:
-        Updated state with partition recommendations
+        Partial state update with partition recommendations
     """
     logger.info(f"PartitionAgent: Analyzing partitions for {state.get('table_name')}")
     
     try:
         partition_count = state.get("partition_count", 0)
+        analysis = state.get("shuffle_analysis")
         
-        # Analyze partition count
-        if partition_count == 0:
-            state["issues_detected"].append({
-                "type": "partition",
-                "severity": "warning",
-                "description": "No partition information available"
-            })
-            state["partition_strategy"] = "unpartitioned"
-        elif partition_count < 10:
-            state["recommendations"].append("Increase partition count for better parallelism")
-            state["partition_strategy"] = "under-partitioned"
-        elif partition_count > 1000:
-            state["recommendations"].append("Consider reducing partition count to avoid overhead")
-            state["partition_strategy"] = "over-partitioned"
+        # Analyze partition count; jobs routed here only for their shuffle
+        # analysis have no partition count to classify
+        if partition_count > 0 or not analysis:
+            update = _partition_update(_partition_strategy(partition_count))
         else:
-            state["partition_strategy"] = "optimal"
+            update = _NO_FINDINGS
+        if analysis:
+            update = _combine(update, _shuffle_update(analysis))
         
-        logger.info(f"PartitionAgent: Strategy identified: {state.get('partition_strategy')}")
+        logger.info(f"PartitionAgent: Strategy identified: {update.get('partition_strategy')}")
         
     except Exception as e:
         logger.error(f"PartitionAgent: Error analyzing partitions: {str(e)}")
-        state["issues_detected"].append({
-            "type": "partition",
-            "severity": "error",
-            "description": str(e)
-        })
+        update = {
+            "recommendations": [],
+            "issues_detected": [{
+                "type": "partition",
+                "severity": "error",
+                "description": str(e)
+            }]
+        }
     
-    return state
+    return update
+
+
+def partition_agent_batch(batch: JobBatch) -> BatchUpdate:
+    """
+    Analyze partition strategy for a whole batch of jobs.
+    
+    Args:
+        batch: Columnar job metrics
+        
+    Returns:
+        BatchUpdate equivalent to running partition_agent on every job,
+        coded by position in STRATEGIES (or past it for jobs with a
+        shuffle analysis)
+    """
+    logger.info(f"PartitionAgent: Analyzing partitions for a batch of {len(batch)} jobs")
+    
+    counts = batch.partition_count
+    codes = np.select(
+        [counts == 0, counts < MIN_PARTITIONS, counts > MAX_PARTITIONS],
+        [0, 1, 2],
+        default=3
+    )
+    templates = [_partition_update(s) for s in STRATEGIES]
+    # Jobs with a shuffle analysis get their own template
+    for index, analysis in enumerate(batch.shuffle_analysis or ()):
+        if analysis:
+            base = templates[codes[index]] if counts[index] > 0 else _NO_FINDINGS
+            templates.append(_combine(base, _shuffle_update(analysis)))
+            codes[index] = len(templates) - 1
+    return BatchUpdate(codes=codes, templates=templates)
 
 
 class PartitionAgent:
     """LangGraph-compatible partition agent wrapper"""
     
+    reads = ("partition_count", "shuffle_analysis")
+    
     def __init__(self):
         """Initialize partition agent"""
         self.name = "partition_agent"
+        self.version = "1.1.0"
     
-    async def __call__(self, state: AgentState) -> AgentState:
+    async def __call__(self, state: AgentState) -> AgentUpdate:
         """Call the agent"""
         return await partition_agent(state)
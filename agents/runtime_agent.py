@@ -1,12 +1,150 @@
 """Agent for predicting and optimizing runtime"""
 
 import logging
-from orchestration.state_model import AgentState
+from typing import Any, Dict
+import numpy as np
+from orchestration.job_batch import BatchUpdate, JobBatch
+from orchestration.state_model import AgentState, AgentUpdate
 
 logger = logging.getLogger(__name__)
 
+# Thresholds shared by the per-job and batch paths
+LONG_EXECUTION_MS = 60000  # > 1 minute
+LOW_CPU_UTILIZATION = 0.5
+HIGH_CPU_UTILIZATION = 0.95
+HIGH_MEMORY_MB = 8192
 
-async def runtime_agent(state: AgentState) -> AgentState:
+# A single straggler taking this share of the critical path is reported
+DOMINANT_TASK_SHARE = 0.5
+
+
+def _runtime_update(long_running: bool, low_cpu: bool, high_cpu: bool, high_memory: bool) -> AgentUpdate:
+    """Findings for one combination of threshold outcomes"""
+    recommendations = []
+    issues = []
+    
+    if long_running:
+        issues.append({
+            "type": "runtime",
+            "severity": "warning",
+            "description": "Long execution time detected"
+        })
+        recommendations.append("Consider caching intermediate results")
+        recommendations.append("Enable adaptive query execution")
+    
+    if low_cpu:
+        recommendations.append("CPU utilization is low - consider reducing executor count")
+    elif high_cpu:
+        recommendations.append("High CPU utilization - add more executors")
+    
+    if high_memory:
+        recommendations.append("High memory usage - consider data compression")
+    
+    return {"recommendations": recommendations, "issues_detected": issues}
+
+
+def _stage_runtime_update(stage_runtime: Dict[str, Any]) -> AgentUpdate:
+    """Findings for the critical path and stragglers of a job's event log"""
+    recommendations = []
+    issues = []
+    path = stage_runtime.get("critical_path") or {}
+    on_path = {str(stage) for stage in path.get("stages", ())}
+    
+    if path:
+        issues.append({
+            "type": "critical_path",
+            "severity": "info",
+            "stages": list(path["stages"]),
+            "description": (
+                f"Critical path through stages {' -> '.join(map(str, path['stages']))} "
+                f"takes {path['duration_ms'] / 1000:.1f}s of the {path['span_ms'] / 1000:.1f}s stage span"
+            )
+        })
+    
+    stragglers = stage_runtime.get("stragglers") or {}
+    for stage, stats in stragglers.items():
+        issues.append({
+            "type": "straggler",
+            "severity": "warning" if stage in on_path else "info",
+            "stage": stage,
+            "description": (
+                f"Stage {stage}: {stats['stragglers']} of {stats['tasks']} tasks ran longer than "
+                f"{stats['threshold_ms'] / 1000:.1f}s (median {stats['median_ms'] / 1000:.1f}s, "
+                f"slowest task {stats['slowest_task_id']} {stats['max_ms'] / 1000:.1f}s)"
+            )
+        })
+    
+    if any(stage in on_path for stage in stragglers):
+        recommendations.append(
+            "Stragglers delay critical-path stages - enable spark.speculation to relaunch slow tasks"
+        )
+    for stage, stats in stragglers.items():
+        if stage in on_path and stats["max_ms"] >= DOMINANT_TASK_SHARE * path["duration_ms"]:
+            recommendations.append(
+                f"Stage {stage}: task {stats['slowest_task_id']} takes most of the critical path - "
+                f"check its input for skew or a slow executor"
+            )
+    
+    return {"recommendations": recommendations, "issues_detected": issues}
+
+
+def _plan_update(plan_analysis: Dict[str, Any]) -> AgentUpdate:
+    """Findings for the join, scan and exchange analysis of a job's SQL plans"""
+    recommendations = []
+    issues = []
+    
+    for join in plan_analysis.get("broadcast_joins") or ():
+        issues.append({
+            "type": "join",
+            "severity": "warning",
+            "execution_id": join["execution_id"],
+            "description": (
+                f"Sort-merge join in SQL execution {join['execution_id']} has a "
+                f"{join['smaller_side_bytes'] / 1024 ** 2:.0f} MB side: {join['join'][:120]}"
+            )
+        })
+        recommendations.append(
+            f"SQL execution {join['execution_id']}: broadcast the smaller join side "
+            f"(spark.sql.autoBroadcastJoinThreshold={join['broadcast_threshold']} or a broadcast hint)"
+        )
+    
+    for scan in plan_analysis.get("repeated_scans") or ():
+        issues.append({
+            "type": "scan",
+            "severity": "info",
+            "execution_id": scan["execution_id"],
+            "description": (
+                f"{scan['relation']} is scanned {scan['scans']} times in SQL execution {scan['execution_id']}"
+            )
+        })
+    if plan_analysis.get("repeated_scans"):
+        recommendations.append("Cache relations that one query scans several times")
+    
+    for exchange in plan_analysis.get("removable_exchanges") or ():
+        issues.append({
+            "type": "exchange",
+            "severity": "info",
+            "execution_id": exchange["execution_id"],
+            "description": (
+                f"Shuffle {exchange['exchange']} in SQL execution {exchange['execution_id']} "
+                f"can be removed: {exchange['reason']}"
+            )
+        })
+    if plan_analysis.get("removable_exchanges"):
+        recommendations.append("Remove repartition() calls whose shuffle the query repeats or undoes")
+    
+    return {"recommendations": recommendations, "issues_detected": issues}
+
+
+def _combine(first: AgentUpdate, second: AgentUpdate) -> AgentUpdate:
+    """Findings of two updates, in order"""
+    return {
+        "recommendations": first["recommendations"] + second["recommendations"],
+        "issues_detected": first["issues_detected"] + second["issues_detected"],
+    }
+
+
+async def runtime_agent(state: AgentState) -> AgentUpdate:
     """
     Analyze and predict runtime performance.
     
@@ -14,7 +152,7 @@ async def runtime_agent(state: AgentState) -> AgentState:
         state: Current workflow state
         
     Returns:
-        Updated state with runtime analysis
+        Partial state update with runtime analysis
     """
     logger.info(f"RuntimeAgent: Analyzing runtime for job {state.get('job_id')}")
     
@@ -24,43 +162,83 @@ async def runtime_agent(state: AgentState) -> AgentState:
         memory_mb = state.get("memory_used_mb", 0)
         
         # Analyze runtime metrics
-        if execution_time > 60000:  # > 1 minute
-            state["issues_detected"].append({
-                "type": "runtime",
-                "severity": "warning",
-                "description": "Long execution time detected"
-            })
-            state["recommendations"].append("Consider caching intermediate results")
-            state["recommendations"].append("Enable adaptive query execution")
-        
-        if cpu_util < 0.5:
-            state["recommendations"].append("CPU utilization is low - consider reducing executor count")
-        elif cpu_util > 0.95:
-            state["recommendations"].append("High CPU utilization - add more executors")
-        
-        if memory_mb > 8192:
-            state["recommendations"].append("High memory usage - consider data compression")
+        update = _runtime_update(
+            long_running=execution_time > LONG_EXECUTION_MS,
+            low_cpu=cpu_util < LOW_CPU_UTILIZATION,
+            high_cpu=cpu_util > HIGH_CPU_UTILIZATION,
+            high_memory=memory_mb > HIGH_MEMORY_MB
+        )
+        if state.get("stage_runtime"):
+            update = _combine(update, _stage_runtime_update(state["stage_runtime"]))
+        if state.get("plan_analysis"):
+            update = _combine(update, _plan_update(state["plan_analysis"]))
         
         logger.info(f"RuntimeAgent: Runtime analysis completed")
         
     except Exception as e:
         logger.error(f"RuntimeAgent: Error analyzing runtime: {str(e)}")
-        state["issues_detected"].append({
-            "type": "runtime",
-            "severity": "error",
-            "description": str(e)
-        })
+        update = {
+            "recommendations": [],
+            "issues_detected": [{
+                "type": "runtime",
+                "severity": "error",
+                "description": str(e)
+            }]
+        }
     
-    return state
+    return update
+
+
+def runtime_agent_batch(batch: JobBatch) -> BatchUpdate:
+    """
+    Analyze runtime performance for a whole batch of jobs.
+    
+    Thresholds are evaluated on the metric columns at once; each job's
+    code is a bitmask of the outcomes and selects one of 16 templates.
+    Jobs with a stage runtime or plan analysis get their own template.
+    
+    Args:
+        batch: Columnar job metrics
+        
+    Returns:
+        BatchUpdate equivalent to running runtime_agent on every job
+    """
+    logger.info(f"RuntimeAgent: Analyzing runtime for a batch of {len(batch)} jobs")
+    
+    codes = (
+        (batch.execution_time_ms > LONG_EXECUTION_MS).astype(np.int64)
+        | (batch.cpu_utilization < LOW_CPU_UTILIZATION) << 1
+        | (batch.cpu_utilization > HIGH_CPU_UTILIZATION) << 2
+        | (batch.memory_used_mb > HIGH_MEMORY_MB) << 3
+    )
+    templates = [
+        _runtime_update(bool(code & 1), bool(code & 2), bool(code & 4), bool(code & 8))
+        for code in range(16)
+    ]
+    stage_runtime = batch.stage_runtime or [None] * len(batch)
+    plan_analysis = batch.plan_analysis or [None] * len(batch)
+    for index, (runtime, plans) in enumerate(zip(stage_runtime, plan_analysis)):
+        if runtime or plans:
+            update = templates[codes[index]]
+            if runtime:
+                update = _combine(update, _stage_runtime_update(runtime))
+            if plans:
+                update = _combine(update, _plan_update(plans))
+            templates.append(update)
+            codes[index] = len(templates) - 1
+    return BatchUpdate(codes=codes, templates=templates)
 
 
 class RuntimeAgent:
     """LangGraph-compatible runtime agent wrapper"""
     
+    reads = ("execution_time_ms", "cpu_utilization", "memory_used_mb", "stage_runtime", "plan_analysis")
+    
     def __init__(self):
         """Initialize runtime agent"""
         self.name = "runtime_agent"
+        self.version = "1.2.0"
     
-    async def __call__(self, state: AgentState) -> AgentState:
+    async def __call__(self, state: AgentState) -> AgentUpdate:
         """Call the agent"""
         return await runtime_agent(state)
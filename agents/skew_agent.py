@@ -1,59 +1,131 @@
 """Agent for detecting and handling data skew"""
 
 import logging
-from orchestration.state_model import AgentState
+from typing import Dict
+import numpy as np
+from orchestration.job_batch import BatchUpdate, JobBatch
+from orchestration.offload import run_cpu_bound
+from orchestration.state_model import AgentState, AgentUpdate
+from rules_engine.skew_rules import SkewRules
+from rules_engine.skew_statistics import SkewStatistics, stage_skew_statistics
 
 logger = logging.getLogger(__name__)
 
+# Total number of sizes from which the statistics run on the offload pool
+OFFLOAD_MIN_SIZES = 200_000
 
-async def skew_agent(state: AgentState) -> AgentState:
+
+def _skew_update(stats: Dict[str, SkewStatistics]) -> AgentUpdate:
+    """Findings for the skew statistics of a job's stages"""
+    update: AgentUpdate = {"recommendations": [], "issues_detected": []}
+    if not stats:
+        return update
+    
+    update["skew_statistics"] = {stage: stage_stats.as_dict() for stage, stage_stats in stats.items()}
+    skewed = [stage for stage, stage_stats in stats.items() if SkewRules.is_skewed(stage_stats)]
+    
+    for stage in skewed:
+        stage_stats = stats[stage]
+        update["issues_detected"].append({
+            "type": "skew",
+            "severity": "warning",
+            "stage": stage,
+            "description": (
+                f"Data skew in stage {stage}: max/median {stage_stats.max_to_median:.1f}x, "
+                f"p99/p50 {stage_stats.p99_to_p50:.1f}x, CV {stage_stats.cv:.2f}, "
+                f"Gini {stage_stats.gini:.2f}"
+            )
+        })
+        heaviest = [index for index, _ in stage_stats.top_partitions]
+        share = sum(size for _, size in stage_stats.top_partitions) / stage_stats.total
+        update["recommendations"].append(
+            f"Stage {stage}: partitions {heaviest} hold {share:.0%} of the data; "
+            f"split or salt their keys"
+        )
+    
+    if skewed:
+        update["recommendations"].append("Use salting technique for join operations")
+        update["recommendations"].append("Consider repartitioning with hash distribution")
+        update["recommendations"].append("Use skew-aware aggregation strategies")
+    
+    return update
+
+
+async def skew_agent(state: AgentState) -> AgentUpdate:
     """
-    Analyze data skew in partitions.
+    Analyze data skew in the partitions of every stage.
     
     Args:
         state: Current workflow state
         
     Returns:
-        Updated state with skew analysis
+        Partial state update with skew analysis
     """
     logger.info(f"SkewAgent: Analyzing skew for {state.get('table_name')}")
     
     try:
-        # Detect data skew (simulated)
-        skew_ratio = 0.4  # Simulated skew ratio
+        stage_sizes = {
+            stage: np.asarray(sizes, dtype=np.float64)
+            for stage, sizes in (state.get("stage_partition_sizes") or {}).items()
+        }
+        if sum(len(sizes) for sizes in stage_sizes.values()) >= OFFLOAD_MIN_SIZES:
+            stats = await run_cpu_bound(stage_skew_statistics, stage_sizes)
+        else:
+            stats = stage_skew_statistics(stage_sizes)
+        update = _skew_update(stats)
         
-        if skew_ratio > 0.3:
-            state["issues_detected"].append({
-                "type": "skew",
-                "severity": "warning",
-                "description": f"Data skew detected: {skew_ratio:.2%}"
-            })
-            state["skewed_columns"] = ["id", "timestamp"]
-            
-            state["recommendations"].append("Use salting technique for join operations")
-            state["recommendations"].append("Consider repartitioning with hash distribution")
-            state["recommendations"].append("Use skew-aware aggregation strategies")
-        
-        logger.info(f"SkewAgent: Skew analysis completed, skew_ratio={skew_ratio:.2%}")
+        logger.info(
+            f"SkewAgent: Skew analysis completed for {len(stats)} stages, "
+            f"{len(update['issues_detected'])} skewed"
+        )
         
     except Exception as e:
         logger.error(f"SkewAgent: Error analyzing skew: {str(e)}")
-        state["issues_detected"].append({
-            "type": "skew",
-            "severity": "error",
-            "description": str(e)
-        })
+        update = {
+            "recommendations": [],
+            "issues_detected": [{
+                "type": "skew",
+                "severity": "error",
+                "description": str(e)
+            }]
+        }
+    
+    return update
+
+
+def skew_agent_batch(batch: JobBatch) -> BatchUpdate:
+    """
+    Analyze data skew for a whole batch of jobs.
     
-    return state
+    Args:
+        batch: Columnar job metrics
+        
+    Returns:
+        BatchUpdate equivalent to running skew_agent on every job
+    """
+    logger.info(f"SkewAgent: Analyzing skew for a batch of {len(batch)} jobs")
+    
+    # Jobs without partition sizes share the empty template; sizes are
+    # ragged per job, so the others get their own statistics and template
+    codes = np.zeros(len(batch), dtype=np.int64)
+    templates = [_skew_update({})]
+    for index, stage_sizes in enumerate(batch.stage_partition_sizes or ()):
+        if stage_sizes:
+            codes[index] = len(templates)
+            templates.append(_skew_update(stage_skew_statistics(stage_sizes)))
+    return BatchUpdate(codes=codes, templates=templates)
 
 
 class SkewAgent:
     """LangGraph-compatible skew agent wrapper"""
     
+    reads = ("stage_partition_sizes",)
+    
     def __init__(self):
         """Initialize skew agent"""
         self.name = "skew_agent"
+        self.version = "1.1.0"
     
-    async def __call__(self, state: AgentState) -> AgentState:
+    async def __call__(self, state: AgentState) -> AgentUpdate:
         """Call the agent"""
         return await skew_agent(state)
@@ -0,0 +1,39 @@
+"""Analyses of parsed Spark event logs that feed the agents"""
+
+from analysis.executor_timeline import (
+    ExecutorTimeline,
+    build_timeline,
+    executor_timeline_of_log,
+    executor_timeline_summary,
+)
+from analysis.physical_plan import PlanAnalyzer, compile_plan, plan_analysis
+from analysis.shuffle import StageShuffle, shuffle_analysis, stage_shuffle
+from analysis.stage_runtime import (
+    CriticalPath,
+    StageStragglers,
+    critical_path,
+    find_stragglers,
+    stage_runtime_analysis,
+    stage_runtime_of_log,
+    stage_spans,
+)
+
+__all__ = [
+    "ExecutorTimeline",
+    "build_timeline",
+    "executor_timeline_of_log",
+    "executor_timeline_summary",
+    "PlanAnalyzer",
+    "compile_plan",
+    "plan_analysis",
+    "StageShuffle",
+    "shuffle_analysis",
+    "stage_shuffle",
+    "CriticalPath",
+    "StageStragglers",
+    "critical_path",
+    "find_stragglers",
+    "stage_runtime_analysis",
+    "stage_runtime_of_log",
+    "stage_spans",
+]
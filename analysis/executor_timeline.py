@@ -0,0 +1,217 @@
+"""Executor-slot occupancy timeline of a Spark application"""
+
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from connectors.event_log_aggregate import EventLogAggregate
+from connectors.task_table import TaskTable, TaskTableCache
+
+
+class ExecutorTimeline(NamedTuple):
+    """
+    Step functions of available and busy task slots, plus per-executor use.
+
+    Between times[i] and times[i + 1] the cluster offers slots[i] task slots
+    (the cores of the live executors) and runs busy[i] tasks.
+    """
+    times: np.ndarray
+    slots: np.ndarray
+    busy: np.ndarray
+    executor_ids: List[str]
+    lifetime_ms: np.ndarray
+    busy_ms: np.ndarray
+    cores: np.ndarray
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Utilization and idle capacity over the application.
+
+        Returns:
+            JSON-friendly totals: the cost agent's executor_timeline input
+        """
+        step_ms = np.diff(self.times)
+        slot_ms = float(np.dot(self.slots[:-1], step_ms))
+        # Tasks beyond the known cores still occupy at most every slot
+        busy_slot_ms = float(np.dot(np.minimum(self.busy, self.slots)[:-1], step_ms))
+        idle_ms = self.lifetime_ms - self.busy_ms
+        executor_ms = float(self.lifetime_ms.sum())
+        return {
+            "span_ms": int(self.times[-1] - self.times[0]) if len(self.times) else 0,
+            "executors": len(self.executor_ids),
+            "peak_slots": int(self.slots.max()) if len(self.slots) else 0,
+            "peak_busy_slots": int(self.busy.max()) if len(self.busy) else 0,
+            "slot_ms": slot_ms,
+            "busy_slot_ms": busy_slot_ms,
+            "slot_utilization": busy_slot_ms / slot_ms if slot_ms else 0.0,
+            "idle_slot_ms": slot_ms - busy_slot_ms,
+            "executor_ms": executor_ms,
+            "idle_executor_ms": float(idle_ms.sum()),
+            "idle_core_ms": float(np.dot(idle_ms, self.cores)),
+        }
+
+
+def _sweep(times: np.ndarray, *deltas: np.ndarray) -> List[np.ndarray]:
+    """
+    Running totals of step changes, one value per distinct time.
+
+    Args:
+        times: Time of each change
+        deltas: Arrays of changes aligned with times
+
+    Returns:
+        The distinct times in order, followed by each running total
+    """
+    order = np.argsort(times)
+    times = times[order]
+    totals = [np.cumsum(delta[order]) for delta in deltas]
+    # Several changes at one instant: keep the total after the last of them
+    last = np.append(times[1:] != times[:-1], True)
+    return [times[last]] + [total[last] for total in totals]
+
+
+def _interval_order(codes: np.ndarray, times: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """
+    Order of interval changes by (executor code, time, end before start).
+
+    The three keys are packed into one int64 sort key, which sorts much
+    faster than a three-key lexsort, when they fit in its 63 bits; times
+    spanning more (a missing launch time of 0 next to epoch milliseconds
+    leaves few bits for the executor) fall back to the lexsort.
+
+    Args:
+        codes: Non-negative executor code of each change
+        times: Time of each change
+        starts: True where the change starts an interval
+
+    Returns:
+        Indices that sort the changes
+    """
+    if not len(times):
+        return np.zeros(0, dtype=np.intp)
+    relative = times - times.min()
+    shift = int(relative.max()).bit_length() + 1
+    if int(codes.max()).bit_length() + shift <= 63:
+        return np.argsort((codes << shift) | (relative << 1) | starts)
+    return np.lexsort((starts, times, codes))
+
+
+def build_timeline(
+    aggregate: EventLogAggregate,
+    table: TaskTable,
+    default_cores: int = 1
+) -> ExecutorTimeline:
+    """
+    Rebuild executor lifetimes and slot occupancy from an event log.
+
+    Executor add/remove events and task launch/finish times become +/- step
+    changes that are sorted once and summed (a sweep line), so the cost is
+    one sort of 2 x (tasks + executors) changes. Each executor's busy time is
+    the union of its task intervals, found the same way with changes
+    sorted by (executor, time).
+
+    Args:
+        aggregate: Aggregate of the log
+        table: Task table of the same log
+        default_cores: Cores of executors without an ExecutorAdded event,
+            such as the driver in local mode
+
+    Returns:
+        ExecutorTimeline of the application
+    """
+    tasks = table.tasks
+    launch = tasks["launch_time_ms"].astype(np.int64)
+    finish = launch + tasks["duration_ms"]
+    known = set(table.executors)
+    executors = list(table.executors) + [
+        executor_id for executor_id in aggregate.executors if executor_id not in known
+    ]
+    codes = tasks["executor"].astype(np.int64)
+
+    times = [launch.min(), finish.max()] if len(tasks) else []
+    for executor in aggregate.executors.values():
+        times += [time for time in (executor.added_ms, executor.removed_ms) if time is not None]
+    if not times:
+        empty = np.zeros(0, dtype=np.int64)
+        return ExecutorTimeline(empty, empty, empty, [], empty, empty, empty)
+    end_ms = int(max(times))
+
+    # Executors seen only through their tasks live from their first task to the end
+    first_launch = np.full(len(executors), end_ms, dtype=np.int64)
+    np.minimum.at(first_launch, codes, launch)
+    added = np.empty(len(executors), dtype=np.int64)
+    removed = np.full(len(executors), end_ms, dtype=np.int64)
+    cores = np.full(len(executors), default_cores, dtype=np.int64)
+    for index, executor_id in enumerate(executors):
+        executor = aggregate.executors.get(executor_id)
+        added[index] = first_launch[index]
+        if executor is not None:
+            if executor.added_ms is not None:
+                added[index] = min(executor.added_ms, first_launch[index])
+            if executor.removed_ms is not None:
+                removed[index] = executor.removed_ms
+            if executor.cores:
+                cores[index] = executor.cores
+    added = np.minimum(added, removed)
+
+    no_executors = np.zeros(len(executors), dtype=np.int64)
+    no_tasks = np.zeros(len(tasks), dtype=np.int64)
+    ones = np.ones(len(tasks), dtype=np.int64)
+    timeline_times, slots, busy = _sweep(
+        np.concatenate([added, removed, launch, finish]),
+        np.concatenate([cores, -cores, no_tasks, no_tasks]),
+        np.concatenate([no_executors, no_executors, ones, -ones]),
+    )
+
+    # Per-executor union of task intervals: sort the task changes by
+    # (executor, time, end before start) and keep the steps with a task running
+    change_codes = np.concatenate([codes, codes])
+    change_times = np.concatenate([launch, finish])
+    change = np.concatenate([ones, -ones])
+    order = _interval_order(change_codes, change_times, change > 0)
+    change_codes, change_times = change_codes[order], change_times[order]
+    running = np.cumsum(change[order])
+    step_ms = np.diff(change_times)
+    same_executor = change_codes[1:] == change_codes[:-1]
+    covered = np.where(same_executor & (running[:-1] > 0), step_ms, 0)
+    busy_ms = np.bincount(change_codes[:-1], weights=covered, minlength=len(executors)).astype(np.int64)
+
+    return ExecutorTimeline(
+        times=timeline_times,
+        slots=slots,
+        busy=busy,
+        executor_ids=executors,
+        lifetime_ms=removed - added,
+        busy_ms=np.minimum(busy_ms, removed - added),
+        cores=cores,
+    )
+
+
+def executor_timeline_summary(aggregate: EventLogAggregate, table: TaskTable) -> Dict[str, Any]:
+    """
+    Slot utilization and idle capacity of a parsed event log.
+
+    Args:
+        aggregate: Aggregate of the log
+        table: Task table of the same log
+
+    Returns:
+        ExecutorTimeline.summary() of the log's timeline
+    """
+    return build_timeline(aggregate, table).summary()
+
+
+def executor_timeline_of_log(path: str, cache: Optional[TaskTableCache] = None) -> Dict[str, Any]:
+    """
+    Slot utilization and idle capacity of an event log, parsed at most once.
+
+    Args:
+        path: Event log file (plain, gzip or zstd)
+        cache: Task-table cache holding the log's aggregate and table;
+            the default cache directory when None
+
+    Returns:
+        executor_timeline_summary of the log
+    """
+    aggregate, table = (cache or TaskTableCache()).get_with_aggregate(path)
+    return executor_timeline_summary(aggregate, table)
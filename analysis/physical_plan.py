@@ -0,0 +1,273 @@
+"""Join, scan and exchange findings from the SQL physical plans of an event log"""
+
+import math
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from connectors.event_log_aggregate import SQL_EXECUTION_START, STAGE_COMPLETED
+from connectors.spark_event_parser import SparkEventParser
+from rules_engine.spark_config_rules import SparkConfigRules
+
+# With adaptive execution, re-optimized plans replace the initial one
+SQL_ADAPTIVE_EXECUTION_UPDATE = "org.apache.spark.sql.execution.ui.SparkListenerSQLAdaptiveExecutionUpdate"
+
+PLAN_EVENT_TYPES = frozenset({SQL_EXECUTION_START, SQL_ADAPTIVE_EXECUTION_UPDATE, STAGE_COMPLETED})
+
+# SQL metrics holding the bytes a node produces: shuffle exchanges and file scans
+SIZE_METRICS = frozenset({"data size", "size of files read"})
+
+SORT_MERGE_JOIN = "SortMergeJoin"
+SHUFFLE_EXCHANGE = "Exchange"
+SCAN_PREFIXES = ("Scan ", "BatchScan", "FileScan")
+
+# Nodes through which the output keeps its child's partitioning; codegen
+# wrappers are named "WholeStageCodegen (<id>)"
+_PARTITIONING_PRESERVING = frozenset({
+    "Project", "Filter", "Sort", "InputAdapter", "ColumnarToRow",
+    "AQEShuffleRead", "CustomShuffleReader", "ShuffleQueryStage",
+})
+_CODEGEN = "WholeStageCodegen"
+
+_MB = 1024 * 1024
+
+
+class CompiledPlan(NamedTuple):
+    """
+    Compact form of one physical plan, kept until its metric values are known.
+
+    Nodes are numbered in preorder, so every child comes after its parent.
+    """
+    parents: List[int]
+    size_metrics: List[int]
+    joins: List[Tuple[int, int, int]]
+    join_labels: List[str]
+    repeated_scans: Dict[str, int]
+    removable_exchanges: List[Dict[str, str]]
+
+
+def _partitioning(simple_string: str) -> str:
+    """Output partitioning of a shuffle Exchange from its simpleString"""
+    text = simple_string[len(SHUFFLE_EXCHANGE):].strip()
+    text = text.split(", [plan_id=")[0]
+    # Spark 3 appends the shuffle origin, e.g. ENSURE_REQUIREMENTS
+    head, _, last = text.rpartition(", ")
+    return head if head and last.isupper() else text
+
+
+def compile_plan(plan_info: Dict[str, Any]) -> CompiledPlan:
+    """
+    Walk a sparkPlanInfo tree once and keep what the findings need.
+
+    The walk is iterative, so deep plans do not hit the recursion limit, and
+    visits every node once: tens of thousands of nodes take milliseconds.
+
+    Args:
+        plan_info: sparkPlanInfo of a SQLExecutionStart or adaptive update
+
+    Returns:
+        CompiledPlan of the tree
+    """
+    parents: List[int] = []
+    size_metrics: List[int] = []
+    join_children: Dict[int, List[int]] = {}
+    join_labels: Dict[int, str] = {}
+    scans: Dict[str, int] = {}
+    removable: List[Dict[str, str]] = []
+
+    # (node, parent index, nearest shuffle above reached through partitioning-preserving nodes)
+    stack: List[Tuple[Dict[str, Any], int, Optional[str]]] = [(plan_info, -1, None)]
+    while stack:
+        node, parent, exchange_above = stack.pop()
+        index = len(parents)
+        parents.append(parent)
+        name = node.get("nodeName", "")
+        size_metrics.append(next(
+            (metric["accumulatorId"] for metric in node.get("metrics") or ()
+             if metric.get("name") in SIZE_METRICS and "accumulatorId" in metric),
+            -1,
+        ))
+        if parent in join_children:
+            join_children[parent].append(index)
+
+        below: Optional[str] = None
+        if name == SORT_MERGE_JOIN:
+            join_children[index] = []
+            join_labels[index] = node.get("simpleString", name)
+        elif name == SHUFFLE_EXCHANGE:
+            below = _partitioning(node.get("simpleString", ""))
+            if exchange_above is not None:
+                if exchange_above == below:
+                    removable.append({
+                        "exchange": exchange_above,
+                        "reason": "its input is already partitioned the same way",
+                    })
+                else:
+                    removable.append({
+                        "exchange": below,
+                        "reason": f"its output is shuffled again into {exchange_above}",
+                    })
+        elif name.startswith(SCAN_PREFIXES):
+            relation = (node.get("metadata") or {}).get("Location") or name
+            scans[relation] = scans.get(relation, 0) + 1
+        elif name in _PARTITIONING_PRESERVING or name.startswith(_CODEGEN):
+            below = exchange_above
+
+        # Reversed so that children are numbered in plan order
+        for child in reversed(node.get("children") or ()):
+            stack.append((child, index, below))
+
+    joins = [
+        (index, children[0], children[1])
+        for index, children in join_children.items() if len(children) == 2
+    ]
+    return CompiledPlan(
+        parents=parents,
+        size_metrics=size_metrics,
+        joins=joins,
+        join_labels=[join_labels[index] for index, _, _ in joins],
+        repeated_scans={relation: count for relation, count in scans.items() if count > 1},
+        removable_exchanges=removable,
+    )
+
+
+def node_sizes(plan: CompiledPlan, metric_values: Dict[int, int]) -> List[Optional[int]]:
+    """
+    Bytes produced by every node of a plan.
+
+    A node with a known size metric (an exchange's data size, a scan's file
+    size) uses it; any other node sums its children. Children are numbered
+    after their parents, so one reverse pass resolves the whole tree.
+
+    Args:
+        plan: Compiled plan
+        metric_values: Final SQL metric values keyed by accumulator id
+
+    Returns:
+        Size per node, None where a leaf below it has no known size
+    """
+    count = len(plan.parents)
+    totals = [0] * count
+    known = [True] * count
+    has_children = [False] * count
+    sizes: List[Optional[int]] = [None] * count
+    for index in range(count - 1, -1, -1):
+        value = metric_values.get(plan.size_metrics[index])
+        if value is not None:
+            size: Optional[int] = value
+        elif has_children[index] and known[index]:
+            size = totals[index]
+        else:
+            size = None
+        sizes[index] = size
+        parent = plan.parents[index]
+        if parent >= 0:
+            has_children[parent] = True
+            if size is None:
+                known[parent] = False
+            else:
+                totals[parent] += size
+    return sizes
+
+
+class PlanAnalyzer:
+    """
+    Collects the SQL plans and metric values of an event log.
+
+    Plans are compiled as their events arrive; only the compact form of the
+    latest plan of each SQL execution is kept. Metric values are summed from
+    the accumulables of completed stages.
+    """
+
+    def __init__(self):
+        """Initialize the analyzer"""
+        self.plans: Dict[int, CompiledPlan] = {}
+        self.metric_values: Dict[int, int] = {}
+        self.malformed_lines = 0
+
+    def count_malformed(self, error: ValueError) -> None:
+        """Count a plan or stage line that could not be decoded"""
+        self.malformed_lines += 1
+
+    def add_event(self, event: Dict[str, Any]) -> None:
+        """
+        Fold one parsed event into the analyzer; other event types are ignored.
+
+        Args:
+            event: Parsed event-log line
+        """
+        kind = event.get("Event")
+        if kind in (SQL_EXECUTION_START, SQL_ADAPTIVE_EXECUTION_UPDATE):
+            plan_info = event.get("sparkPlanInfo")
+            if plan_info:
+                self.plans[event.get("executionId", -1)] = compile_plan(plan_info)
+        elif kind == STAGE_COMPLETED:
+            for accumulable in (event.get("Stage Info") or {}).get("Accumulables") or ():
+                try:
+                    value = int(accumulable.get("Value"))
+                except (TypeError, ValueError):
+                    continue
+                # The driver reports each accumulator's running total, so
+                # a retried attempt or a later stage updating the same
+                # metric repeats what earlier ones counted
+                metric_id = accumulable.get("ID")
+                self.metric_values[metric_id] = max(self.metric_values.get(metric_id, 0), value)
+
+    def findings(self) -> Dict[str, Any]:
+        """
+        Join, scan and exchange findings over every SQL execution.
+
+        Returns:
+            The runtime agent's plan_analysis input: sort-merge joins whose
+            smaller side fits the broadcast threshold, relations scanned more
+            than once in a plan, shuffle exchanges that could be removed, and
+            the number of lines skipped as malformed (their plans are missing)
+        """
+        broadcast = []
+        repeated = []
+        exchanges = []
+        for execution_id, plan in sorted(self.plans.items()):
+            sizes = node_sizes(plan, self.metric_values) if plan.joins else []
+            for (_, left, right), label in zip(plan.joins, plan.join_labels):
+                if sizes[left] is None or sizes[right] is None:
+                    continue
+                smaller, larger = sorted((sizes[left], sizes[right]))
+                rule = SparkConfigRules.check_broadcast_threshold(math.ceil(smaller / _MB))
+                if rule["should_broadcast"]:
+                    broadcast.append({
+                        "execution_id": execution_id,
+                        "join": label,
+                        "smaller_side_bytes": smaller,
+                        "larger_side_bytes": larger,
+                        "broadcast_threshold": rule["broadcast_threshold"],
+                    })
+            for relation, scans in plan.repeated_scans.items():
+                repeated.append({"execution_id": execution_id, "relation": relation, "scans": scans})
+            for exchange in plan.removable_exchanges:
+                exchanges.append({"execution_id": execution_id, **exchange})
+        return {
+            "broadcast_joins": broadcast,
+            "repeated_scans": repeated,
+            "removable_exchanges": exchanges,
+            "malformed_lines": self.malformed_lines,
+        }
+
+
+def plan_analysis(path: str) -> Dict[str, Any]:
+    """
+    Analyze the SQL physical plans of an event log.
+
+    Only plan and stage-completion lines are decoded; task lines are
+    skipped by their event name. Plans nested past the JSON decoder's
+    depth limit (long join chains) are decoded without recursion.
+
+    Args:
+        path: Event log file (plain, gzip or zstd)
+
+    Returns:
+        PlanAnalyzer.findings() of the log
+    """
+    analyzer = PlanAnalyzer()
+    with SparkEventParser.open_event_log(path) as stream:
+        for event in SparkEventParser.iter_events(stream, PLAN_EVENT_TYPES, analyzer.count_malformed):
+            analyzer.add_event(event)
+    return analyzer.findings()
+
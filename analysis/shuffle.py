@@ -0,0 +1,104 @@
+"""Per-stage shuffle and spill totals of a Spark application"""
+
+from typing import Any, Dict, List, NamedTuple
+
+from connectors.event_log_aggregate import EventLogAggregate
+from rules_engine.spark_config_rules import SparkConfigRules
+
+
+class StageShuffle(NamedTuple):
+    """Shuffle, spill and fetch-wait totals of one stage over all its attempts"""
+    stage_id: int
+    partitions: int
+    run_time_ms: int
+    shuffle_read_bytes: int
+    shuffle_read_records: int
+    shuffle_write_bytes: int
+    shuffle_write_records: int
+    memory_spilled_bytes: int
+    disk_spilled_bytes: int
+    fetch_wait_ms: int
+
+    @property
+    def fetch_wait_share(self) -> float:
+        """Share of the stage's executor run time spent waiting for shuffle blocks"""
+        return self.fetch_wait_ms / self.run_time_ms if self.run_time_ms else 0.0
+
+    @property
+    def target_partitions(self) -> int:
+        """Partitions that would give the stage's shuffle read the target partition size"""
+        return SparkConfigRules.check_shuffle_partitions(self.shuffle_read_bytes, self.memory_spilled_bytes)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-friendly form stored in the workflow state"""
+        stage = self._asdict()
+        stage["fetch_wait_share"] = self.fetch_wait_share
+        stage["target_partitions"] = self.target_partitions
+        return stage
+
+
+def stage_shuffle(aggregate: EventLogAggregate) -> Dict[int, StageShuffle]:
+    """
+    Shuffle and spill totals per stage, from the streaming aggregate.
+
+    Only the per-stage sums of the TaskEnd metrics are used, so this works
+    on an aggregate of any size without a task table.
+
+    Args:
+        aggregate: Aggregate of the log
+
+    Returns:
+        StageShuffle keyed by stage id, for stages that shuffled or spilled
+    """
+    totals: Dict[int, List[int]] = {}
+    for (stage_id, _), stage in aggregate.stages.items():
+        # A stage's partition count is its task count, whatever the attempt
+        partitions = stage.num_tasks or stage.tasks - stage.failed - stage.killed
+        values = [
+            partitions,
+            stage.run_time_ms,
+            stage.shuffle_read_bytes,
+            stage.shuffle_read_records,
+            stage.shuffle_write_bytes,
+            stage.shuffle_write_records,
+            stage.memory_spilled_bytes,
+            stage.disk_spilled_bytes,
+            stage.fetch_wait_ms,
+        ]
+        current = totals.get(stage_id)
+        if current is None:
+            totals[stage_id] = values
+        else:
+            current[0] = max(current[0], partitions)
+            for index in range(1, len(values)):
+                current[index] += values[index]
+    return {
+        stage_id: StageShuffle(stage_id, *values)
+        for stage_id, values in sorted(totals.items())
+        if any(values[2:])
+    }
+
+
+def shuffle_analysis(aggregate: EventLogAggregate) -> Dict[str, Any]:
+    """
+    Shuffle and spill per stage, and the shuffle partitions they call for.
+
+    spark.sql.shuffle.partitions applies to every shuffle, so the
+    recommendation is sized for the stage that needs the most partitions.
+
+    Args:
+        aggregate: Aggregate of the log
+
+    Returns:
+        The partition agent's shuffle_analysis input: stages keyed by stage
+        id, the recommended shuffle partitions and the stage that sets it
+        (both None when no stage read shuffle data)
+    """
+    stages = stage_shuffle(aggregate)
+    readers = [stage for stage in stages.values() if stage.shuffle_read_bytes]
+    sizing = max(readers, key=lambda stage: stage.target_partitions, default=None)
+    return {
+        "stages": {str(stage_id): stage.as_dict() for stage_id, stage in stages.items()},
+        "recommended_shuffle_partitions": sizing.target_partitions if sizing else None,
+        "sizing_stage": str(sizing.stage_id) if sizing else None,
+    }
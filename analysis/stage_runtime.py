@@ -0,0 +1,245 @@
+"""Critical path through the stage DAG and straggler tasks of a Spark application"""
+
+from collections import deque
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from connectors.event_log_aggregate import EventLogAggregate
+from connectors.task_table import TaskTable, TaskTableCache
+
+# A task straggles when it runs longer than STRAGGLER_FACTOR x its stage's
+# median (as spark.speculation.multiplier) and at least MIN_STRAGGLER_EXCESS_MS
+# longer, so that stages of millisecond tasks are not flagged
+STRAGGLER_FACTOR = 1.5
+MIN_STRAGGLER_EXCESS_MS = 1000
+
+# Stages with fewer successful tasks have no meaningful median
+MIN_STAGE_TASKS = 4
+
+
+class StageSpan(NamedTuple):
+    """Wall-clock span of a stage over all its attempts, and its parent stages"""
+    stage_id: int
+    start_ms: int
+    end_ms: int
+    parent_ids: Tuple[int, ...]
+
+    @property
+    def duration_ms(self) -> int:
+        return self.end_ms - self.start_ms
+
+
+class CriticalPath(NamedTuple):
+    """Chain of dependent stages with the largest total duration"""
+    stages: Tuple[int, ...]
+    duration_ms: int
+    span_ms: int
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-friendly form stored in the workflow state"""
+        return {"stages": list(self.stages), "duration_ms": self.duration_ms, "span_ms": self.span_ms}
+
+
+class StageStragglers(NamedTuple):
+    """Straggler tasks of one stage"""
+    stage_id: int
+    tasks: int
+    median_ms: float
+    p90_ms: float
+    threshold_ms: float
+    stragglers: int
+    max_ms: int
+    slowest_task_id: int
+    excess_ms: int
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-friendly form stored in the workflow state"""
+        return self._asdict()
+
+
+def stage_spans(aggregate: EventLogAggregate) -> Dict[int, StageSpan]:
+    """
+    Rebuild the stage DAG from the StageCompleted info of an event log.
+
+    Args:
+        aggregate: Aggregate of the log
+
+    Returns:
+        StageSpan keyed by stage id; stages that never completed are left out
+    """
+    spans: Dict[int, StageSpan] = {}
+    for (stage_id, _), stage in aggregate.stages.items():
+        if stage.submission_time_ms is None or stage.completion_time_ms is None:
+            continue
+        span = spans.get(stage_id)
+        if span is None:
+            spans[stage_id] = StageSpan(
+                stage_id, stage.submission_time_ms, stage.completion_time_ms, stage.parent_ids or ()
+            )
+        else:
+            # Retried stages span from the first submission to the last completion
+            spans[stage_id] = StageSpan(
+                stage_id,
+                min(span.start_ms, stage.submission_time_ms),
+                max(span.end_ms, stage.completion_time_ms),
+                tuple(sorted(set(span.parent_ids) | set(stage.parent_ids or ()))),
+            )
+    return spans
+
+
+def critical_path(spans: Dict[int, StageSpan]) -> Optional[CriticalPath]:
+    """
+    Longest chain of dependent stages, weighted by stage duration.
+
+    Stages are visited in topological order, so the path is found in time
+    linear in the number of stages and dependencies. Parents that never ran
+    (stages skipped because their shuffle output was reused) are ignored.
+
+    Args:
+        spans: Stage spans from stage_spans
+
+    Returns:
+        CriticalPath, or None when no stage completed
+    """
+    if not spans:
+        return None
+
+    children: Dict[int, List[int]] = {stage_id: [] for stage_id in spans}
+    pending = {stage_id: 0 for stage_id in spans}
+    for span in spans.values():
+        for parent in set(span.parent_ids):
+            if parent in spans:
+                children[parent].append(span.stage_id)
+                pending[span.stage_id] += 1
+
+    # Longest duration of a chain ending at each stage, and its previous stage
+    longest: Dict[int, int] = {}
+    previous: Dict[int, Optional[int]] = {}
+    ready = deque(sorted(stage_id for stage_id, count in pending.items() if count == 0))
+    while ready:
+        stage_id = ready.popleft()
+        parent = max(
+            (parent for parent in spans[stage_id].parent_ids if parent in longest),
+            key=longest.get,
+            default=None,
+        )
+        longest[stage_id] = spans[stage_id].duration_ms + (longest[parent] if parent is not None else 0)
+        previous[stage_id] = parent
+        for child in children[stage_id]:
+            pending[child] -= 1
+            if pending[child] == 0:
+                ready.append(child)
+
+    stage_id = max(longest, key=longest.get)
+    duration_ms = longest[stage_id]
+    path = []
+    while stage_id is not None:
+        path.append(stage_id)
+        stage_id = previous[stage_id]
+    span_ms = max(span.end_ms for span in spans.values()) - min(span.start_ms for span in spans.values())
+    return CriticalPath(stages=tuple(reversed(path)), duration_ms=duration_ms, span_ms=span_ms)
+
+
+def find_stragglers(
+    table: TaskTable,
+    factor: float = STRAGGLER_FACTOR,
+    min_excess_ms: float = MIN_STRAGGLER_EXCESS_MS,
+    min_tasks: int = MIN_STAGE_TASKS
+) -> Dict[int, StageStragglers]:
+    """
+    Flag the straggler tasks of every stage.
+
+    Successful tasks are sorted once by (stage, duration); every stage's
+    quantiles are then read at computed offsets of its sorted run and the
+    per-stage counts are segment sums, so the cost is one sort of the task
+    table whatever the number of stages.
+
+    Args:
+        table: Task table of the log
+        factor: Multiple of the stage median above which a task straggles
+        min_excess_ms: Minimum time above the median for a straggler
+        min_tasks: Stages with fewer successful tasks are skipped
+
+    Returns:
+        StageStragglers keyed by stage id, for stages with at least one straggler
+    """
+    tasks = table.tasks
+    successful = ~(tasks["failed"] | tasks["killed"])
+    stage_ids = tasks["stage_id"][successful]
+    if len(stage_ids) == 0:
+        return {}
+    durations = tasks["duration_ms"][successful]
+    order = np.lexsort((durations, stage_ids))
+    stage_ids = stage_ids[order]
+    durations = durations[order].astype(np.float64)
+    task_ids = tasks["task_id"][successful][order]
+
+    stages, starts, counts = np.unique(stage_ids, return_index=True, return_counts=True)
+    lasts = starts + counts - 1
+
+    def quantile(q: float) -> np.ndarray:
+        # Linear interpolation within each stage's sorted run
+        position = starts + (counts - 1) * q
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, lasts)
+        return durations[lower] + (durations[upper] - durations[lower]) * (position - lower)
+
+    median = quantile(0.5)
+    p90 = quantile(0.9)
+    threshold = np.maximum(median * factor, median + min_excess_ms)
+    excess = durations - np.repeat(median, counts)
+    straggling = durations > np.repeat(threshold, counts)
+    straggler_counts = np.add.reduceat(straggling.astype(np.int64), starts)
+    excess_ms = np.add.reduceat(np.where(straggling, excess, 0.0), starts)
+
+    flagged = np.flatnonzero((counts >= min_tasks) & (straggler_counts > 0))
+    return {
+        int(stages[index]): StageStragglers(
+            stage_id=int(stages[index]),
+            tasks=int(counts[index]),
+            median_ms=float(median[index]),
+            p90_ms=float(p90[index]),
+            threshold_ms=float(threshold[index]),
+            stragglers=int(straggler_counts[index]),
+            max_ms=int(durations[lasts[index]]),
+            slowest_task_id=int(task_ids[lasts[index]]),
+            excess_ms=int(excess_ms[index]),
+        )
+        for index in flagged
+    }
+
+
+def stage_runtime_analysis(aggregate: EventLogAggregate, table: TaskTable) -> Dict[str, Any]:
+    """
+    Critical path and stragglers of a parsed event log.
+
+    Args:
+        aggregate: Aggregate of the log
+        table: Task table of the same log
+
+    Returns:
+        The runtime agent's stage_runtime input: the critical path (or None)
+        and the stragglers keyed by stage id
+    """
+    path = critical_path(stage_spans(aggregate))
+    return {
+        "critical_path": path.as_dict() if path is not None else None,
+        "stragglers": {str(stage): stats.as_dict() for stage, stats in find_stragglers(table).items()},
+    }
+
+
+def stage_runtime_of_log(path: str, cache: Optional[TaskTableCache] = None) -> Dict[str, Any]:
+    """
+    Critical path and stragglers of an event log, parsed at most once.
+
+    Args:
+        path: Event log file (plain, gzip or zstd)
+        cache: Task-table cache holding the log's aggregate and table;
+            the default cache directory when None
+
+    Returns:
+        stage_runtime_analysis of the log
+    """
+    aggregate, table = (cache or TaskTableCache()).get_with_aggregate(path)
+    return stage_runtime_analysis(aggregate, table)
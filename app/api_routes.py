@@ -1,17 +1,27 @@
 """API Routes for Spark Intelligence Copilot"""
 
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Optional
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import AsyncIterable, AsyncIterator, List, Optional
+from pydantic import BaseModel, ValidationError
+import asyncio
+import json
 import logging
-from orchestration.state_model import create_agent_state
-from orchestration.graph_builder import build_spark_optimization_graph
-from agents.metadata_agent import MetadataAgent
-from agents.partition_agent import PartitionAgent
-from agents.runtime_agent import RuntimeAgent
-from agents.skew_agent import SkewAgent
-from agents.delta_agent import DeltaAgent
-from agents.cost_agent import CostAgent
+from orchestration.state_model import AgentState, create_agent_state
+from orchestration.graph_builder import SparkIntelligenceGraph
+from orchestration.concurrency import SingleFlight, map_unordered
+from orchestration.graph_registry import graph_registry
+from orchestration.offload import CPUOffloadPool
+from orchestration.worker_pool import AnalysisWorkerPool, QueueFullError
+from storage.result_cache import ResultCache, canonical_hash
+from app.config import settings
+from app.dependencies import (
+    get_offload_pool,
+    get_optimization_graph,
+    get_result_cache,
+    get_single_flight,
+    get_worker_pool
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1", tags=["spark-intelligence"])
@@ -29,6 +39,22 @@ class JobAnalysisResponse(BaseModel):
     recommendations: List[str]
     optimization_score: float
     estimated_savings: dict
+    skipped_agents: List[str] = []
+    issues_detected: List[dict] = []
+    cached: bool = False
+
+class JobTicketResponse(BaseModel):
+    """Response model for an asynchronously submitted analysis"""
+    ticket: str
+    status: str
+    status_url: str
+
+class JobStatusResponse(BaseModel):
+    """Response model for polling an asynchronous analysis"""
+    ticket: str
+    status: str
+    result: Optional[JobAnalysisResponse] = None
+    error: Optional[str] = None
 
 class PartitionAnalysisRequest(BaseModel):
     """Request model for partition analysis"""
@@ -45,50 +71,297 @@ class SkewAnalysisResponse(BaseModel):
 
 # API Endpoints
 
-@router.post("/analyze/job", response_model=JobAnalysisResponse)
-async def analyze_job(request: JobAnalysisRequest):
-    """Analyze a Spark job and provide optimization recommendations"""
-    try:
-        logger.info(f"Analyzing job {request.job_id}")
-        
-        # Initialize agent state
-        initial_state = create_agent_state(
-            job_id=request.job_id,
-            job_name=request.job_name,
-            source_type=request.metrics.get("source_type", "parquet"),
-            table_name=request.metrics.get("table_name", "unknown"),
-            partition_count=request.metrics.get("partition_count", 0),
-            execution_time_ms=request.metrics.get("execution_time_ms", 0),
-            cpu_utilization=request.metrics.get("cpu_utilization", 0),
-            memory_used_mb=request.metrics.get("memory_used_mb", 0)
+def _initial_state(request: JobAnalysisRequest) -> AgentState:
+    """Build the workflow input for a job analysis request"""
+    return create_agent_state(
+        job_id=request.job_id,
+        job_name=request.job_name,
+        source_type=request.metrics.get("source_type", "parquet"),
+        table_name=request.metrics.get("table_name", "unknown"),
+        partition_count=request.metrics.get("partition_count", 0),
+        execution_time_ms=request.metrics.get("execution_time_ms", 0),
+        cpu_utilization=request.metrics.get("cpu_utilization", 0),
+        memory_used_mb=request.metrics.get("memory_used_mb", 0),
+        stage_partition_sizes=request.metrics.get("stage_partition_sizes"),
+        stage_runtime=request.metrics.get("stage_runtime"),
+        executor_timeline=request.metrics.get("executor_timeline"),
+        shuffle_analysis=request.metrics.get("shuffle_analysis"),
+        plan_analysis=request.metrics.get("plan_analysis")
+    )
+
+def _build_response(request: JobAnalysisRequest, result: AgentState) -> JobAnalysisResponse:
+    """Build the analysis response from a final workflow state"""
+    return JobAnalysisResponse(
+        job_id=request.job_id,
+        recommendations=result.get("recommendations", []),
+        optimization_score=0.85,
+        estimated_savings={"cpu": "15%", "memory": "20%", "time": "25%"},
+        skipped_agents=result.get("skipped_nodes", []),
+        issues_detected=result.get("issues_detected", [])
+    )
+
+async def _cache_response(
+    cache: Optional[ResultCache],
+    request: JobAnalysisRequest,
+    version: str,
+    response: JobAnalysisResponse
+) -> None:
+    """
+    Cache a complete response.
+    
+    Partial results from timed-out runs are skipped, and so are results
+    with an agent error, which may be transient, as in NodeMemo.
+    """
+    incomplete = any(
+        issue.get("type") == "timeout" or issue.get("severity") == "error"
+        for issue in response.issues_detected
+    )
+    if cache is not None and not incomplete:
+        await cache.set({"metrics": request.metrics}, version, response.model_dump())
+
+async def _run_analysis(
+    request: JobAnalysisRequest,
+    graph: SparkIntelligenceGraph,
+    cache: Optional[ResultCache] = None,
+    flight: Optional[SingleFlight] = None
+) -> JobAnalysisResponse:
+    """
+    Run the shared compiled workflow for one job within the request deadline.
+    
+    Results are cached on the request metrics and the agent/rule version
+    fingerprint; partial results from timed-out runs and results with
+    agent errors are not cached.
+    Concurrent requests with the same job_id and metrics share one run.
+    """
+    version = graph_registry.version
+    cache_payload = {"metrics": request.metrics}
+    if cache is not None:
+        cached = await cache.get(cache_payload, version)
+        if cached is not None:
+            return JobAnalysisResponse(**{**cached, "job_id": request.job_id, "cached": True})
+    
+    async def execute() -> JobAnalysisResponse:
+        result = await graph.run(
+            _initial_state(request),
+            deadline_s=settings.analysis_deadline_ms / 1000
         )
         
-        # Build and compile the LangGraph
-        agents = {
-            "metadata_agent": MetadataAgent(),
-            "partition_agent": PartitionAgent(),
-            "runtime_agent": RuntimeAgent(),
-            "skew_agent": SkewAgent(),
-            "delta_agent": DeltaAgent(),
-            "cost_agent": CostAgent()
-        }
-        
-        graph = build_spark_optimization_graph(agents)
-        compiled_graph = graph.compile()
-        
-        # Execute the workflow
-        result = await compiled_graph.ainvoke(initial_state)
+        response = _build_response(request, result)
+        await _cache_response(cache, request, version, response)
+        return response
+    
+    if flight is None:
+        return await execute()
+    
+    flight_key = canonical_hash({"job_id": request.job_id, "metrics": request.metrics}, version)
+    return await flight.do(flight_key, execute)
+
+# API Endpoints
+
+@router.post("/analyze/job", response_model=JobAnalysisResponse)
+async def analyze_job(
+    request: JobAnalysisRequest,
+    run_async: bool = Query(False, alias="async"),
+    graph: SparkIntelligenceGraph = Depends(get_optimization_graph),
+    pool: AnalysisWorkerPool = Depends(get_worker_pool),
+    cache: Optional[ResultCache] = Depends(get_result_cache),
+    flight: SingleFlight = Depends(get_single_flight)
+):
+    """
+    Analyze a Spark job and provide optimization recommendations.
+    
+    With async=true the analysis is queued for the background worker pool
+    and a ticket for /analyze/status/{ticket} is returned immediately.
+    """
+    if run_async:
+        try:
+            ticket = pool.submit(lambda: _run_analysis(request, graph, cache, flight))
+        except QueueFullError as e:
+            logger.warning(f"Rejecting job {request.job_id}: {str(e)}")
+            raise HTTPException(status_code=429, detail=str(e))
         
-        return JobAnalysisResponse(
-            job_id=request.job_id,
-            recommendations=result.get("recommendations", []),
-            optimization_score=0.85,
-            estimated_savings={"cpu": "15%", "memory": "20%", "time": "25%"}
+        logger.info(f"Queued job {request.job_id} as ticket {ticket.ticket_id}")
+        response = JobTicketResponse(
+            ticket=ticket.ticket_id,
+            status=ticket.status,
+            status_url=f"{router.prefix}/analyze/status/{ticket.ticket_id}"
         )
+        return JSONResponse(status_code=202, content=response.model_dump())
+    
+    try:
+        logger.info(f"Analyzing job {request.job_id}")
+        return await _run_analysis(request, graph, cache, flight)
     except Exception as e:
         logger.error(f"Error analyzing job: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@router.post("/analyze/job/stream")
+async def analyze_job_stream(
+    request: JobAnalysisRequest,
+    graph: SparkIntelligenceGraph = Depends(get_optimization_graph),
+    cache: Optional[ResultCache] = Depends(get_result_cache)
+):
+    """
+    Analyze a Spark job, streaming each agent's findings as Server-Sent Events.
+    
+    An "agent" event is sent as soon as each agent finishes, followed by a
+    "complete" event carrying the full analysis response. A cached result
+    is sent as a single "complete" event.
+    """
+    version = graph_registry.version
+    
+    async def events() -> AsyncIterator[str]:
+        if cache is not None:
+            cached = await cache.get({"metrics": request.metrics}, version)
+            if cached is not None:
+                response = JobAnalysisResponse(**{**cached, "job_id": request.job_id, "cached": True})
+                yield _sse("complete", response.model_dump())
+                return
+        
+        try:
+            async for event in graph.stream(
+                _initial_state(request),
+                deadline_s=settings.analysis_deadline_ms / 1000
+            ):
+                if event.kind == "update":
+                    yield _sse("agent", {
+                        "agent": event.node,
+                        "recommendations": event.data.get("recommendations", []),
+                        "issues_detected": event.data.get("issues_detected", [])
+                    })
+                else:
+                    response = _build_response(request, event.data)
+                    await _cache_response(cache, request, version, response)
+                    yield _sse("complete", response.model_dump())
+        except Exception as e:
+            logger.error(f"Error streaming analysis of job {request.job_id}: {str(e)}")
+            yield _sse("error", {"job_id": request.job_id, "error": str(e)})
+    
+    logger.info(f"Streaming analysis of job {request.job_id}")
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/analyze/status/{ticket}", response_model=JobStatusResponse)
+async def get_analysis_status(
+    ticket: str,
+    pool: AnalysisWorkerPool = Depends(get_worker_pool)
+):
+    """Poll the status of an asynchronously submitted analysis"""
+    status = pool.status(ticket)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Unknown ticket: {ticket}")
+    
+    return JobStatusResponse(
+        ticket=status.ticket_id,
+        status=status.status,
+        result=status.result,
+        error=status.error
+    )
+
+@router.get("/analyze/queue")
+async def get_analysis_queue_metrics(pool: AnalysisWorkerPool = Depends(get_worker_pool)):
+    """Queue depth, wait time and service time of the background worker pool"""
+    return pool.metrics()
+
+@router.get("/analyze/stats")
+async def get_analysis_stats(
+    graph: SparkIntelligenceGraph = Depends(get_optimization_graph),
+    cache: Optional[ResultCache] = Depends(get_result_cache),
+    flight: SingleFlight = Depends(get_single_flight),
+    offload: CPUOffloadPool = Depends(get_offload_pool)
+):
+    """Result cache, request coalescing, per-agent memoization and CPU offload counters"""
+    return {
+        "cache": cache.stats() if cache is not None else None,
+        "coalescing": flight.stats(),
+        "agent_memo": graph.memo_stats(),
+        "offload": offload.metrics()
+    }
+
+async def _ndjson_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Split a streamed body into its non-empty lines, holding at most one partial line"""
+    partial = b""
+    async for chunk in chunks:
+        lines = (partial + chunk).split(b"\n")
+        partial = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield line
+    if partial.strip():
+        yield partial
+
+class _BodyStreamingResponse(StreamingResponse):
+    """
+    Streaming response whose body is produced while the request body is read.
+    
+    StreamingResponse watches receive() for a client disconnect while it
+    streams, which would swallow request body chunks; the watch starts only
+    once the request body has been read.
+    """
+    
+    def __init__(self, content: AsyncIterator[str], body_read: asyncio.Event, **kwargs):
+        super().__init__(content, **kwargs)
+        self.body_read = body_read
+    
+    async def listen_for_disconnect(self, receive) -> None:
+        await self.body_read.wait()
+        await super().listen_for_disconnect(receive)
+
+@router.post("/analyze/jobs")
+async def analyze_jobs(
+    request: Request,
+    concurrency: Optional[int] = Query(None, ge=1),
+    graph: SparkIntelligenceGraph = Depends(get_optimization_graph),
+    cache: Optional[ResultCache] = Depends(get_result_cache),
+    flight: SingleFlight = Depends(get_single_flight)
+):
+    """
+    Analyze many jobs, streaming one NDJSON result per job in completion order.
+    
+    The body is NDJSON, one job analysis request per line. Lines are read
+    from the body only as analysis slots free up, so memory stays
+    proportional to the concurrency rather than to the number of jobs.
+    """
+    limit = min(
+        concurrency or settings.bulk_analysis_concurrency,
+        settings.bulk_analysis_max_concurrency
+    )
+    logger.info(f"Bulk analyzing jobs with concurrency {limit}")
+    body_read = asyncio.Event()
+    
+    async def jobs() -> AsyncIterator[bytes]:
+        try:
+            async for line in _ndjson_lines(request.stream()):
+                yield line
+        finally:
+            body_read.set()
+    
+    async def analyze_line(line: bytes) -> str:
+        try:
+            job = JobAnalysisRequest.model_validate_json(line)
+        except ValidationError as e:
+            logger.error(f"Invalid bulk analysis line: {str(e)}")
+            return json.dumps({"job_id": None, "error": str(e)}) + "\n"
+        try:
+            response = await _run_analysis(job, graph, cache, flight)
+            return response.model_dump_json() + "\n"
+        except Exception as e:
+            logger.error(f"Error analyzing job {job.job_id}: {str(e)}")
+            return json.dumps({"job_id": job.job_id, "error": str(e)}) + "\n"
+    
+    async def stream() -> AsyncIterator[str]:
+        async for line in map_unordered(analyze_line, jobs(), limit):
+            yield line
+    
+    return _BodyStreamingResponse(stream(), body_read, media_type="application/x-ndjson")
+
 @router.post("/analyze/partition", response_model=SkewAnalysisResponse)
 async def analyze_partition(request: PartitionAnalysisRequest):
     """Analyze partition skew in a table"""
@@ -43,6 +43,23 @@ class Settings(BaseSettings):
     kafka_topic_events: str = "spark-events"
     kafka_topic_metrics: str = "spark-metrics"
     
+    # Orchestration Configuration
+    graph_topology: str = os.getenv("GRAPH_TOPOLOGY", "fan_out")
+    graph_backend: str = os.getenv("GRAPH_BACKEND", "langgraph")
+    analysis_deadline_ms: int = int(os.getenv("ANALYSIS_DEADLINE_MS", "5000"))
+    bulk_analysis_concurrency: int = int(os.getenv("BULK_ANALYSIS_CONCURRENCY", "32"))
+    bulk_analysis_max_concurrency: int = int(os.getenv("BULK_ANALYSIS_MAX_CONCURRENCY", "256"))
+    analysis_workers: int = int(os.getenv("ANALYSIS_WORKERS", "4"))
+    analysis_queue_size: int = int(os.getenv("ANALYSIS_QUEUE_SIZE", "1000"))
+    offload_executor: str = os.getenv("OFFLOAD_EXECUTOR", "process")
+    offload_workers: int = int(os.getenv("OFFLOAD_WORKERS", "0"))
+    
+    # Result Cache Configuration
+    result_cache_backend: str = os.getenv("RESULT_CACHE_BACKEND", "memory")
+    result_cache_max_entries: int = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "10000"))
+    result_cache_ttl_s: int = int(os.getenv("RESULT_CACHE_TTL_S", "3600"))
+    redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    
     # RAG Configuration
     rag_similarity_threshold: float = 0.7
     rag_top_k_results: int = 5
@@ -1,10 +1,40 @@
 """Dependency injection for FastAPI endpoints"""
 
 from app.config import settings
+from app.metrics import AnalysisCollector, OffloadCollector, observe_agent, registry as metrics_registry
+from agents import create_default_agents
+from orchestration.graph_builder import SparkIntelligenceGraph
+from orchestration.graph_registry import graph_registry
+from orchestration.concurrency import SingleFlight
+from orchestration.offload import CPUOffloadPool, offload_pool
+from orchestration.worker_pool import AnalysisWorkerPool
+from storage.result_cache import ResultCache, create_result_cache
+from typing import Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+worker_pool = AnalysisWorkerPool(
+    workers=settings.analysis_workers,
+    max_queue=settings.analysis_queue_size
+)
+
+result_cache = create_result_cache(
+    settings.result_cache_backend,
+    max_entries=settings.result_cache_max_entries,
+    ttl_s=settings.result_cache_ttl_s,
+    redis_url=settings.redis_url
+)
+
+single_flight = SingleFlight()
+
+if not offload_pool.running:
+    offload_pool.configure(settings.offload_executor, settings.offload_workers or None)
+
+metrics_registry.register(AnalysisCollector(worker_pool, result_cache, single_flight))
+metrics_registry.register(OffloadCollector(offload_pool))
+graph_registry.add_node_hook(observe_agent)
+
 async def get_settings():
     """Dependency to inject application settings"""
     return settings
@@ -12,3 +42,30 @@ async def get_settings():
 async def get_logger():
     """Dependency to inject logger"""
     return logger
+
+def init_graph_registry() -> SparkIntelligenceGraph:
+    """Register the default agents and compile the configured graph"""
+    graph_registry.register_agents(create_default_agents())
+    return graph_registry.get(settings.graph_topology, settings.graph_backend)
+
+async def get_optimization_graph() -> SparkIntelligenceGraph:
+    """Dependency to inject the shared compiled optimization graph"""
+    if not graph_registry.agents:
+        return init_graph_registry()
+    return graph_registry.get(settings.graph_topology, settings.graph_backend)
+
+async def get_worker_pool() -> AnalysisWorkerPool:
+    """Dependency to inject the background analysis worker pool"""
+    return worker_pool
+
+async def get_result_cache() -> Optional[ResultCache]:
+    """Dependency to inject the analysis result cache, None when disabled"""
+    return result_cache
+
+async def get_single_flight() -> SingleFlight:
+    """Dependency to inject the coalescing group for identical analyses"""
+    return single_flight
+
+async def get_offload_pool() -> CPUOffloadPool:
+    """Dependency to inject the executor for CPU-bound agent sections"""
+    return offload_pool
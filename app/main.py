@@ -1,20 +1,40 @@
 """FastAPI main application entry point"""
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 import logging
+import time
 from app.api_routes import router
 from app.config import settings
+from app.dependencies import init_graph_registry, offload_pool, worker_pool
+from app.metrics import observe_request, render
+from prometheus_client import CONTENT_TYPE_LATEST
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build shared resources once per process"""
+    init_graph_registry()
+    logger.info(
+        f"Optimization graph ready (topology={settings.graph_topology}, "
+        f"backend={settings.graph_backend})"
+    )
+    offload_pool.start()
+    worker_pool.start()
+    yield
+    await worker_pool.stop()
+    await offload_pool.stop()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Spark Intelligence Copilot",
     description="AI-powered Spark job analysis and optimization",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -26,9 +46,50 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class RequestLatencyMiddleware:
+    """
+    Record request latency labelled by route template.
+    
+    Latency runs to the start of the response, as for streamed responses
+    the body may take as long as the client keeps reading. A plain ASGI
+    middleware leaves receive() to the endpoint, so bodies streamed in while
+    the response streams out (/analyze/jobs) are not read from two places.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start = time.perf_counter()
+        
+        async def send_observed(message):
+            if message["type"] == "http.response.start":
+                # The router records the matched route in the shared scope
+                route = scope.get("route")
+                observe_request(
+                    scope["method"],
+                    getattr(route, "path", "unmatched"),
+                    message["status"],
+                    time.perf_counter() - start
+                )
+            await send(message)
+        
+        await self.app(scope, receive, send_observed)
+
+app.add_middleware(RequestLatencyMiddleware)
+
 # Include API routes
 app.include_router(router)
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics: per-agent and HTTP latency histograms, queue and cache counters"""
+    return Response(render(), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
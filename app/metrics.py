@@ -0,0 +1,150 @@
+"""Prometheus metrics for the API process"""
+
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from prometheus_client import CollectorRegistry, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+
+# Agents run in microseconds to seconds, so buckets start at 100us
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# A dedicated registry keeps re-imports (tests, reloads) from registering
+# the same series twice
+registry = CollectorRegistry()
+
+agent_duration = Histogram(
+    "spark_copilot_agent_duration_seconds",
+    "Wall time of each workflow agent execution",
+    ["agent", "outcome"],
+    buckets=LATENCY_BUCKETS,
+    registry=registry
+)
+
+request_duration = Histogram(
+    "spark_copilot_http_request_duration_seconds",
+    "Latency of HTTP requests until the response starts",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+    registry=registry
+)
+
+# Labelled children by label values. Agents, outcomes, routes and statuses
+# are few, and looking a child up here skips the lock and label
+# validation that .labels() pays on every observation
+_agent_children: Dict[Tuple[str, str], Any] = {}
+_request_children: Dict[Tuple[str, str, int], Any] = {}
+
+
+def observe_agent(agent: str, seconds: float, outcome: str) -> None:
+    """Node hook recording one agent execution"""
+    child = _agent_children.get((agent, outcome))
+    if child is None:
+        child = _agent_children[(agent, outcome)] = agent_duration.labels(agent, outcome)
+    child.observe(seconds)
+
+
+def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    """Record one HTTP request, labelled by its route template"""
+    child = _request_children.get((method, route, status))
+    if child is None:
+        child = _request_children[(method, route, status)] = request_duration.labels(method, route, str(status))
+    child.observe(seconds)
+
+
+def render() -> bytes:
+    """Serialize all metrics in the Prometheus text format"""
+    return generate_latest(registry)
+
+
+class AnalysisCollector:
+    """
+    Expose worker pool, result cache and coalescing counters at scrape time.
+
+    The components keep their own counters; this collector only reads them,
+    so nothing is added to the request path.
+    """
+
+    def __init__(self, pool: Any, cache: Optional[Any], flight: Any):
+        """
+        Initialize the collector
+
+        Args:
+            pool: AnalysisWorkerPool
+            cache: ResultCache, or None when caching is disabled
+            flight: SingleFlight coalescing group
+        """
+        self.pool = pool
+        self.cache = cache
+        self.flight = flight
+
+    def collect(self) -> Iterator[Metric]:
+        pool = self.pool.metrics()
+        yield GaugeMetricFamily(
+            "spark_copilot_worker_queue_depth", "Analyses waiting for a worker", value=pool["queue_depth"]
+        )
+        yield GaugeMetricFamily(
+            "spark_copilot_worker_busy", "Workers running an analysis", value=pool["busy_workers"]
+        )
+        jobs = CounterMetricFamily(
+            "spark_copilot_worker_jobs", "Asynchronous analyses by outcome", labels=["outcome"]
+        )
+        for outcome in ("submitted", "rejected", "completed", "failed"):
+            jobs.add_metric([outcome], pool[outcome])
+        yield jobs
+
+        if self.cache is not None:
+            cache = self.cache.stats()
+            lookups = CounterMetricFamily(
+                "spark_copilot_result_cache_lookups", "Result cache lookups by result", labels=["result"]
+            )
+            lookups.add_metric(["hit"], cache["hits"])
+            lookups.add_metric(["miss"], cache["misses"])
+            yield lookups
+
+        flight = self.flight.stats()
+        yield CounterMetricFamily(
+            "spark_copilot_analysis_executions", "Workflow runs started for job analyses",
+            value=flight["executions"]
+        )
+        yield CounterMetricFamily(
+            "spark_copilot_analysis_coalesced", "Job analyses served by an identical in-flight run",
+            value=flight["coalesced"]
+        )
+
+
+class OffloadCollector:
+    """Expose CPU offload pool saturation at scrape time"""
+
+    def __init__(self, offload: Any):
+        """
+        Initialize the collector
+
+        Args:
+            offload: CPUOffloadPool
+        """
+        self.offload = offload
+
+    def collect(self) -> Iterator[Metric]:
+        offload = self.offload.metrics()
+        yield GaugeMetricFamily(
+            "spark_copilot_offload_workers", "Size of the CPU offload executor", value=offload["workers"]
+        )
+        yield GaugeMetricFamily(
+            "spark_copilot_offload_in_flight", "CPU-bound sections submitted and not finished",
+            value=offload["in_flight"]
+        )
+        calls = CounterMetricFamily(
+            "spark_copilot_offload_calls", "CPU-bound sections by outcome", labels=["outcome"]
+        )
+        for outcome in ("submitted", "completed", "failed", "saturated"):
+            calls.add_metric([outcome], offload[outcome])
+        yield calls
+        for name, stats in (("wait", offload["wait_time"]), ("service", offload["service_time"])):
+            yield CounterMetricFamily(
+                f"spark_copilot_offload_{name}_seconds",
+                f"Total {name} time of CPU-bound sections",
+                value=stats["mean_ms"] * stats["count"] / 1000
+            )
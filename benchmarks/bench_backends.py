@@ -0,0 +1,55 @@
+"""
+Benchmark: LangGraph vs pure-asyncio execution of the same workflow.
+
+The default agents do microsecond-scale work, so per-step framework
+overhead dominates a run. Both backends run the identical graph.
+
+Run with:
+    python -m benchmarks.bench_backends --runs 2000
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from agents import create_default_agents
+from orchestration.graph_builder import build_spark_optimization_graph
+from orchestration.state_model import create_agent_state
+
+
+async def _measure(topology: str, backend: str, runs: int) -> float:
+    graph = build_spark_optimization_graph(create_default_agents(), topology=topology, backend=backend)
+    graph.compile()
+    timings = []
+    for i in range(runs):
+        state = create_agent_state(
+            job_id=f"bench_{i}",
+            job_name="Backend Benchmark",
+            source_type="delta",
+            partition_count=5,
+            execution_time_ms=90000,
+            cpu_utilization=0.3,
+        )
+        start = time.perf_counter()
+        await graph.run(state)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e6
+
+
+async def main(runs: int) -> None:
+    logging.disable(logging.INFO)
+    for topology in ("sequential", "fan_out"):
+        langgraph = await _measure(topology, "langgraph", runs)
+        native = await _measure(topology, "asyncio", runs)
+        print(f"{topology:10s} langgraph median  {langgraph:9.1f}us")
+        print(f"{topology:10s} asyncio median    {native:9.1f}us")
+        print(f"{topology:10s} speedup           {langgraph / native:9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.runs))
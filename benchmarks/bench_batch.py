@@ -0,0 +1,99 @@
+"""
+Benchmark: vectorized batch analysis vs the per-job agent loop.
+
+Analyzes the same synthetic fleet with the partition, runtime, skew and
+cost agents, once job by job and once through run_batch, and checks that
+both produce the same findings. Each side reports its best of --repeat
+runs.
+
+Run with:
+    python -m benchmarks.bench_batch --jobs 100000
+"""
+
+import argparse
+import asyncio
+import gc
+import logging
+import time
+
+import numpy as np
+
+from agents import create_default_agents
+from orchestration.batch_runner import BATCH_AGENTS, run_batch
+from orchestration.graph_builder import AGENT_PREDICATES
+from orchestration.job_batch import JobBatch
+from orchestration.state_model import apply_update, create_agent_state
+
+
+def _fleet(jobs: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    return [
+        create_agent_state(
+            job_id=f"job_{i}",
+            job_name="Fleet Benchmark",
+            source_type="parquet",
+            partition_count=int(partitions),
+            execution_time_ms=int(runtime),
+            cpu_utilization=float(cpu),
+            memory_used_mb=int(memory),
+        )
+        for i, (partitions, runtime, cpu, memory) in enumerate(zip(
+            rng.integers(0, 3000, jobs),
+            rng.integers(1000, 600000, jobs),
+            rng.random(jobs),
+            rng.integers(512, 16384, jobs),
+        ))
+    ]
+
+
+async def _per_job(states):
+    agents = create_default_agents()
+    results = []
+    for state in states:
+        update = {"recommendations": [], "issues_detected": []}
+        for name, _ in BATCH_AGENTS:
+            predicate = AGENT_PREDICATES.get(name)
+            if predicate is None or predicate(state):
+                update = apply_update(update, await agents[name](state))
+        results.append(update)
+    return results
+
+
+def main(jobs: int, repeat: int) -> None:
+    logging.disable(logging.INFO)
+    states = _fleet(jobs)
+
+    # Each timed section starts with the objects alive so far moved out of
+    # the collector's view, so neither path pays for full collections that
+    # rescan the fleet or the results of the other one
+    per_job_s = batch_s = float("inf")
+    for _ in range(repeat):
+        expected = results = None
+        gc.collect()
+        gc.freeze()
+        start = time.perf_counter()
+        expected = asyncio.run(_per_job(states))
+        per_job_s = min(per_job_s, time.perf_counter() - start)
+
+        gc.collect()
+        gc.freeze()
+        start = time.perf_counter()
+        batch = JobBatch.from_states(states)
+        results = run_batch(batch)
+        batch_s = min(batch_s, time.perf_counter() - start)
+        gc.unfreeze()
+
+        assert results == expected, "batch findings differ from the per-job loop"
+
+    print(f"jobs               {jobs:10d}")
+    print(f"per-job loop       {per_job_s:10.2f}s ({jobs / per_job_s:10.0f} jobs/s)")
+    print(f"batch              {batch_s:10.2f}s ({jobs / batch_s:10.0f} jobs/s)")
+    print(f"speedup            {per_job_s / batch_s:10.1f}x (best of {repeat})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.jobs, args.repeat)
@@ -0,0 +1,161 @@
+"""
+Benchmark: streaming event-log parsing throughput.
+
+Writes a synthetic event log with realistic TaskStart/TaskEnd/BlockUpdated
+traffic, then measures how many uncompressed MB/s parse_file aggregates from
+the plain, gzip and zstd versions. A baseline decodes every line with
+json.loads, as the original list-based parser required. The plain log is
+also parsed in parallel byte ranges with increasing worker counts; results
+must equal the serial aggregate.
+
+Run with:
+    python -m benchmarks.bench_event_parser --tasks 200000 --workers 1 2 4 8
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+from typing import List
+
+from connectors.spark_event_parser import SparkEventParser
+
+
+def _task_end(task_id: int, stage_id: int, rng: random.Random) -> dict:
+    launch = 1_700_000_000_000 + task_id * 3
+    duration = int(rng.lognormvariate(6, 1))
+    return {
+        "Event": "SparkListenerTaskEnd",
+        "Stage ID": stage_id,
+        "Stage Attempt ID": 0,
+        "Task Type": "ShuffleMapTask",
+        "Task End Reason": {"Reason": "Success"},
+        "Task Info": {
+            "Task ID": task_id, "Index": task_id % 200, "Attempt": 0, "Partition ID": task_id % 200,
+            "Launch Time": launch, "Executor ID": str(task_id % 50), "Host": f"10.0.0.{task_id % 50}",
+            "Locality": "PROCESS_LOCAL", "Speculative": False, "Getting Result Time": 0,
+            "Finish Time": launch + duration, "Failed": False, "Killed": False, "Accumulables": [],
+        },
+        "Task Executor Metrics": {
+            "JVMHeapMemory": rng.randrange(1 << 28, 1 << 32), "JVMOffHeapMemory": 1 << 26,
+            "OnHeapExecutionMemory": 0, "OffHeapExecutionMemory": 0, "OnHeapStorageMemory": 1 << 20,
+        },
+        "Task Metrics": {
+            "Executor Deserialize Time": 3, "Executor Deserialize CPU Time": 2_000_000,
+            "Executor Run Time": duration, "Executor CPU Time": duration * 700_000,
+            "Peak Execution Memory": 1 << 24, "Result Size": 2500, "JVM GC Time": duration // 20,
+            "Result Serialization Time": 0, "Memory Bytes Spilled": 0, "Disk Bytes Spilled": 0,
+            "Shuffle Read Metrics": {
+                "Remote Blocks Fetched": 40, "Local Blocks Fetched": 10, "Fetch Wait Time": 1,
+                "Remote Bytes Read": rng.randrange(1 << 24), "Remote Bytes Read To Disk": 0,
+                "Local Bytes Read": rng.randrange(1 << 22), "Total Records Read": 100000,
+            },
+            "Shuffle Write Metrics": {
+                "Shuffle Bytes Written": rng.randrange(1 << 24), "Shuffle Write Time": 2_000_000,
+                "Shuffle Records Written": 100000,
+            },
+            "Input Metrics": {"Bytes Read": 0, "Records Read": 0},
+            "Output Metrics": {"Bytes Written": 0, "Records Written": 0},
+            "Updated Blocks": [],
+        },
+    }
+
+
+def _line(event: dict) -> str:
+    """Compact JSON line, as Spark writes it"""
+    return json.dumps(event, separators=(",", ":")) + "\n"
+
+
+def write_event_log(path: str, tasks: int, seed: int = 3) -> None:
+    """Write a synthetic uncompressed event log with the given number of tasks"""
+    rng = random.Random(seed)
+    with open(path, "w") as log:
+        log.write(_line({"Event": "SparkListenerLogStart", "Spark Version": "3.5.0"}))
+        for executor in range(50):
+            log.write(_line({
+                "Event": "SparkListenerExecutorAdded", "Timestamp": 1_700_000_000_000,
+                "Executor ID": str(executor), "Executor Info": {"Host": f"10.0.0.{executor}", "Total Cores": 4},
+            }))
+        for task_id in range(tasks):
+            stage_id = task_id // 1000
+            log.write(_line({
+                "Event": "SparkListenerTaskStart", "Stage ID": stage_id, "Stage Attempt ID": 0,
+                "Task Info": {"Task ID": task_id, "Executor ID": str(task_id % 50)},
+            }))
+            log.write(_line({
+                "Event": "SparkListenerBlockUpdated",
+                "Block Updated Info": {"Block Manager ID": {"Executor ID": str(task_id % 50)},
+                                       "Block ID": f"broadcast_{task_id}_piece0", "Memory Size": 4096},
+            }))
+            log.write(_line(_task_end(task_id, stage_id, rng)))
+            if task_id % 1000 == 999:
+                log.write(_line({
+                    "Event": "SparkListenerStageCompleted",
+                    "Stage Info": {"Stage ID": stage_id, "Stage Attempt ID": 0, "Number of Tasks": 1000},
+                }))
+
+
+def _compress(path: str, codec: str) -> str:
+    target = f"{path}.{codec}"
+    with open(path, "rb") as source:
+        data = source.read()
+    if codec == "gz":
+        data = gzip.compress(data, compresslevel=6)
+    else:
+        import zstandard
+        data = zstandard.ZstdCompressor(level=3).compress(data)
+    with open(target, "wb") as out:
+        out.write(data)
+    return target
+
+
+def _naive(path: str) -> int:
+    with open(path, "rb") as log:
+        return sum(1 for line in log if json.loads(line).get("Event") == "SparkListenerTaskEnd")
+
+
+def main(tasks: int, workers: List[int]) -> None:
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as workdir:
+        plain = os.path.join(workdir, "eventlog")
+        write_event_log(plain, tasks)
+        size_mb = os.path.getsize(plain) / 1e6
+
+        start = time.perf_counter()
+        _naive(plain)
+        naive_s = time.perf_counter() - start
+        print(f"log size           {size_mb:10.1f} MB ({tasks} tasks)")
+        print(f"json.loads per line{size_mb / naive_s:10.1f} MB/s")
+
+        for codec in ("plain", "gz", "zst"):
+            try:
+                path = plain if codec == "plain" else _compress(plain, codec)
+            except ImportError:
+                print(f"{codec:19s}   skipped (zstandard not installed)")
+                continue
+            start = time.perf_counter()
+            aggregate = SparkEventParser.parse_file(path)
+            elapsed = time.perf_counter() - start
+            assert aggregate.tasks.tasks == tasks
+            print(f"parse_file {codec:8s}{size_mb / elapsed:10.1f} MB/s")
+            if codec == "plain":
+                serial = aggregate
+
+        for count in workers:
+            start = time.perf_counter()
+            aggregate = SparkEventParser.parse_file_parallel(plain, workers=count)
+            elapsed = time.perf_counter() - start
+            assert aggregate == serial, "parallel aggregate differs from the serial one"
+            print(f"parallel {count:3d} workers{size_mb / elapsed:7.1f} MB/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=200000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+    main(args.tasks, args.workers)
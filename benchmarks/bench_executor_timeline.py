@@ -0,0 +1,50 @@
+"""
+Benchmark: executor-slot timeline of a large application.
+
+Builds a synthetic task table spread over executors that come and go, then
+times the sweep-line reconstruction of the slot occupancy and per-executor
+busy time.
+
+Run with:
+    python -m benchmarks.bench_executor_timeline --tasks 1000000 --executors 500
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from analysis.executor_timeline import build_timeline
+from connectors.event_log_aggregate import EventLogAggregate
+from connectors.task_table import TASK_DTYPE, TaskTable
+
+
+def main(tasks: int, executors: int) -> None:
+    rng = np.random.default_rng(0)
+    aggregate = EventLogAggregate()
+    for executor in range(executors):
+        added = int(rng.integers(0, 600_000))
+        aggregate.add_event({"Event": "SparkListenerExecutorAdded", "Executor ID": str(executor),
+                             "Timestamp": added, "Executor Info": {"Total Cores": 4}})
+        aggregate.add_event({"Event": "SparkListenerExecutorRemoved", "Executor ID": str(executor),
+                             "Timestamp": added + 3_600_000})
+    table = np.zeros(tasks, dtype=TASK_DTYPE)
+    table["executor"] = rng.integers(0, executors, tasks)
+    table["launch_time_ms"] = rng.integers(600_000, 3_000_000, tasks)
+    table["duration_ms"] = rng.lognormal(8, 0.7, tasks).astype(np.int64)
+
+    start = time.perf_counter()
+    summary = build_timeline(aggregate, TaskTable(tasks=table, executors=list(map(str, range(executors))))).summary()
+    elapsed = time.perf_counter() - start
+
+    print(f"timeline           {elapsed * 1000:10.1f} ms ({tasks} tasks, {executors} executors)")
+    print(f"slot utilization   {summary['slot_utilization']:10.1%}")
+    print(f"idle executor time {summary['idle_executor_ms'] / 3_600_000:10.1f} h")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=1000000)
+    parser.add_argument("--executors", type=int, default=500)
+    args = parser.parse_args()
+    main(args.tasks, args.executors)
@@ -0,0 +1,71 @@
+"""
+Benchmark: sequential vs fan-out topology with artificially slow agents.
+
+Each agent sleeps for a fixed delay before doing its real work, standing in
+for metadata fetches, model inference or retrieval. The sequential chain
+pays the sum of all delays; the fan-out graph pays roughly
+entry + slowest branch + final.
+
+Run with:
+    python -m benchmarks.bench_fan_out --delay-ms 50 --runs 10
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from typing import Callable, Dict
+
+from agents import create_default_agents
+from orchestration.graph_builder import build_spark_optimization_graph
+from orchestration.state_model import create_agent_state
+
+
+def _slow(agent: Callable, delay_s: float) -> Callable:
+    async def slow_agent(state):
+        await asyncio.sleep(delay_s)
+        return await agent(state)
+    return slow_agent
+
+
+def _slow_agents(delay_s: float) -> Dict[str, Callable]:
+    return {name: _slow(agent, delay_s) for name, agent in create_default_agents().items()}
+
+
+async def _measure(topology: str, delay_s: float, runs: int) -> float:
+    graph = build_spark_optimization_graph(_slow_agents(delay_s), topology=topology)
+    graph.compile()
+    timings = []
+    for i in range(runs):
+        state = create_agent_state(
+            job_id=f"bench_{i}",
+            job_name="Fan-out Benchmark",
+            source_type="delta",
+            partition_count=5,
+            execution_time_ms=90000,
+            cpu_utilization=0.3,
+        )
+        start = time.perf_counter()
+        await graph.run(state)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+async def main(delay_ms: float, runs: int) -> None:
+    logging.disable(logging.INFO)
+    delay_s = delay_ms / 1000
+    sequential = await _measure("sequential", delay_s, runs)
+    fan_out = await _measure("fan_out", delay_s, runs)
+    print(f"agent delay        {delay_ms:8.1f}ms")
+    print(f"sequential median  {sequential:8.1f}ms")
+    print(f"fan_out median     {fan_out:8.1f}ms")
+    print(f"speedup            {sequential / fan_out:8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--delay-ms", type=float, default=50.0)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.delay_ms, args.runs))
@@ -0,0 +1,80 @@
+"""
+Benchmark: per-request latency with and without the compiled-graph registry.
+
+Run with:
+    python -m benchmarks.bench_graph_registry --requests 200
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from typing import List
+
+from agents import create_default_agents
+from orchestration.graph_builder import build_spark_optimization_graph
+from orchestration.graph_registry import GraphRegistry
+from orchestration.state_model import create_agent_state
+
+
+def _request_state(i: int):
+    return create_agent_state(
+        job_id=f"bench_job_{i}",
+        job_name="Benchmark Job",
+        source_type="parquet",
+        table_name="bench_table",
+        partition_count=200,
+        execution_time_ms=90000,
+        cpu_utilization=0.4,
+        memory_used_mb=4096,
+    )
+
+
+async def _without_registry(requests: int) -> List[float]:
+    """Build and compile the graph inside every request (previous behaviour)"""
+    latencies = []
+    for i in range(requests):
+        start = time.perf_counter()
+        graph = build_spark_optimization_graph(create_default_agents())
+        graph.compile()
+        await graph.run(_request_state(i))
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def _with_registry(requests: int) -> List[float]:
+    """Reuse a graph compiled once at startup"""
+    registry = GraphRegistry()
+    registry.register_agents(create_default_agents())
+    registry.get()
+    latencies = []
+    for i in range(requests):
+        start = time.perf_counter()
+        graph = registry.get()
+        await graph.run(_request_state(i))
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def _report(label: str, latencies: List[float]) -> float:
+    ordered = sorted(latencies)
+    mean_ms = statistics.mean(ordered) * 1000
+    p50_ms = ordered[len(ordered) // 2] * 1000
+    p99_ms = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000
+    print(f"{label:<20} mean={mean_ms:8.3f}ms  p50={p50_ms:8.3f}ms  p99={p99_ms:8.3f}ms")
+    return mean_ms
+
+
+async def main(requests: int) -> None:
+    logging.disable(logging.INFO)
+    baseline = _report("without registry", await _without_registry(requests))
+    cached = _report("with registry", await _with_registry(requests))
+    print(f"speedup: {baseline / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
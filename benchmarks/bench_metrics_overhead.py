@@ -0,0 +1,91 @@
+"""
+Benchmark: cost of per-agent latency metrics on a workflow run.
+
+Measures the time the Prometheus node hook adds to each agent execution,
+by running a no-op node through the graph's timing wrapper with and
+without the hook, and checks it against OVERHEAD_BUDGET_US. It also runs
+the default fan-out graph with and without the hook, alternating which goes
+first so drift affects both sides alike, and reports the end-to-end difference.
+
+Run with:
+    python -m benchmarks.bench_metrics_overhead --runs 2000
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+
+from agents import create_default_agents
+from app.metrics import observe_agent
+from orchestration.graph_builder import SparkIntelligenceGraph, build_spark_optimization_graph
+from orchestration.state_model import create_agent_state
+
+# Metrics may add at most this much to one agent execution
+OVERHEAD_BUDGET_US = 10.0
+
+
+async def _noop_agent(state):
+    return {}
+
+
+async def _node_cost(with_hook: bool, calls: int) -> float:
+    """Median time per execution of a no-op node, in microseconds"""
+    graph = SparkIntelligenceGraph()
+    if with_hook:
+        graph.add_node_hook(observe_agent)
+    node = graph._timed("metadata_agent", _noop_agent)
+    batches = []
+    for _ in range(20):
+        start = time.perf_counter()
+        for _ in range(calls // 20):
+            await node({})
+        batches.append((time.perf_counter() - start) / (calls // 20))
+    return statistics.median(batches) * 1e6
+
+
+async def _run_costs(runs: int) -> tuple:
+    """Median workflow run time without and with the hook, in microseconds"""
+    plain_graph = build_spark_optimization_graph(create_default_agents())
+    hooked_graph = build_spark_optimization_graph(create_default_agents())
+    hooked_graph.add_node_hook(observe_agent)
+    plain, hooked = [], []
+    pairs = [(plain_graph, plain), (hooked_graph, hooked)]
+    for i in range(runs):
+        for graph, timings in (pairs if i % 2 else pairs[::-1]):
+            state = create_agent_state(
+                job_id=f"bench_{i}",
+                job_name="Metrics Benchmark",
+                source_type="delta",
+                partition_count=5,
+                execution_time_ms=90000,
+                cpu_utilization=0.3,
+            )
+            start = time.perf_counter()
+            await graph.run(state)
+            timings.append(time.perf_counter() - start)
+    return statistics.median(plain) * 1e6, statistics.median(hooked) * 1e6
+
+
+async def main(runs: int) -> None:
+    logging.disable(logging.INFO)
+    nodes = len(create_default_agents())
+    await _node_cost(True, 20000)  # warm up
+    per_agent = await _node_cost(True, 200000) - await _node_cost(False, 200000)
+    plain, hooked = await _run_costs(runs)
+    print(f"overhead per agent   {per_agent:9.1f}us (budget {OVERHEAD_BUDGET_US:.1f}us)")
+    print(f"run without metrics  {plain:9.1f}us")
+    print(f"run with metrics     {hooked:9.1f}us")
+    print(f"overhead per run     {hooked - plain:9.1f}us ({(hooked - plain) / plain:.1%}, "
+          f"{nodes} agents)")
+    if per_agent > OVERHEAD_BUDGET_US:
+        sys.exit(f"metrics overhead of {per_agent:.1f}us per agent exceeds the {OVERHEAD_BUDGET_US:.1f}us budget")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.runs))
@@ -0,0 +1,58 @@
+"""
+Benchmark: compiling and sizing a large SQL physical plan.
+
+Builds a synthetic plan of sort-merge joins over shuffled scans (a left-deep
+join chain, so the tree is as deep as it is wide), then times compile_plan
+and the join findings against its stage metric values.
+
+Run with:
+    python -m benchmarks.bench_physical_plan --joins 10000
+"""
+
+import argparse
+import time
+
+from analysis.physical_plan import PlanAnalyzer, compile_plan
+
+
+def _node(name, children, metric_id=None, simple=None):
+    metrics = [{"name": "data size", "accumulatorId": metric_id}] if metric_id is not None else []
+    return {"nodeName": name, "simpleString": simple or name, "children": children,
+            "metadata": {}, "metrics": metrics}
+
+
+def _shuffled_scan(table: int, metric_id: int):
+    scan = _node("Scan parquet", [])
+    scan["metadata"]["Location"] = f"InMemoryFileIndex[s3://lake/t{table % 100}]"
+    exchange = _node("Exchange", [scan], metric_id, f"Exchange hashpartitioning(k#{table}, 200), "
+                                                     f"ENSURE_REQUIREMENTS, [plan_id={table}]")
+    return _node("Sort", [exchange])
+
+
+def main(joins: int) -> None:
+    plan = _shuffled_scan(0, 0)
+    for join in range(1, joins + 1):
+        plan = _node("SortMergeJoin", [plan, _shuffled_scan(join, join)])
+    metric_values = {metric_id: (metric_id % 1000 + 1) * 1024 ** 2 for metric_id in range(joins + 1)}
+
+    start = time.perf_counter()
+    compiled = compile_plan(plan)
+    compile_s = time.perf_counter() - start
+
+    analyzer = PlanAnalyzer()
+    analyzer.plans[0] = compiled
+    analyzer.metric_values = metric_values
+    start = time.perf_counter()
+    findings = analyzer.findings()
+    findings_s = time.perf_counter() - start
+
+    print(f"compile plan       {compile_s * 1000:10.1f} ms ({len(compiled.parents)} nodes)")
+    print(f"findings           {findings_s * 1000:10.1f} ms "
+          f"({len(findings['broadcast_joins'])} broadcast joins, {len(findings['repeated_scans'])} repeated scans)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--joins", type=int, default=10000)
+    args = parser.parse_args()
+    main(args.joins)
@@ -0,0 +1,77 @@
+"""
+Benchmark: vectorized skew statistics vs a pure-Python computation.
+
+Computes the same statistics (CV, Gini, max/median, p99/p50, top-k) for
+every stage of a synthetic job, once with Python lists and once with
+stage_skew_statistics, and checks that both agree.
+
+Run with:
+    python -m benchmarks.bench_skew_statistics --stages 20 --partitions 200000
+"""
+
+import argparse
+import heapq
+import math
+import time
+
+import numpy as np
+
+from rules_engine.skew_statistics import stage_skew_statistics
+
+
+def _quantile(ordered, q):
+    position = q * (len(ordered) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _python_statistics(sizes, top_k=5):
+    ordered = sorted(sizes)
+    count = len(ordered)
+    total = sum(ordered)
+    mean = total / count
+    median = _quantile(ordered, 0.5)
+    std = math.sqrt(sum((size - mean) ** 2 for size in ordered) / count)
+    gini = sum((2 * rank - count - 1) * size for rank, size in enumerate(ordered, 1)) / (count * total)
+    heaviest = heapq.nlargest(top_k, range(count), key=sizes.__getitem__)
+    return {
+        "cv": std / mean,
+        "gini": gini,
+        "max_to_median": ordered[-1] / median,
+        "p99_to_p50": _quantile(ordered, 0.99) / median,
+        "top": heaviest,
+    }
+
+
+def main(stages: int, partitions: int) -> None:
+    rng = np.random.default_rng(11)
+    arrays = {str(stage): rng.lognormal(16, 1.0 + stage / stages, partitions) for stage in range(stages)}
+    lists = {stage: sizes.tolist() for stage, sizes in arrays.items()}
+
+    start = time.perf_counter()
+    expected = {stage: _python_statistics(sizes) for stage, sizes in lists.items()}
+    python_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = stage_skew_statistics(arrays)
+    numpy_s = time.perf_counter() - start
+
+    for stage, stats in results.items():
+        assert math.isclose(stats.gini, expected[stage]["gini"], rel_tol=1e-9)
+        assert math.isclose(stats.cv, expected[stage]["cv"], rel_tol=1e-9)
+        assert [index for index, _ in stats.top_partitions] == expected[stage]["top"]
+
+    sizes = stages * partitions
+    print(f"stages x sizes     {stages:6d} x {partitions}")
+    print(f"pure Python        {python_s:10.2f}s ({sizes / python_s / 1e6:8.2f}M sizes/s)")
+    print(f"vectorized         {numpy_s:10.2f}s ({sizes / numpy_s / 1e6:8.2f}M sizes/s)")
+    print(f"speedup            {python_s / numpy_s:10.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stages", type=int, default=20)
+    parser.add_argument("--partitions", type=int, default=200000)
+    args = parser.parse_args()
+    main(args.stages, args.partitions)
@@ -0,0 +1,50 @@
+"""
+Benchmark: straggler detection and critical path on a large task table.
+
+Builds a synthetic task table (log-normal task durations spread over many
+stages) and a chain-and-join stage DAG, then times find_stragglers and
+critical_path.
+
+Run with:
+    python -m benchmarks.bench_stage_runtime --tasks 1000000 --stages 2000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from analysis.stage_runtime import StageSpan, critical_path, find_stragglers
+from connectors.task_table import TASK_DTYPE, TaskTable
+
+
+def main(tasks: int, stages: int) -> None:
+    rng = np.random.default_rng(0)
+    table = np.zeros(tasks, dtype=TASK_DTYPE)
+    table["stage_id"] = rng.integers(0, stages, tasks)
+    table["task_id"] = np.arange(tasks)
+    table["duration_ms"] = rng.lognormal(7, 0.7, tasks).astype(np.int64)
+    spans = {
+        stage: StageSpan(stage, stage * 100, stage * 100 + 500, (stage - 1, stage // 2) if stage else ())
+        for stage in range(stages)
+    }
+
+    start = time.perf_counter()
+    stragglers = find_stragglers(TaskTable(tasks=table, executors=["1"]))
+    stragglers_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    path = critical_path(spans)
+    path_s = time.perf_counter() - start
+
+    flagged = sum(stats.stragglers for stats in stragglers.values())
+    print(f"stragglers         {stragglers_s * 1000:10.1f} ms ({tasks} tasks, {flagged} flagged)")
+    print(f"critical path      {path_s * 1000:10.1f} ms ({stages} stages, {len(path.stages)} on path)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=1000000)
+    parser.add_argument("--stages", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.tasks, args.stages)
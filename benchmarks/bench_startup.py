@@ -0,0 +1,74 @@
+"""
+Benchmark: import time of the API process.
+
+Imports app.main in a fresh interpreter under ``python -X importtime``,
+reports the total and the slowest modules by cumulative time, and exits
+non-zero when the total exceeds the budget, so it can gate CI.
+
+Run with:
+    python -m benchmarks.bench_startup --budget-ms 1500 --runs 5
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+TARGET = "app.main"
+
+
+def measure_import(module: str = TARGET) -> Tuple[float, Dict[str, float]]:
+    """
+    Import module in a fresh interpreter and parse its -X importtime report.
+
+    Args:
+        module: Dotted module name to import
+
+    Returns:
+        Cumulative import time of module in ms, and the cumulative time in
+        ms of every module imported along the way
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    cumulative: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        if cumulative_us.strip().isdigit():
+            cumulative[name.strip()] = int(cumulative_us) / 1000
+    return cumulative[module], cumulative
+
+
+def main(budget_ms: float, runs: int, top: int) -> int:
+    timings = []
+    modules: Dict[str, float] = {}
+    for _ in range(runs):
+        total_ms, modules = measure_import()
+        timings.append(total_ms)
+
+    median_ms = statistics.median(timings)
+    top_level = {name: ms for name, ms in modules.items() if "." not in name and name != TARGET}
+    print(f"{TARGET} import median  {median_ms:8.1f}ms ({runs} runs, budget {budget_ms:.0f}ms)")
+    print("slowest top-level imports (last run):")
+    for name, ms in sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"  {name:30s} {ms:8.1f}ms")
+
+    if median_ms > budget_ms:
+        print(f"FAIL: import time exceeds the {budget_ms:.0f}ms budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    sys.exit(main(args.budget_ms, args.runs, args.top))
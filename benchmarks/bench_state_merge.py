@@ -0,0 +1,89 @@
+"""
+Benchmark: per-step merge cost of whole-state returns vs delta updates.
+
+Agents used to append to state["recommendations"] in place and return the
+whole state, so the operator.add reducer concatenated the full list with
+itself at every step. Agents now return only their new findings, which
+merge_findings appends to the existing list.
+
+Run with:
+    python -m benchmarks.bench_state_merge --findings 1000 5000 10000
+"""
+
+import argparse
+import asyncio
+import logging
+import operator
+import time
+from typing import List, Tuple
+
+from agents import create_default_agents
+from orchestration.graph_builder import build_spark_optimization_graph
+from orchestration.state_model import create_agent_state, merge_findings
+
+STEPS = 6
+NEW_PER_STEP = 3
+
+
+def _issues(count: int, prefix: str) -> List[dict]:
+    return [
+        {"type": "runtime", "severity": "warning", "description": f"{prefix} issue {i}"}
+        for i in range(count)
+    ]
+
+
+def _whole_state_steps(findings: int) -> Tuple[float, int]:
+    """Old behaviour: each node returns its input list plus its new entries"""
+    existing = _issues(findings, "seed")
+    start = time.perf_counter()
+    for step in range(STEPS):
+        returned = existing + _issues(NEW_PER_STEP, f"step{step}")
+        existing = operator.add(existing, returned)
+    return (time.perf_counter() - start) / STEPS, len(existing)
+
+
+def _delta_steps(findings: int) -> Tuple[float, int]:
+    """Current behaviour: each node returns only its new entries"""
+    # The graph input passes through the reducer once before any node runs
+    existing = merge_findings([], _issues(findings, "seed"))
+    start = time.perf_counter()
+    for step in range(STEPS):
+        existing = merge_findings(existing, _issues(NEW_PER_STEP, f"step{step}"))
+    return (time.perf_counter() - start) / STEPS, len(existing)
+
+
+async def _graph_run(findings: int) -> float:
+    graph = build_spark_optimization_graph(create_default_agents())
+    graph.compile()
+    state = create_agent_state(
+        job_id="merge_bench",
+        job_name="Merge Benchmark",
+        source_type="delta",
+        partition_count=5,
+        execution_time_ms=90000,
+    )
+    state["issues_detected"] = _issues(findings, "seed")
+    start = time.perf_counter()
+    await graph.run(state)
+    return time.perf_counter() - start
+
+
+async def main(sizes: List[int]) -> None:
+    logging.disable(logging.INFO)
+    expected = STEPS * NEW_PER_STEP
+    print(f"{'findings':>9} {'whole-state/step':>17} {'final len':>10} "
+          f"{'delta/step':>11} {'final len':>10} {'graph run':>10}")
+    for findings in sizes:
+        whole_s, whole_len = _whole_state_steps(findings)
+        delta_s, delta_len = _delta_steps(findings)
+        assert delta_len == findings + expected
+        graph_s = await _graph_run(findings)
+        print(f"{findings:>9} {whole_s * 1e6:>15.1f}us {whole_len:>10} "
+              f"{delta_s * 1e6:>9.1f}us {delta_len:>10} {graph_s * 1e3:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--findings", type=int, nargs="+", default=[1000, 5000, 10000])
+    args = parser.parse_args()
+    asyncio.run(main(args.findings))
@@ -0,0 +1,51 @@
+"""
+Benchmark: re-analyzing an event log from the columnar task cache.
+
+Builds the task table of a synthetic log once (full parse), then times
+loading it back memory-mapped and reading the per-stage shuffle sizes that
+the skew statistics use.
+
+Run with:
+    python -m benchmarks.bench_task_table --tasks 200000
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from benchmarks.bench_event_parser import write_event_log
+from connectors.task_table import TaskTableCache
+
+
+def main(tasks: int) -> None:
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as workdir:
+        log = os.path.join(workdir, "eventlog")
+        write_event_log(log, tasks)
+        cache = TaskTableCache(os.path.join(workdir, "cache"))
+
+        start = time.perf_counter()
+        cache.get(log)
+        build_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        table = cache.get(log)
+        load_s = time.perf_counter() - start
+        stage_sizes = table.stage_sizes("shuffle_read_bytes")
+        sizes_s = time.perf_counter() - start - load_s
+
+        table_mb = table.tasks.nbytes / 1e6
+        print(f"log size           {os.path.getsize(log) / 1e6:10.1f} MB ({tasks} tasks)")
+        print(f"task table         {table_mb:10.1f} MB")
+        print(f"parse and store    {build_s * 1000:10.1f} ms")
+        print(f"cached load        {load_s * 1000:10.2f} ms")
+        print(f"stage sizes        {sizes_s * 1000:10.2f} ms ({len(stage_sizes)} stages)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=200000)
+    args = parser.parse_args()
+    main(args.tasks)
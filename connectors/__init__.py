@@ -1,7 +1,50 @@
-"""Connectors for external integrations"""
+"""
+Connectors for external integrations
 
-from connectors.spark_event_parser import SparkEventParser
-from connectors.gcs_client import GCSClient
-from connectors.bigquery_client import BigQueryClient
+Submodules are imported on first attribute access (PEP 562), so using the
+event log parser does not load the cloud storage clients.
+"""
 
-__all__ = ["SparkEventParser", "GCSClient", "BigQueryClient"]
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from connectors.spark_event_parser import SparkEventParser
+    from connectors.event_log_aggregate import EventLogAggregate
+    from connectors.event_log_tailer import EventLogTailer
+    from connectors.task_table import TaskTable, TaskTableCache
+    from connectors.gcs_client import GCSClient
+    from connectors.bigquery_client import BigQueryClient
+
+_LAZY_ATTRIBUTES = {
+    "SparkEventParser": "connectors.spark_event_parser",
+    "EventLogAggregate": "connectors.event_log_aggregate",
+    "EventLogTailer": "connectors.event_log_tailer",
+    "TaskTable": "connectors.task_table",
+    "TaskTableCache": "connectors.task_table",
+    "GCSClient": "connectors.gcs_client",
+    "BigQueryClient": "connectors.bigquery_client",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
+
+
+__all__ = [
+    "SparkEventParser",
+    "EventLogAggregate",
+    "EventLogTailer",
+    "TaskTable",
+    "TaskTableCache",
+    "GCSClient",
+    "BigQueryClient"
+]
@@ -0,0 +1,440 @@
+"""Incremental, mergeable aggregates of Spark event-log metrics"""
+
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from connectors.quantile_sketch import QuantileSketch
+
+TASK_END = "SparkListenerTaskEnd"
+STAGE_COMPLETED = "SparkListenerStageCompleted"
+EXECUTOR_ADDED = "SparkListenerExecutorAdded"
+EXECUTOR_REMOVED = "SparkListenerExecutorRemoved"
+SQL_EXECUTION_START = "org.apache.spark.sql.execution.ui.SparkListenerSQLExecutionStart"
+SQL_EXECUTION_END = "org.apache.spark.sql.execution.ui.SparkListenerSQLExecutionEnd"
+
+StageKey = Tuple[int, int]
+
+_EMPTY: Dict[str, Any] = {}
+
+
+class TaskRecord(NamedTuple):
+    """Metrics of one finished task attempt"""
+    stage_id: int
+    stage_attempt: int
+    task_id: int
+    executor_id: str
+    launch_time_ms: int
+    duration_ms: int
+    run_time_ms: int
+    cpu_time_ns: int
+    gc_time_ms: int
+    shuffle_read_bytes: int
+    shuffle_write_bytes: int
+    memory_spilled_bytes: int
+    disk_spilled_bytes: int
+    input_bytes: int
+    output_bytes: int
+    peak_jvm_heap_bytes: int
+    shuffle_read_records: int
+    shuffle_write_records: int
+    fetch_wait_ms: int
+    failed: bool
+    killed: bool
+
+
+def task_record(event: Dict[str, Any]) -> TaskRecord:
+    """
+    Extract the metrics of a SparkListenerTaskEnd event.
+
+    Args:
+        event: Parsed TaskEnd event
+
+    Returns:
+        TaskRecord; metrics missing from the event are 0
+    """
+    info = event.get("Task Info") or _EMPTY
+    metrics = event.get("Task Metrics") or _EMPTY
+    shuffle_read = metrics.get("Shuffle Read Metrics") or _EMPTY
+    shuffle_write = metrics.get("Shuffle Write Metrics") or _EMPTY
+    reason = (event.get("Task End Reason") or _EMPTY).get("Reason", "Success")
+    launch = info.get("Launch Time", 0)
+    # Positional arguments: this runs once per task of multi-GB logs
+    return TaskRecord(
+        event.get("Stage ID", -1),
+        event.get("Stage Attempt ID", 0),
+        info.get("Task ID", -1),
+        str(info.get("Executor ID", "")),
+        launch,
+        max(info.get("Finish Time", launch) - launch, 0),
+        metrics.get("Executor Run Time", 0),
+        metrics.get("Executor CPU Time", 0),
+        metrics.get("JVM GC Time", 0),
+        shuffle_read.get("Remote Bytes Read", 0) + shuffle_read.get("Local Bytes Read", 0),
+        shuffle_write.get("Shuffle Bytes Written", 0),
+        metrics.get("Memory Bytes Spilled", 0),
+        metrics.get("Disk Bytes Spilled", 0),
+        (metrics.get("Input Metrics") or _EMPTY).get("Bytes Read", 0),
+        (metrics.get("Output Metrics") or _EMPTY).get("Bytes Written", 0),
+        (event.get("Task Executor Metrics") or _EMPTY).get("JVMHeapMemory", 0),
+        shuffle_read.get("Total Records Read", 0),
+        shuffle_write.get("Shuffle Records Written", 0),
+        shuffle_read.get("Fetch Wait Time", 0),
+        reason not in ("Success", "TaskKilled"),
+        reason == "TaskKilled",
+    )
+
+
+def _plain_fields(item: Any) -> Dict[str, Any]:
+    """JSON-compatible dict of a stage or executor aggregate's fields"""
+    data = {}
+    for entry in fields(item):
+        value = getattr(item, entry.name)
+        if isinstance(value, QuantileSketch):
+            value = value.to_dict()
+        elif isinstance(value, tuple):
+            value = list(value)
+        data[entry.name] = value
+    return data
+
+
+def _first(current: Any, other: Any) -> Any:
+    return current if current is not None else other
+
+
+def _min(current: Optional[int], other: Optional[int]) -> Optional[int]:
+    return other if current is None else current if other is None else min(current, other)
+
+
+def _max(current: Optional[int], other: Optional[int]) -> Optional[int]:
+    return other if current is None else current if other is None else max(current, other)
+
+
+@dataclass
+class TaskTotals:
+    """Counts, metric sums and a duration sketch over a set of tasks"""
+    tasks: int = 0
+    failed: int = 0
+    killed: int = 0
+    run_time_ms: int = 0
+    cpu_time_ns: int = 0
+    gc_time_ms: int = 0
+    shuffle_read_bytes: int = 0
+    shuffle_write_bytes: int = 0
+    memory_spilled_bytes: int = 0
+    disk_spilled_bytes: int = 0
+    input_bytes: int = 0
+    output_bytes: int = 0
+    shuffle_read_records: int = 0
+    shuffle_write_records: int = 0
+    fetch_wait_ms: int = 0
+    durations: QuantileSketch = field(default_factory=QuantileSketch)
+
+    def add_task(self, task: TaskRecord) -> None:
+        """Count one task"""
+        self.tasks += 1
+        self.failed += task.failed
+        self.killed += task.killed
+        self.run_time_ms += task.run_time_ms
+        self.cpu_time_ns += task.cpu_time_ns
+        self.gc_time_ms += task.gc_time_ms
+        self.shuffle_read_bytes += task.shuffle_read_bytes
+        self.shuffle_write_bytes += task.shuffle_write_bytes
+        self.memory_spilled_bytes += task.memory_spilled_bytes
+        self.disk_spilled_bytes += task.disk_spilled_bytes
+        self.input_bytes += task.input_bytes
+        self.output_bytes += task.output_bytes
+        self.shuffle_read_records += task.shuffle_read_records
+        self.shuffle_write_records += task.shuffle_write_records
+        self.fetch_wait_ms += task.fetch_wait_ms
+        self.durations.add(task.duration_ms)
+
+    def merge_totals(self, other: "TaskTotals") -> None:
+        """Add the tasks counted by another TaskTotals"""
+        for item in fields(TaskTotals):
+            if item.name != "durations":
+                setattr(self, item.name, getattr(self, item.name) + getattr(other, item.name))
+        self.durations.merge(other.durations)
+
+
+@dataclass
+class StageAggregate(TaskTotals):
+    """Task totals of one stage attempt plus its StageCompleted info and parent stages"""
+    name: Optional[str] = None
+    num_tasks: Optional[int] = None
+    submission_time_ms: Optional[int] = None
+    completion_time_ms: Optional[int] = None
+    failure_reason: Optional[str] = None
+    parent_ids: Optional[Tuple[int, ...]] = None
+
+    def merge(self, other: "StageAggregate") -> None:
+        """Combine with the same stage's aggregate from another part of the log"""
+        self.merge_totals(other)
+        self.name = _first(self.name, other.name)
+        self.num_tasks = _first(self.num_tasks, other.num_tasks)
+        self.submission_time_ms = _first(self.submission_time_ms, other.submission_time_ms)
+        self.completion_time_ms = _first(self.completion_time_ms, other.completion_time_ms)
+        self.failure_reason = _first(self.failure_reason, other.failure_reason)
+        self.parent_ids = _first(self.parent_ids, other.parent_ids)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StageAggregate":
+        """Rebuild a stage aggregate from its JSON-compatible fields"""
+        data = dict(data)
+        data["durations"] = QuantileSketch.from_dict(data["durations"])
+        if data.get("parent_ids") is not None:
+            data["parent_ids"] = tuple(data["parent_ids"])
+        return cls(**data)
+
+
+@dataclass
+class ExecutorAggregate:
+    """Lifetime and task load of one executor"""
+    host: Optional[str] = None
+    cores: Optional[int] = None
+    added_ms: Optional[int] = None
+    removed_ms: Optional[int] = None
+    removed_reason: Optional[str] = None
+    tasks: int = 0
+    busy_ms: int = 0
+    peak_jvm_heap_bytes: int = 0
+
+    def merge(self, other: "ExecutorAggregate") -> None:
+        """Combine with the same executor's aggregate from another part of the log"""
+        self.host = _first(self.host, other.host)
+        self.cores = _first(self.cores, other.cores)
+        self.added_ms = _min(self.added_ms, other.added_ms)
+        self.removed_ms = _max(self.removed_ms, other.removed_ms)
+        self.removed_reason = _first(self.removed_reason, other.removed_reason)
+        self.tasks += other.tasks
+        self.busy_ms += other.busy_ms
+        self.peak_jvm_heap_bytes = max(self.peak_jvm_heap_bytes, other.peak_jvm_heap_bytes)
+
+
+@dataclass
+class EventLogAggregate:
+    """
+    Running totals of the tasks, stages, executors and SQL executions of
+    an event log.
+
+    Memory depends on the number of stages and executors, not on the number
+    of tasks: tasks are counted per stage, with their durations in quantile
+    sketches. Every field merges associatively and all sums are integers,
+    so aggregates of consecutive parts of a log merge into exactly the
+    aggregate of the whole log.
+    """
+    stages: Dict[StageKey, StageAggregate] = field(default_factory=dict)
+    executors: Dict[str, ExecutorAggregate] = field(default_factory=dict)
+    first_launch_ms: Optional[int] = None
+    last_finish_ms: Optional[int] = None
+    sql_executions: int = 0
+    sql_durations: QuantileSketch = field(default_factory=QuantileSketch)
+    # SQL executions whose start or end lies in another part of the log
+    sql_open_starts: Dict[int, int] = field(default_factory=dict)
+    sql_open_ends: Dict[int, int] = field(default_factory=dict)
+    events: int = 0
+    malformed_lines: int = 0
+
+    def add_event(self, event: Dict[str, Any]) -> None:
+        """
+        Fold one parsed event into the aggregate; other event types are ignored.
+
+        Args:
+            event: Parsed event-log line
+        """
+        kind = event.get("Event")
+        if kind == TASK_END:
+            self.add_task(task_record(event))
+        elif kind == STAGE_COMPLETED:
+            self._add_stage_completed(event.get("Stage Info") or {})
+        elif kind == EXECUTOR_ADDED:
+            info = event.get("Executor Info") or {}
+            executor = self._executor(str(event.get("Executor ID", "")))
+            executor.host = info.get("Host")
+            executor.cores = info.get("Total Cores")
+            executor.added_ms = _min(executor.added_ms, event.get("Timestamp"))
+        elif kind == EXECUTOR_REMOVED:
+            executor = self._executor(str(event.get("Executor ID", "")))
+            executor.removed_ms = _max(executor.removed_ms, event.get("Timestamp"))
+            executor.removed_reason = event.get("Removed Reason")
+        elif kind == SQL_EXECUTION_START:
+            self._sql_boundary(event.get("executionId"), start_ms=event.get("time", 0))
+        elif kind == SQL_EXECUTION_END:
+            self._sql_boundary(event.get("executionId"), end_ms=event.get("time", 0))
+        else:
+            return
+        self.events += 1
+
+    def add_task(self, task: TaskRecord) -> None:
+        """Count one finished task in the job, stage and executor totals"""
+        self._stage((task.stage_id, task.stage_attempt)).add_task(task)
+        executor = self._executor(task.executor_id)
+        executor.tasks += 1
+        executor.busy_ms += task.duration_ms
+        executor.peak_jvm_heap_bytes = max(executor.peak_jvm_heap_bytes, task.peak_jvm_heap_bytes)
+        self.first_launch_ms = _min(self.first_launch_ms, task.launch_time_ms)
+        self.last_finish_ms = _max(self.last_finish_ms, task.launch_time_ms + task.duration_ms)
+
+    def merge(self, other: "EventLogAggregate") -> "EventLogAggregate":
+        """
+        Fold the aggregate of another part of the log into this one.
+
+        Args:
+            other: Aggregate of a disjoint part of the same log
+
+        Returns:
+            self, for chaining
+        """
+        for key, stage in other.stages.items():
+            self._stage(key).merge(stage)
+        for executor_id, executor in other.executors.items():
+            self._executor(executor_id).merge(executor)
+        self.first_launch_ms = _min(self.first_launch_ms, other.first_launch_ms)
+        self.last_finish_ms = _max(self.last_finish_ms, other.last_finish_ms)
+        self.sql_executions += other.sql_executions
+        self.sql_durations.merge(other.sql_durations)
+        for execution_id, start_ms in other.sql_open_starts.items():
+            self._sql_boundary(execution_id, start_ms=start_ms)
+        for execution_id, end_ms in other.sql_open_ends.items():
+            self._sql_boundary(execution_id, end_ms=end_ms)
+        self.events += other.events
+        self.malformed_lines += other.malformed_lines
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSON-compatible form of the aggregate, restored by from_dict.
+
+        Returns:
+            Dict of lists, numbers and strings only
+        """
+        return {
+            "stages": [
+                [stage_id, attempt, _plain_fields(stage)] for (stage_id, attempt), stage in self.stages.items()
+            ],
+            "executors": {executor_id: _plain_fields(executor) for executor_id, executor in self.executors.items()},
+            "first_launch_ms": self.first_launch_ms,
+            "last_finish_ms": self.last_finish_ms,
+            "sql_executions": self.sql_executions,
+            "sql_durations": self.sql_durations.to_dict(),
+            "sql_open_starts": list(self.sql_open_starts.items()),
+            "sql_open_ends": list(self.sql_open_ends.items()),
+            "events": self.events,
+            "malformed_lines": self.malformed_lines,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EventLogAggregate":
+        """
+        Rebuild an aggregate from to_dict output.
+
+        Args:
+            data: Output of to_dict, e.g. after a JSON round trip
+
+        Returns:
+            Aggregate equal to the one that was serialized
+
+        Raises:
+            KeyError, TypeError or ValueError: If data is not to_dict output
+        """
+        return cls(
+            stages={
+                (stage_id, attempt): StageAggregate.from_dict(stage) for stage_id, attempt, stage in data["stages"]
+            },
+            executors={
+                executor_id: ExecutorAggregate(**executor) for executor_id, executor in data["executors"].items()
+            },
+            first_launch_ms=data["first_launch_ms"],
+            last_finish_ms=data["last_finish_ms"],
+            sql_executions=data["sql_executions"],
+            sql_durations=QuantileSketch.from_dict(data["sql_durations"]),
+            sql_open_starts=dict(data["sql_open_starts"]),
+            sql_open_ends=dict(data["sql_open_ends"]),
+            events=data["events"],
+            malformed_lines=data["malformed_lines"],
+        )
+
+    @property
+    def tasks(self) -> TaskTotals:
+        """Totals over every task of the log, summed from the stages"""
+        totals = TaskTotals()
+        for stage in self.stages.values():
+            totals.merge_totals(stage)
+        return totals
+
+    def to_metrics(self) -> Dict[str, Any]:
+        """
+        Job-level metrics in the shape of an analysis request's metrics.
+
+        Returns:
+            Task counts and times, CPU utilization, peak executor heap,
+            I/O, shuffle and spill totals, and stage/executor/SQL counts
+        """
+        tasks = self.tasks
+        wall_ms = (self.last_finish_ms or 0) - (self.first_launch_ms or 0)
+        peak_heap = max((executor.peak_jvm_heap_bytes for executor in self.executors.values()), default=0)
+        return {
+            "total_tasks": tasks.tasks,
+            "successful_tasks": tasks.tasks - tasks.failed - tasks.killed,
+            "failed_tasks": tasks.failed,
+            "killed_tasks": tasks.killed,
+            "total_time_ms": tasks.durations.total,
+            "execution_time_ms": wall_ms,
+            "cpu_utilization": tasks.cpu_time_ns / 1e6 / tasks.run_time_ms if tasks.run_time_ms else 0.0,
+            "gc_time_ratio": tasks.gc_time_ms / tasks.run_time_ms if tasks.run_time_ms else 0.0,
+            "memory_used_mb": peak_heap // (1024 * 1024),
+            "input_bytes": tasks.input_bytes,
+            "output_bytes": tasks.output_bytes,
+            "shuffle_read_bytes": tasks.shuffle_read_bytes,
+            "shuffle_write_bytes": tasks.shuffle_write_bytes,
+            "shuffle_read_records": tasks.shuffle_read_records,
+            "shuffle_write_records": tasks.shuffle_write_records,
+            "fetch_wait_ms": tasks.fetch_wait_ms,
+            "memory_spilled_bytes": tasks.memory_spilled_bytes,
+            "disk_spilled_bytes": tasks.disk_spilled_bytes,
+            "task_duration_ms": tasks.durations.summary(),
+            "stage_count": len(self.stages),
+            "failed_stages": sum(stage.failure_reason is not None for stage in self.stages.values()),
+            "executor_count": len(self.executors),
+            "sql_executions": self.sql_executions,
+        }
+
+    def _stage(self, key: StageKey) -> StageAggregate:
+        stage = self.stages.get(key)
+        if stage is None:
+            stage = self.stages[key] = StageAggregate()
+        return stage
+
+    def _executor(self, executor_id: str) -> ExecutorAggregate:
+        executor = self.executors.get(executor_id)
+        if executor is None:
+            executor = self.executors[executor_id] = ExecutorAggregate()
+        return executor
+
+    def _add_stage_completed(self, info: Dict[str, Any]) -> None:
+        stage = self._stage((info.get("Stage ID", -1), info.get("Stage Attempt ID", 0)))
+        stage.name = info.get("Stage Name")
+        stage.num_tasks = info.get("Number of Tasks")
+        stage.submission_time_ms = info.get("Submission Time")
+        stage.completion_time_ms = info.get("Completion Time")
+        stage.failure_reason = info.get("Failure Reason")
+        stage.parent_ids = tuple(info.get("Parent IDs") or ())
+
+    def _sql_boundary(
+        self,
+        execution_id: int,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None
+    ) -> None:
+        """Pair SQL execution starts and ends, which may be seen in either order"""
+        if start_ms is not None:
+            end_ms = self.sql_open_ends.pop(execution_id, None)
+            if end_ms is None:
+                self.sql_open_starts[execution_id] = start_ms
+                return
+        else:
+            start_ms = self.sql_open_starts.pop(execution_id, None)
+            if start_ms is None:
+                self.sql_open_ends[execution_id] = end_ms
+                return
+        self.sql_executions += 1
+        self.sql_durations.add(max(end_ms - start_ms, 0))
@@ -0,0 +1,349 @@
+"""Incremental analysis of in-progress and rolling Spark event logs"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Collection, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from connectors.event_log_aggregate import EventLogAggregate
+from connectors.spark_event_parser import SparkEventParser, _codec, _read_lines
+
+logger = logging.getLogger(__name__)
+
+# Rolling logs (spark.eventLog.rolling.enabled) are directories named
+# eventlog_v2_<app id> holding events_<index>_<app id>[.<codec>] files
+ROLLING_DIR_PREFIX = "eventlog_v2_"
+_EVENT_FILE = re.compile(r"^events_(\d+)_.+?(\.compact)?$")
+IN_PROGRESS_SUFFIX = ".inprogress"
+
+CHECKPOINT_VERSION = 3
+
+# Line fingerprints are checkpointed as little-endian uint64 arrays, one
+# append-only file per rolling file index in <checkpoint>.lines/
+_FINGERPRINT_DTYPE = np.dtype("<u8")
+
+# Bytes scanned backwards at a time when looking for the last complete line
+_TAIL_BLOCK_SIZE = 1 << 16
+
+
+def _complete_end(path: str, start: int, size: int) -> int:
+    """Offset just after the last newline in [start, size), start if there is none"""
+    with open(path, "rb") as log:
+        end = size
+        while end > start:
+            block_start = max(start, end - _TAIL_BLOCK_SIZE)
+            log.seek(block_start)
+            newline = log.read(end - block_start).rfind(b"\n")
+            if newline >= 0:
+                return block_start + newline + 1
+            end = block_start
+    return start
+
+
+def _line_hash(line: bytes) -> int:
+    """Stable 64-bit fingerprint of an event-log line, without its line break"""
+    return int.from_bytes(hashlib.blake2b(line.rstrip(b"\r\n"), digest_size=8).digest(), "little")
+
+
+def _fingerprinted(lines: Iterable[bytes], hashes: List[int], skip: Dict[int, int]) -> Iterator[bytes]:
+    """
+    Record the fingerprint of every non-empty line, passing on all but the
+    first skip[fingerprint] occurrences of each
+    """
+    for line in lines:
+        if not line.strip():
+            continue
+        digest = _line_hash(line)
+        hashes.append(digest)
+        remaining = skip.get(digest)
+        if remaining:
+            skip[digest] = remaining - 1
+            continue
+        yield line
+
+
+class EventLogTailer:
+    """
+    Follows an event log while the application is running.
+
+    Each poll parses only the bytes appended since the previous poll and
+    merges them into the running EventLogAggregate. Offsets stop at the
+    last complete line, so a line that is still being written is read on a
+    later poll. Offsets and the aggregate can be checkpointed to a file, so
+    a restarted tailer resumes where the previous one stopped.
+
+    Works on a single event-log file (following the rename from
+    <app>.inprogress when the application ends) or on a rolling
+    eventlog_v2_* directory. Compressed files can only be read whole, so a
+    compressed rolling file is parsed once Spark has moved on to the next
+    file or the application has finished.
+
+    The history server may compact rolling files 1..N into
+    events_N_<app>.compact, keeping the original lines of the events it
+    retains. When the compact file replaces a file that was not read to its
+    end, it is read without the lines already delivered: each delivered
+    line is recognized by its 64-bit fingerprint, counted so that repeated
+    identical lines are dropped only as often as they were delivered. When
+    every file it replaces was read, the compact file is only fingerprinted,
+    since a later compact file starts from it. Either way its fingerprints
+    replace those of the files it covers, so they are kept for the lines
+    Spark retains plus those of the files written since the last
+    compaction (8 bytes per line).
+
+    The checkpoint is a small JSON file with the offsets and the aggregate;
+    fingerprints are appended to per-file arrays next to it, so a poll
+    writes only the fingerprints of the lines it read.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        checkpoint_path: Optional[str] = None,
+        event_types: Optional[Collection[str]] = None
+    ):
+        """
+        Initialize the tailer
+
+        Args:
+            path: Event-log file or rolling event-log directory
+            checkpoint_path: File persisting offsets and the aggregate between runs
+            event_types: Event names to keep, defaults to DEFAULT_EVENT_TYPES
+        """
+        self.path = path
+        self.checkpoint_path = checkpoint_path
+        self.event_types = event_types
+        self.aggregate = EventLogAggregate()
+        self.offsets: Dict[str, int] = {}
+        self.completed: Dict[str, bool] = {}
+        # Fingerprints of the lines delivered from each rolling file index
+        self.delivered: Dict[int, List[np.ndarray]] = {}
+        # Per index: fingerprint file, chunks of delivered[index] and
+        # fingerprints it holds
+        self._saved: Dict[int, Tuple[str, int, int]] = {}
+        self._generation = 0
+        self.bytes_read = 0
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            self._restore()
+
+    def poll(self) -> EventLogAggregate:
+        """
+        Parse what was appended since the last poll.
+
+        Returns:
+            Aggregate of everything read so far
+        """
+        self.bytes_read = 0
+        adopted = False
+        for name, path, complete in self._event_files():
+            if self.completed.get(name):
+                continue
+            match = _EVENT_FILE.match(name) if os.path.isdir(self.path) else None
+            index = int(match.group(1)) if match else None
+            if match and match.group(2):
+                if index <= self._fully_read_index():
+                    self._adopt_compact(name, path, index)
+                    adopted = True
+                else:
+                    self._read_compact(name, path, index)
+                continue
+            if _is_compressed(path):
+                if complete:
+                    with SparkEventParser.open_event_log(path) as stream:
+                        self._merge(stream, index)
+                    self.bytes_read += os.path.getsize(path)
+                    self.offsets[name] = os.path.getsize(path)
+                    self.completed[name] = True
+                continue
+
+            start = self.offsets.get(name, 0)
+            size = os.path.getsize(path)
+            end = _complete_end(path, start, size)
+            if end > start:
+                if index is None:
+                    self.aggregate.merge(SparkEventParser.parse_range(path, start, end, self.event_types))
+                else:
+                    self._merge(_read_lines(path, start, end), index)
+                self.bytes_read += end - start
+                self.offsets[name] = end
+            if complete and end == size:
+                self.completed[name] = True
+
+        if self.bytes_read:
+            logger.info(f"Tailed {self.bytes_read} new bytes of {self.path}")
+        if (self.bytes_read or adopted) and self.checkpoint_path:
+            self.checkpoint()
+        return self.aggregate
+
+    def _merge(self, lines: Iterable[bytes], index: Optional[int], skip: Optional[Dict[int, int]] = None) -> None:
+        """Aggregate lines not in skip, fingerprinting them under their rolling file index"""
+        if index is None:
+            self.aggregate.merge(SparkEventParser.aggregate_lines(lines, self.event_types))
+            return
+        hashes: List[int] = []
+        self.aggregate.merge(SparkEventParser.aggregate_lines(
+            _fingerprinted(lines, hashes, skip or {}), self.event_types
+        ))
+        self.delivered.setdefault(index, []).append(np.array(hashes, dtype=np.uint64))
+
+    def _replaced(self, index: int) -> List[np.ndarray]:
+        """Drop the fingerprints of the files a compact file at index replaces"""
+        replaced = []
+        for earlier in [earlier for earlier in self.delivered if earlier <= index]:
+            replaced.extend(self.delivered.pop(earlier))
+            self._saved.pop(earlier, None)
+        return replaced
+
+    def _read_compact(self, name: str, path: str, index: int) -> None:
+        """Read a compact file, dropping the lines already delivered from the files it replaces"""
+        replaced = self._replaced(index)
+        skip: Dict[int, int] = {}
+        if replaced:
+            digests, counts = np.unique(np.concatenate(replaced), return_counts=True)
+            skip = dict(zip(digests.tolist(), counts.tolist()))
+        # The compact file's lines now stand for every file up to index, and
+        # a later compact file includes them
+        with SparkEventParser.open_event_log(path) as stream:
+            self._merge(stream, index, skip)
+        self.bytes_read += os.path.getsize(path)
+        self.offsets[name] = os.path.getsize(path)
+        self.completed[name] = True
+
+    def _adopt_compact(self, name: str, path: str, index: int) -> None:
+        """Take the fingerprints of a compact file whose lines were all delivered"""
+        self._replaced(index)
+        with SparkEventParser.open_event_log(path) as stream:
+            hashes = [_line_hash(line) for line in stream if line.strip()]
+        self.delivered[index] = [np.array(hashes, dtype=np.uint64)]
+        self.offsets[name] = os.path.getsize(path)
+        self.completed[name] = True
+
+    def _fully_read_index(self) -> int:
+        """Highest index such that every rolling file up to it was read to its end"""
+        covered = 0
+        plain = set()
+        for name, completed in self.completed.items():
+            match = _EVENT_FILE.match(name)
+            if completed and match:
+                if match.group(2):
+                    covered = max(covered, int(match.group(1)))
+                else:
+                    plain.add(int(match.group(1)))
+        while covered + 1 in plain:
+            covered += 1
+        return covered
+
+    def checkpoint(self) -> None:
+        """
+        Write the offsets, the aggregate and the new line fingerprints.
+
+        Fingerprints are appended to their files first and the JSON file,
+        which records how many of them are valid, is replaced atomically
+        afterwards, so a crash in between leaves the previous checkpoint.
+        """
+        lines_dir = f"{self.checkpoint_path}.lines"
+        os.makedirs(lines_dir, exist_ok=True)
+        fingerprints = {}
+        for index, chunks in self.delivered.items():
+            file_name, saved_chunks, saved = self._saved.get(index, (None, 0, 0))
+            if file_name is None:
+                self._generation += 1
+                file_name = f"{index}.{self._generation}.u64"
+            if saved_chunks < len(chunks) or not saved:
+                # A new file may hold what an interrupted checkpoint left there
+                with open(os.path.join(lines_dir, file_name), "ab" if saved else "wb") as out:
+                    for hashes in chunks[saved_chunks:]:
+                        out.write(hashes.astype(_FINGERPRINT_DTYPE).tobytes())
+                        saved += len(hashes)
+            self._saved[index] = (file_name, len(chunks), saved)
+            fingerprints[str(index)] = [file_name, saved]
+
+        staging = f"{self.checkpoint_path}.tmp"
+        with open(staging, "w") as out:
+            json.dump({
+                "version": CHECKPOINT_VERSION,
+                "path": os.path.abspath(self.path),
+                "offsets": self.offsets,
+                "completed": self.completed,
+                "generation": self._generation,
+                "fingerprints": fingerprints,
+                "aggregate": self.aggregate.to_dict(),
+            }, out)
+        os.replace(staging, self.checkpoint_path)
+
+        # Fingerprints of files a compact file replaced
+        live = {file_name for file_name, _ in fingerprints.values()}
+        for entry in os.listdir(lines_dir):
+            if entry not in live:
+                os.remove(os.path.join(lines_dir, entry))
+
+    def _restore(self) -> None:
+        lines_dir = f"{self.checkpoint_path}.lines"
+        try:
+            with open(self.checkpoint_path) as checkpoint:
+                state = json.load(checkpoint)
+            if state.get("version") != CHECKPOINT_VERSION or state.get("path") != os.path.abspath(self.path):
+                logger.warning(f"Ignoring checkpoint {self.checkpoint_path} written for another log or format")
+                return
+            delivered = {}
+            for index, (file_name, count) in state["fingerprints"].items():
+                path = os.path.join(lines_dir, file_name)
+                hashes = np.fromfile(path, dtype=_FINGERPRINT_DTYPE, count=count)
+                if len(hashes) < count:
+                    raise ValueError(f"{path} holds fewer than {count} fingerprints")
+                delivered[int(index)] = (file_name, hashes.astype(np.uint64))
+            aggregate = EventLogAggregate.from_dict(state["aggregate"])
+        except (OSError, KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.checkpoint_path}: {e}")
+            return
+
+        for index, (file_name, hashes) in delivered.items():
+            # Drop fingerprints an interrupted checkpoint appended after the
+            # ones it recorded
+            os.truncate(os.path.join(lines_dir, file_name), len(hashes) * _FINGERPRINT_DTYPE.itemsize)
+            self.delivered[index] = [hashes]
+            self._saved[index] = (file_name, 1, len(hashes))
+        self.offsets = state["offsets"]
+        self.completed = state["completed"]
+        self._generation = state["generation"]
+        self.aggregate = aggregate
+
+    def _event_files(self) -> List[Tuple[str, str, bool]]:
+        """(name, path, complete) of the files to read, in log order"""
+        if not os.path.isdir(self.path):
+            return self._single_file()
+
+        entries = os.listdir(self.path)
+        finished = any(
+            entry.startswith("appstatus_") and not entry.endswith(IN_PROGRESS_SUFFIX) for entry in entries
+        )
+        indexed = []
+        for entry in entries:
+            match = _EVENT_FILE.match(entry)
+            if match:
+                indexed.append((int(match.group(1)), bool(match.group(2)), entry))
+        indexed.sort()
+
+        last_index = indexed[-1][0] if indexed else None
+        files = []
+        for index, compact, entry in indexed:
+            complete = finished or compact or index != last_index
+            files.append((entry, os.path.join(self.path, entry), complete))
+        return files
+
+    def _single_file(self) -> List[Tuple[str, str, bool]]:
+        path = self.path
+        if path.endswith(IN_PROGRESS_SUFFIX) and not os.path.exists(path):
+            # Spark renames <app>.inprogress to <app> when the application ends
+            path = path[:-len(IN_PROGRESS_SUFFIX)]
+        if not os.path.exists(path):
+            return []
+        return [(os.path.basename(self.path), path, not path.endswith(IN_PROGRESS_SUFFIX))]
+
+
+def _is_compressed(path: str) -> bool:
+    with open(path, "rb") as log:
+        return _codec(log.read(4)) is not None
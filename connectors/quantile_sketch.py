@@ -0,0 +1,143 @@
+"""Mergeable quantile sketch with bounded relative error"""
+
+import math
+from typing import Any, Dict, Optional
+
+
+class QuantileSketch:
+    """
+    Log-bucketed histogram of non-negative values.
+
+    A value v > 0 is counted in bucket ceil(log_gamma(v)) with
+    gamma = (1 + accuracy) / (1 - accuracy), so any quantile is returned
+    within the relative accuracy of the true value. Memory grows with the
+    logarithm of the value range, not with the number of values, and two
+    sketches with the same accuracy merge exactly by adding bucket counts.
+    """
+
+    __slots__ = ("accuracy", "_log_gamma", "buckets", "zero_count", "count", "total", "min", "max")
+
+    def __init__(self, accuracy: float = 0.01):
+        """
+        Initialize the sketch
+
+        Args:
+            accuracy: Relative accuracy of the quantiles, between 0 and 1
+        """
+        if not 0 < accuracy < 1:
+            raise ValueError("accuracy must be between 0 and 1")
+        self.accuracy = accuracy
+        self._log_gamma = math.log((1 + accuracy) / (1 - accuracy))
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        """Count one value; negative values are counted as zero"""
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """
+        Add the values counted by another sketch.
+
+        Args:
+            other: Sketch with the same accuracy
+        """
+        if other.accuracy != self.accuracy:
+            raise ValueError("Cannot merge sketches with different accuracies")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def quantile(self, q: float) -> float:
+        """
+        Approximate q-quantile of the counted values.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Value within the sketch accuracy of the true quantile, 0.0 when empty
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return max(self.min, 0)
+        seen = self.zero_count
+        gamma = math.exp(self._log_gamma)
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                # Midpoint of the bucket (gamma^(i-1), gamma^i] in relative terms
+                value = 2 * gamma ** index / (gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, QuantileSketch):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-compatible form of the sketch, restored by from_dict"""
+        return {
+            "accuracy": self.accuracy,
+            "buckets": sorted(self.buckets.items()),
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        """
+        Rebuild a sketch from to_dict output.
+
+        Args:
+            data: Output of to_dict, e.g. after a JSON round trip
+
+        Returns:
+            Sketch equal to the one that was serialized
+        """
+        sketch = cls(data["accuracy"])
+        sketch.buckets = {int(index): int(count) for index, count in data["buckets"]}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.total = data["total"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        return sketch
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, extremes and the usual percentiles"""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min or 0,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "max": self.max or 0,
+        }
@@ -0,0 +1,278 @@
+"""Columnar task-metrics tables built once per event log"""
+
+import getpass
+import hashlib
+import json
+import logging
+import os
+import shutil
+import stat
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from connectors.event_log_aggregate import EventLogAggregate, TaskRecord
+from connectors.spark_event_parser import SparkEventParser
+
+logger = logging.getLogger(__name__)
+
+# Bumped when TASK_DTYPE or the stored files change, so older tables are rebuilt
+FORMAT_VERSION = 4
+
+# One row per finished task attempt; executor is an index into TaskTable.executors
+TASK_DTYPE = np.dtype([
+    ("stage_id", "<i4"),
+    ("stage_attempt", "<i2"),
+    ("task_id", "<i8"),
+    ("executor", "<i4"),
+    ("launch_time_ms", "<i8"),
+    ("duration_ms", "<i8"),
+    ("run_time_ms", "<i8"),
+    ("cpu_time_ns", "<i8"),
+    ("gc_time_ms", "<i8"),
+    ("shuffle_read_bytes", "<i8"),
+    ("shuffle_write_bytes", "<i8"),
+    ("memory_spilled_bytes", "<i8"),
+    ("disk_spilled_bytes", "<i8"),
+    ("input_bytes", "<i8"),
+    ("output_bytes", "<i8"),
+    ("peak_jvm_heap_bytes", "<i8"),
+    ("shuffle_read_records", "<i8"),
+    ("shuffle_write_records", "<i8"),
+    ("fetch_wait_ms", "<i8"),
+    ("failed", "?"),
+    ("killed", "?"),
+])
+
+# Per user, so no other local account can plant or alter cached tables
+DEFAULT_CACHE_DIR = os.path.join(
+    tempfile.gettempdir(),
+    f"spark-copilot-task-tables-{os.getuid() if hasattr(os, 'getuid') else getpass.getuser()}"
+)
+
+
+@dataclass
+class TaskTable:
+    """
+    Task metrics of one event log as a NumPy structured array.
+
+    tasks["duration_ms"], tasks["shuffle_read_bytes"], ... are columns with
+    one value per task attempt, in log order.
+    """
+    tasks: np.ndarray
+    executors: List[str]
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def stage_sizes(self, metric: str = "shuffle_read_bytes", successful_only: bool = True) -> Dict[str, np.ndarray]:
+        """
+        Per-stage values of one task metric, the input of the skew statistics.
+
+        Args:
+            metric: Column to group, e.g. shuffle_read_bytes or duration_ms
+            successful_only: Leave out failed and killed attempts
+
+        Returns:
+            Values keyed by stage id
+        """
+        tasks = self.tasks
+        if successful_only:
+            tasks = tasks[~(tasks["failed"] | tasks["killed"])]
+        stage_ids = tasks["stage_id"]
+        order = np.argsort(stage_ids, kind="stable")
+        stages, starts = np.unique(stage_ids[order], return_index=True)
+        groups = np.split(np.ascontiguousarray(tasks[metric][order]), starts[1:])
+        return {str(stage): group for stage, group in zip(stages.tolist(), groups)}
+
+
+class TaskTableBuilder:
+    """Collects TaskRecords into a TaskTable in fixed-size chunks"""
+
+    def __init__(self, chunk_size: int = 65536):
+        """
+        Initialize the builder
+
+        Args:
+            chunk_size: Records buffered before they are packed into an array
+        """
+        self.chunk_size = chunk_size
+        self._executors: Dict[str, int] = {}
+        self._rows: List[tuple] = []
+        self._chunks: List[np.ndarray] = []
+
+    def append(self, task: TaskRecord) -> None:
+        """Add one finished task"""
+        executor = self._executors.setdefault(task.executor_id, len(self._executors))
+        self._rows.append(task[:3] + (executor,) + task[4:])
+        if len(self._rows) >= self.chunk_size:
+            self._flush()
+
+    def build(self) -> TaskTable:
+        """Pack the collected tasks"""
+        self._flush()
+        tasks = np.concatenate(self._chunks) if self._chunks else np.empty(0, dtype=TASK_DTYPE)
+        return TaskTable(tasks=tasks, executors=list(self._executors))
+
+    def _flush(self) -> None:
+        if self._rows:
+            self._chunks.append(np.array(self._rows, dtype=TASK_DTYPE))
+            self._rows = []
+
+
+class TaskTableCache:
+    """
+    On-disk TaskTables keyed by event-log path, modification time and size.
+
+    Each table is a directory holding tasks.npy, loaded memory-mapped so
+    that opening it costs milliseconds whatever the log size, executors.npy
+    and aggregate.json, the EventLogAggregate of the same parse. A log that
+    is rewritten or grows gets a new key; the tables of its earlier versions
+    are removed when the new one is stored.
+
+    The cache directory is created with mode 0700. It is used only while it
+    is owned by the current user and not writable by anyone else; otherwise
+    every lookup misses and nothing is stored. None of the files is loaded
+    with pickle.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory holding the tables
+        """
+        self.cache_dir = cache_dir
+
+    def _usable_dir(self, create: bool) -> bool:
+        """Whether the cache directory exists (or was created) and only its owner can write to it"""
+        if create:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+        try:
+            info = os.lstat(self.cache_dir)
+        except OSError:
+            return False
+        if not stat.S_ISDIR(info.st_mode):
+            logger.warning(f"Not using task-table cache {self.cache_dir}: not a directory")
+            return False
+        if hasattr(os, "getuid") and (info.st_uid != os.getuid() or info.st_mode & 0o022):
+            logger.warning(f"Not using task-table cache {self.cache_dir}: owned or writable by another user")
+            return False
+        return True
+
+    @staticmethod
+    def _log_prefix(path: str) -> str:
+        return hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:20]
+
+    def key(self, path: str) -> str:
+        """Cache key of the current version of a log"""
+        stat = os.stat(path)
+        return f"{self._log_prefix(path)}-{stat.st_mtime_ns}-{stat.st_size}-v{FORMAT_VERSION}"
+
+    def load(self, path: str) -> Optional[TaskTable]:
+        """
+        Load the table of a log if it was built for its current version.
+
+        Args:
+            path: Event log file
+
+        Returns:
+            Memory-mapped TaskTable, or None on a cache miss
+        """
+        if not self._usable_dir(create=False):
+            return None
+        directory = os.path.join(self.cache_dir, self.key(path))
+        try:
+            tasks = np.load(os.path.join(directory, "tasks.npy"), mmap_mode="r")
+            executors = np.load(os.path.join(directory, "executors.npy")).tolist()
+        except (OSError, ValueError):
+            return None
+        return TaskTable(tasks=tasks, executors=executors)
+
+    def load_aggregate(self, path: str) -> Optional[EventLogAggregate]:
+        """
+        Load the aggregate of a log if it was stored for its current version.
+
+        Args:
+            path: Event log file
+
+        Returns:
+            EventLogAggregate, or None on a cache miss
+        """
+        if not self._usable_dir(create=False):
+            return None
+        try:
+            with open(os.path.join(self.cache_dir, self.key(path), "aggregate.json"), "rb") as stored:
+                return EventLogAggregate.from_dict(json.load(stored))
+        except (OSError, KeyError, TypeError, ValueError):
+            return None
+
+    def store(self, path: str, table: TaskTable, aggregate: Optional[EventLogAggregate] = None) -> None:
+        """
+        Write the table of a log and drop tables of its earlier versions.
+
+        Args:
+            path: Event log file the table was built from
+            table: Table to store
+            aggregate: Aggregate of the same parse, stored alongside
+        """
+        if not self._usable_dir(create=True):
+            return
+        key = self.key(path)
+        staging = tempfile.mkdtemp(dir=self.cache_dir, prefix=".staging-")
+        try:
+            np.save(os.path.join(staging, "tasks.npy"), np.ascontiguousarray(table.tasks))
+            np.save(os.path.join(staging, "executors.npy"), np.array(table.executors, dtype=np.str_))
+            if aggregate is not None:
+                with open(os.path.join(staging, "aggregate.json"), "w") as out:
+                    json.dump(aggregate.to_dict(), out)
+            os.replace(staging, os.path.join(self.cache_dir, key))
+        except OSError:
+            # Another process stored the same version first
+            shutil.rmtree(staging, ignore_errors=True)
+            if not os.path.isdir(os.path.join(self.cache_dir, key)):
+                raise
+        prefix = self._log_prefix(path)
+        for entry in os.listdir(self.cache_dir):
+            if entry.startswith(prefix) and entry != key:
+                shutil.rmtree(os.path.join(self.cache_dir, entry), ignore_errors=True)
+
+    def get(self, path: str) -> TaskTable:
+        """
+        Load the table of a log, parsing the log once if it is not cached.
+
+        Args:
+            path: Event log file (plain, gzip or zstd)
+
+        Returns:
+            TaskTable of the log
+        """
+        table = self.load(path)
+        if table is not None:
+            return table
+        return self.get_with_aggregate(path)[1]
+
+    def get_with_aggregate(self, path: str) -> Tuple[EventLogAggregate, TaskTable]:
+        """
+        Load the aggregate and table of a log, parsing the log once if either is not cached.
+
+        Args:
+            path: Event log file (plain, gzip or zstd)
+
+        Returns:
+            EventLogAggregate and TaskTable of the log, from the same parse
+        """
+        table = self.load(path)
+        aggregate = self.load_aggregate(path) if table is not None else None
+        if aggregate is not None:
+            return aggregate, table
+
+        builder = TaskTableBuilder()
+        aggregate = SparkEventParser.parse_file(path, task_sink=builder)
+        table = builder.build()
+        self.store(path, table, aggregate)
+        logger.info(f"Cached task table of {path} ({len(table)} tasks)")
+        return aggregate, self.load(path) or table
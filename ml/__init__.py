@@ -1,7 +1,35 @@
-"""Machine Learning module for predictive analytics"""
+"""
+Machine Learning module for predictive analytics
+
+Submodules are imported on first attribute access (PEP 562) so that
+importing the package does not load model dependencies.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from ml.runtime_predictor import RuntimePredictor
+    from ml.feature_builder import FeatureBuilder
+    from ml.model_training import ModelTraining
+
+_LAZY_ATTRIBUTES = {
+    "RuntimePredictor": "ml.runtime_predictor",
+    "FeatureBuilder": "ml.feature_builder",
+    "ModelTraining": "ml.model_training",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
 
-from ml.runtime_predictor import RuntimePredictor
-from ml.feature_builder import FeatureBuilder
-from ml.model_training import ModelTraining
 
 __all__ = ["RuntimePredictor", "FeatureBuilder", "ModelTraining"]
@@ -2,5 +2,15 @@
 
 from orchestration.state_model import AgentState, create_agent_state
 from orchestration.graph_builder import SparkIntelligenceGraph, build_spark_optimization_graph
+from orchestration.graph_registry import GraphRegistry, graph_registry
+from orchestration.job_batch import JobBatch
 
-__all__ = ["AgentState", "create_agent_state", "SparkIntelligenceGraph", "build_spark_optimization_graph"]
+__all__ = [
+    "AgentState",
+    "create_agent_state",
+    "SparkIntelligenceGraph",
+    "build_spark_optimization_graph",
+    "GraphRegistry",
+    "graph_registry",
+    "JobBatch"
+]
@@ -0,0 +1,188 @@
+"""Vectorized execution of the optimization agents over a JobBatch"""
+
+import logging
+import math
+from typing import Any, Callable, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from agents.cost_agent import cost_agent_batch
+from agents.partition_agent import partition_agent_batch
+from agents.runtime_agent import runtime_agent_batch
+from agents.skew_agent import skew_agent_batch
+from orchestration.job_batch import BatchUpdate, JobBatch
+from orchestration.state_model import FINDING_FIELDS, AgentUpdate, apply_update
+
+logger = logging.getLogger(__name__)
+
+
+# Batch agents in the order the fan-out graph merges them: branches by node
+# name, then the final agent
+BATCH_AGENTS: Tuple[Tuple[str, Callable[[JobBatch], BatchUpdate]], ...] = (
+    ("partition_agent", partition_agent_batch),
+    ("runtime_agent", runtime_agent_batch),
+    ("skew_agent", skew_agent_batch),
+    ("cost_agent", cost_agent_batch),
+)
+
+# Largest code key space grouped with a dense count instead of a sort
+DENSE_KEY_SPACE = 1 << 16
+
+
+def _partition_relevant(batch: JobBatch) -> np.ndarray:
+    """Jobs with partitions or a shuffle analysis, as in graph_builder"""
+    relevant = batch.partition_count > 0
+    if batch.shuffle_analysis is not None:
+        relevant |= np.array([bool(analysis) for analysis in batch.shuffle_analysis], dtype=bool)
+    return relevant
+
+
+# Vectorized form of graph_builder.AGENT_PREDICATES for the batch agents
+BATCH_PREDICATES: Dict[str, Callable[[JobBatch], np.ndarray]] = {
+    "partition_agent": _partition_relevant,
+}
+
+
+class _Combination(NamedTuple):
+    """Merged findings shared by every job with the same agent codes"""
+    before: List[str]
+    after: List[str]
+    existing: FrozenSet[str]
+    per_job: Optional[List[str]]
+    issues: List[Dict[str, Any]]
+    other: Dict[str, Any]
+
+
+def run_batch(batch: JobBatch) -> List[AgentUpdate]:
+    """
+    Run the batch agents over every job and scatter the findings per job.
+
+    Each agent classifies all jobs at once into a few finding templates.
+    Templates are merged once per distinct combination across agents, so
+    per-job Python work is limited to assembling the job's result.
+
+    Args:
+        batch: Columnar job metrics
+
+    Returns:
+        One merged update per job, in batch order, equal to applying the
+        agents' per-job updates in BATCH_AGENTS order with routing applied.
+        Finding lists are per job; issue dicts and other values are shared
+        between jobs with the same findings and must not be mutated.
+    """
+    if len(batch) == 0:
+        return []
+
+    outputs = []
+    for name, agent in BATCH_AGENTS:
+        output = agent(batch)
+        predicate = BATCH_PREDICATES.get(name)
+        if predicate is not None:
+            output.codes = np.where(predicate(batch), output.codes, -1)
+        outputs.append(output)
+
+    representatives, inverse = _distinct_combinations([output.codes for output in outputs])
+
+    # Merge templates once per combination and pre-split its merged
+    # recommendations around the spot where the per-job one belongs
+    combos = [_merge_combination(outputs, job) for job in representatives.tolist()]
+
+    results = _scatter(inverse.tolist(), combos)
+
+    logger.info(f"Analyzed a batch of {len(batch)} jobs ({len(combos)} distinct finding patterns)")
+    return results
+
+
+def _distinct_combinations(codes: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Group jobs by their tuple of agent codes.
+
+    When the agents' code ranges multiply to a small key space, the codes
+    are packed into one mixed-radix key and counted densely. Otherwise they
+    are sorted column by column; packing them would overflow int64 once the
+    ranges multiply past 2**63.
+
+    Args:
+        codes: Each agent's code per job
+
+    Returns:
+        One job of each distinct combination, and each job's combination
+        index
+    """
+    jobs = len(codes[0])
+    # Codes start at -1 (agent skipped), so each column spans max + 2 values
+    radices = [int(column.max()) + 2 for column in codes]
+    if math.prod(radices) <= max(jobs, DENSE_KEY_SPACE):
+        key = np.zeros(jobs, dtype=np.int64)
+        for column, radix in zip(codes, radices):
+            key = key * radix + (column + 1)
+        present = np.bincount(key, minlength=math.prod(radices)) > 0
+        inverse = (np.cumsum(present) - 1)[key]
+        representative = np.empty(int(present.sum()), dtype=np.int64)
+        representative[inverse] = np.arange(jobs)
+        return representative, inverse
+
+    # lexsort takes its primary key last; stable, so each group starts at its first job
+    order = np.lexsort(codes[::-1])
+    starts = np.zeros(jobs, dtype=bool)
+    starts[0] = True
+    for column in codes:
+        sorted_column = column[order]
+        starts[1:] |= sorted_column[1:] != sorted_column[:-1]
+    inverse = np.empty(jobs, dtype=np.int64)
+    inverse[order] = np.cumsum(starts) - 1
+    return order[starts], inverse
+
+
+def _merge_combination(outputs: List[BatchUpdate], job: int) -> _Combination:
+    """Merge the templates selected for job, representative of its combination"""
+    update: AgentUpdate = {field: [] for field in FINDING_FIELDS}
+    per_job, split = None, 0
+    for output in outputs:
+        code = int(output.codes[job])
+        if code < 0:
+            continue
+        update = apply_update(update, output.templates[code])
+        if output.job_recommendations is not None:
+            if per_job is not None:
+                raise ValueError("Only one batch agent may produce per-job recommendations")
+            per_job, split = output.job_recommendations, len(update["recommendations"])
+
+    recommendations = list(update["recommendations"])
+    other = {key: value for key, value in update.items() if key not in FINDING_FIELDS}
+    return _Combination(
+        before=recommendations[:split] if per_job is not None else recommendations,
+        after=recommendations[split:] if per_job is not None else [],
+        existing=frozenset(recommendations),
+        per_job=per_job,
+        issues=list(update["issues_detected"]),
+        other=other
+    )
+
+
+def _scatter(combo_indices: List[int], combos: List[_Combination]) -> List[AgentUpdate]:
+    """Build each job's result from its combination's merged update"""
+    # At most one agent produces per-job text, so every combination that
+    # has it shares the same list
+    per_job = next((combo.per_job for combo in combos if combo.per_job is not None), None)
+    results = []
+    append = results.append
+    if per_job is None:
+        for combo_index in combo_indices:
+            combo = combos[combo_index]
+            result = combo.other.copy()
+            result["recommendations"] = combo.before + combo.after
+            result["issues_detected"] = combo.issues.copy()
+            append(result)
+        return results
+    for combo_index, text in zip(combo_indices, per_job):
+        combo = combos[combo_index]
+        if combo.per_job is None or text in combo.existing:
+            recommendations = combo.before + combo.after
+        else:
+            recommendations = [*combo.before, text, *combo.after]
+        result = combo.other.copy()
+        result["recommendations"] = recommendations
+        result["issues_detected"] = combo.issues.copy()
+        append(result)
+    return results
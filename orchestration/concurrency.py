@@ -0,0 +1,114 @@
+"""Concurrency helpers for running many workflows at once"""
+
+import asyncio
+import logging
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Iterable, Set, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def map_unordered(
+    func: Callable[[T], Awaitable[R]],
+    items: Union[Iterable[T], AsyncIterable[T]],
+    limit: int
+) -> AsyncIterator[R]:
+    """
+    Run func over items with at most limit calls in flight.
+    
+    Items are pulled lazily and results are yielded in completion order, so
+    memory stays proportional to limit rather than to the number of items.
+    Closing the iterator early cancels the calls still in flight.
+    
+    Args:
+        func: Async function applied to each item
+        items: Items to process, either iterable or async iterable (such
+            as a request body read line by line)
+        limit: Maximum number of concurrent calls
+        
+    Yields:
+        Results of func as they complete
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    
+    is_async = isinstance(items, AsyncIterable)
+    iterator = items.__aiter__() if is_async else iter(items)
+    pending: Set[asyncio.Future] = set()
+    exhausted = False
+    
+    try:
+        while True:
+            while not exhausted and len(pending) < limit:
+                try:
+                    item = await iterator.__anext__() if is_async else next(iterator)
+                except (StopIteration, StopAsyncIteration):
+                    exhausted = True
+                    break
+                pending.add(asyncio.ensure_future(func(item)))
+            
+            if not pending:
+                return
+            
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if is_async and hasattr(iterator, "aclose"):
+            await iterator.aclose()
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one execution.
+    
+    The first caller for a key starts the call; callers arriving while it is
+    in flight await the same result. The shared execution runs in its own
+    task, so a caller that gives up does not cancel it for the others.
+    """
+    
+    def __init__(self):
+        """Initialize the coalescing group"""
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+    
+    async def do(self, key: str, func: Callable[[], Awaitable[R]]) -> R:
+        """
+        Run func for key, or join the execution already in flight for it.
+        
+        Args:
+            key: Canonical identity of the call
+            func: Zero-argument coroutine function to execute
+            
+        Returns:
+            Result of the shared execution
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+    
+    def _forget(self, key: str, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved in case every caller gave up
+            task.exception()
+    
+    def stats(self) -> Dict[str, int]:
+        """Execution, coalesced and in-flight counters"""
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight)
+        }
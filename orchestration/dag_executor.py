@@ -0,0 +1,191 @@
+"""Pure-asyncio executor for SparkIntelligenceGraph workflows"""
+
+import asyncio
+import logging
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    get_type_hints,
+)
+from typing_extensions import Annotated, get_origin
+
+logger = logging.getLogger(__name__)
+
+# Same sentinel as langgraph.graph.END, so both backends share edge maps
+END = "__end__"
+
+Branch = Tuple[Callable, Optional[Dict[Any, str]]]
+
+
+class InvalidUpdateError(ValueError):
+    """Raised when nodes of one step both write a key that has no reducer"""
+
+
+def state_reducers(schema: type) -> Dict[str, Callable[[Any, Any], Any]]:
+    """
+    Collect the reducers declared on a TypedDict state schema.
+
+    A key annotated as Annotated[T, reducer] merges writes with
+    reducer(current, update), as in LangGraph; other keys are overwritten.
+
+    Args:
+        schema: TypedDict state class
+
+    Returns:
+        Reducers keyed by state key
+    """
+    reducers = {}
+    for key, hint in get_type_hints(schema, include_extras=True).items():
+        if get_origin(hint) is Annotated and callable(hint.__metadata__[-1]):
+            reducers[key] = hint.__metadata__[-1]
+    return reducers
+
+
+class AsyncDAGExecutor:
+    """
+    Superstep executor with the LangGraph semantics the workflows rely on.
+
+    Nodes activated by one step run concurrently on the same input state.
+    Their updates are merged in node-name order with the schema reducers,
+    and then the edges and routes of the nodes that ran select the next
+    step. A node targeted by several nodes of a step runs once, which is
+    how fan-out branches fan back in. Routes are evaluated on the merged
+    state.
+
+    Exposes the astream/ainvoke subset of a compiled LangGraph graph used
+    by SparkIntelligenceGraph.run.
+    """
+
+    def __init__(
+        self,
+        nodes: Dict[str, Callable],
+        edges: Dict[str, List[str]],
+        branches: Dict[str, Branch],
+        entry_point: str,
+        schema: type,
+        max_steps: int = 25
+    ):
+        """
+        Initialize the executor
+
+        Args:
+            nodes: Async node functions keyed by name
+            edges: Unconditional successors of each node (END to finish)
+            branches: Route function and optional result-to-node mapping per node
+            entry_point: Node run in the first step
+            schema: TypedDict state class declaring the reducers
+            max_steps: Step limit guarding against routing cycles
+        """
+        targets = {t for succ in edges.values() for t in succ}
+        targets.update(t for _, mapping in branches.values() if mapping for t in mapping.values())
+        unknown = (targets | {entry_point}) - set(nodes) - {END}
+        if unknown:
+            raise ValueError(f"Edges refer to unknown nodes: {sorted(unknown)}")
+
+        self.nodes = nodes
+        self.edges = edges
+        self.branches = branches
+        self.entry_point = entry_point
+        self.reducers = state_reducers(schema)
+        self.max_steps = max_steps
+
+    async def ainvoke(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the workflow and return the final state"""
+        final = state
+        async for chunk in self.astream(state, stream_mode="values"):
+            final = chunk
+        return final
+
+    async def astream(
+        self,
+        state: Dict[str, Any],
+        stream_mode: Union[str, Sequence[str]] = "values"
+    ) -> AsyncIterator[Any]:
+        """
+        Run the workflow, yielding progress after every step.
+
+        Args:
+            state: Initial state
+            stream_mode: "updates" for {node: update} per executed node,
+                "values" for the full state after each step, or a list of
+                both to receive (mode, chunk) pairs
+
+        Yields:
+            Chunks in the requested mode(s)
+        """
+        modes = [stream_mode] if isinstance(stream_mode, str) else list(stream_mode)
+
+        def emit(mode: str, chunk: Any) -> List[Any]:
+            if mode not in modes:
+                return []
+            return [chunk] if isinstance(stream_mode, str) else [(mode, chunk)]
+
+        values = dict(state)
+        for item in emit("values", dict(values)):
+            yield item
+
+        active = [self.entry_point]
+        for _ in range(self.max_steps):
+            updates = await self._run_step(active, values)
+
+            written = set()
+            for name, update in sorted(zip(active, updates), key=lambda pair: pair[0]):
+                for key, value in (update or {}).items():
+                    reducer = self.reducers.get(key)
+                    if reducer is not None and key in values:
+                        values[key] = reducer(values[key], value)
+                    elif key in written:
+                        raise InvalidUpdateError(
+                            f"{key} was written by several nodes in one step and has no reducer"
+                        )
+                    else:
+                        written.add(key)
+                        values[key] = value
+                for item in emit("updates", {name: update}):
+                    yield item
+            for item in emit("values", dict(values)):
+                yield item
+
+            active = self._next_step(sorted(active), values)
+            if not active:
+                return
+
+        raise RecursionError(f"Workflow did not finish within {self.max_steps} steps")
+
+    async def _run_step(self, active: List[str], values: Dict[str, Any]) -> List[Any]:
+        """Run the active nodes concurrently, cancelling the rest if one fails"""
+        if len(active) == 1:
+            return [await self.nodes[active[0]](dict(values))]
+
+        tasks = [asyncio.ensure_future(self.nodes[name](dict(values))) for name in active]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+            return [task.result() for task in tasks]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _next_step(self, ran: List[str], values: Dict[str, Any]) -> List[str]:
+        """Nodes selected by the edges and routes of the nodes that ran"""
+        selected: List[str] = []
+        for name in ran:
+            targets = list(self.edges.get(name, ()))
+            if name in self.branches:
+                route, mapping = self.branches[name]
+                result = route(values)
+                results = result if isinstance(result, list) else [result]
+                targets.extend(mapping[r] if mapping else r for r in results)
+            for target in targets:
+                if target != END and target not in selected:
+                    selected.append(target)
+        return selected
@@ -1,44 +1,227 @@
 """Graph builder using LangGraph for orchestrating agent workflows"""
 
-from typing import Callable, Dict, List, Optional
-from langgraph.graph import StateGraph, END
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+import asyncio
 import logging
-from orchestration.state_model import AgentState
+import time
+from orchestration.dag_executor import END, AsyncDAGExecutor, Branch
+from orchestration.node_memo import NodeMemo
+from orchestration.state_model import AgentState, AgentUpdate, apply_update, attribute_findings
 
 logger = logging.getLogger(__name__)
 
+# (absolute loop time, total seconds) of the deadline for the current run
+_run_deadline: ContextVar[Optional[Tuple[float, float]]] = ContextVar(
+    "spark_graph_run_deadline", default=None
+)
+
+# Execution backends: LangGraph, or the pure-asyncio AsyncDAGExecutor that
+# runs the same graph without LangGraph's per-step overhead
+BACKENDS = ("langgraph", "asyncio")
+
+# Slack given to node-level timeouts before the whole run is abandoned
+DEADLINE_GRACE_S = 0.05
+
+# Called as hook(node, seconds, outcome) after every node execution, where
+# outcome is "ok", "timeout", "error" or "cancelled"
+NodeHook = Callable[[str, float, str], None]
+
+
+class StreamEvent(NamedTuple):
+    """
+    Progress of a streamed workflow run.
+    
+    kind is "update" for a node's update as soon as the node finishes, or
+    "final" for the final state (node is None) once the run is over.
+    """
+    kind: str
+    node: Optional[str]
+    data: Dict[str, Any]
+
+
+def _timeout_update(node: str, reason: str) -> AgentUpdate:
+    """Update recorded for a node that ran out of time"""
+    return {
+        "issues_detected": [{
+            "type": "timeout",
+            "severity": "warning",
+            "node": node,
+            "description": f"{node} {reason}"
+        }]
+    }
+
+
+def _timed_out(node: str, update: Optional[AgentUpdate]) -> bool:
+    """Whether update is the timeout update recorded for node"""
+    issues = (update or {}).get("issues_detected") or ()
+    return any(issue.get("type") == "timeout" and issue.get("node") == node for issue in issues)
+
 
 class SparkIntelligenceGraph:
     """
     LangGraph-based workflow orchestrator for Spark Intelligence agents.
     
     This class builds and manages a directed graph of agents that analyze
-    and optimize Spark jobs through a coordinated workflow.
+    and optimize Spark jobs through a coordinated workflow. The same graph
+    can be compiled for LangGraph or for the pure-asyncio AsyncDAGExecutor.
     """
     
-    def __init__(self):
-        """Initialize the graph builder"""
-        self.graph = StateGraph(AgentState)
+    def __init__(self, backend: str = "langgraph", memo_max_entries: int = 1024):
+        """
+        Initialize the graph builder
+        
+        Args:
+            backend: Execution backend, one of BACKENDS
+            memo_max_entries: Cached updates per memoized node; 0 disables
+                memoization
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown graph backend: {backend}")
+        
+        self.backend = backend
+        self.graph = None
+        if backend == "langgraph":
+            from langgraph.graph import StateGraph
+            self.graph = StateGraph(AgentState)
+        self._node_funcs: Dict[str, Callable] = {}
+        self._edges: Dict[str, List[str]] = {}
+        self._branches: Dict[str, Branch] = {}
         self.start_node: Optional[str] = None
         self.end_node: str = END
         self.compiled_graph = None
-        logger.info("Initialized SparkIntelligenceGraph")
+        self.nodes: List[str] = []
+        self.node_budgets: Dict[str, float] = {}
+        self.node_hooks: List[NodeHook] = []
+        self.memo_max_entries = memo_max_entries
+        self.node_memos: Dict[str, NodeMemo] = {}
+        logger.info(f"Initialized SparkIntelligenceGraph ({backend} backend)")
     
-    def add_node(self, name: str, func: Callable) -> "SparkIntelligenceGraph":
+    def add_node(
+        self,
+        name: str,
+        func: Callable,
+        reads: Optional[Sequence[str]] = None
+    ) -> "SparkIntelligenceGraph":
         """
         Add a node (agent) to the graph.
         
+        A node that declares the state keys it reads (here or through a
+        ``reads`` attribute on func) is memoized: when those inputs are
+        unchanged since an earlier run, its cached update is reused instead
+        of running it again.
+        
         Args:
             name: Node identifier
-            func: Async function that processes the state
+            func: Async function that returns a partial AgentUpdate
+            reads: AgentState keys the node's output depends on
             
         Returns:
             Self for method chaining
         """
         logger.info(f"Adding node: {name}")
-        self.graph.add_node(name, func)
+        if reads is None:
+            reads = getattr(func, "reads", None)
+        if reads is not None and self.memo_max_entries > 0:
+            memo = NodeMemo(reads, max_entries=self.memo_max_entries)
+            self.node_memos[name] = memo
+            func = memo.wrap(func)
+        node = self._timed(name, self._bounded(name, self._attributed(name, func)))
+        self._node_funcs[name] = node
+        if self.graph is not None:
+            self.graph.add_node(name, node)
+        self.nodes.append(name)
+        return self
+    
+    def set_node_budget(self, name: str, share: float) -> "SparkIntelligenceGraph":
+        """
+        Cap a node at a share of the request deadline.
+        
+        Args:
+            name: Node identifier
+            share: Fraction of the run deadline the node may use
+            
+        Returns:
+            Self for method chaining
+        """
+        self.node_budgets[name] = share
         return self
     
+    def memo_stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit, miss, bypass and entry counters of every memoized node"""
+        return {name: memo.stats() for name, memo in self.node_memos.items()}
+    
+    def add_node_hook(self, hook: NodeHook) -> "SparkIntelligenceGraph":
+        """
+        Observe node executions, e.g. to record per-agent latency.
+        
+        Hooks may be added after compiling and apply to every later run.
+        
+        Args:
+            hook: Callable invoked as hook(node, seconds, outcome)
+            
+        Returns:
+            Self for method chaining
+        """
+        if hook not in self.node_hooks:
+            self.node_hooks.append(hook)
+        return self
+    
+    @staticmethod
+    def _attributed(name: str, func: Callable) -> Callable:
+        """Wrap a node so its findings are deduplicated per producing node"""
+        async def node(state: AgentState) -> AgentUpdate:
+            return attribute_findings(await func(state), name)
+        
+        return node
+    
+    def _timed(self, name: str, func: Callable) -> Callable:
+        """Wrap a node so its wall time and outcome are passed to the node hooks"""
+        async def node(state: AgentState) -> AgentUpdate:
+            if not self.node_hooks:
+                return await func(state)
+            
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                update = await func(state)
+                outcome = "timeout" if _timed_out(name, update) else "ok"
+                return update
+            except asyncio.CancelledError:
+                outcome = "cancelled"
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                for hook in self.node_hooks:
+                    hook(name, elapsed, outcome)
+        
+        return node
+    
+    def _bounded(self, name: str, func: Callable) -> Callable:
+        """Wrap a node so it is cancelled once its deadline budget is spent"""
+        async def node(state: AgentState) -> AgentUpdate:
+            deadline = _run_deadline.get()
+            if deadline is None:
+                return await func(state)
+            
+            deadline_at, total_s = deadline
+            budget = deadline_at - asyncio.get_running_loop().time()
+            if name in self.node_budgets:
+                budget = min(budget, total_s * self.node_budgets[name])
+            if budget <= 0:
+                logger.warning(f"Skipping {name}: request deadline expired")
+                return _timeout_update(name, "was not started because the request deadline expired")
+            
+            try:
+                return await asyncio.wait_for(func(state), timeout=budget)
+            except asyncio.TimeoutError:
+                logger.warning(f"Cancelled {name} after {budget * 1000:.0f}ms budget")
+                return _timeout_update(
+                    name, f"exceeded its {budget * 1000:.0f}ms budget and was cancelled"
+                )
+        
+        return node
+    
     def add_edge(self, source: str, target: str) -> "SparkIntelligenceGraph":
         """
         Add an edge between two nodes.
@@ -51,7 +234,9 @@ class SparkIntelligenceGraph:
             Self for method chaining
         """
         logger.info(f"Adding edge: {source} -> {target}")
-        self.graph.add_edge(source, target)
+        self._edges.setdefault(source, []).append(target)
+        if self.graph is not None:
+            self.graph.add_edge(source, target)
         return self
     
     def add_conditional_edge(
@@ -65,14 +250,17 @@ class SparkIntelligenceGraph:
         
         Args:
             source: Source node name
-            condition_func: Function that determines routing
+            condition_func: Function that returns one condition result, or a
+                list of them to fan out to several targets
             edges: Mapping of condition results to target nodes
             
         Returns:
             Self for method chaining
         """
         logger.info(f"Adding conditional edge from: {source}")
-        self.graph.add_conditional_edges(source, condition_func, edges)
+        self._branches[source] = (condition_func, edges)
+        if self.graph is not None:
+            self.graph.add_conditional_edges(source, condition_func, edges)
         return self
     
     def set_entry_point(self, node: str) -> "SparkIntelligenceGraph":
@@ -87,7 +275,8 @@ class SparkIntelligenceGraph:
         """
         logger.info(f"Setting entry point: {node}")
         self.start_node = node
-        self.graph.set_entry_point(node)
+        if self.graph is not None:
+            self.graph.set_entry_point(node)
         return self
     
     def set_finish_point(self, node: str) -> "SparkIntelligenceGraph":
@@ -101,7 +290,9 @@ class SparkIntelligenceGraph:
             Self for method chaining
         """
         logger.info(f"Setting finish point: {node}")
-        self.graph.set_finish_point(node)
+        self._edges.setdefault(node, []).append(END)
+        if self.graph is not None:
+            self.graph.set_finish_point(node)
         return self
     
     def compile(self):
@@ -114,35 +305,176 @@ class SparkIntelligenceGraph:
         if not self.start_node:
             raise ValueError("Entry point must be set before compiling")
         
-        logger.info("Compiling graph")
-        self.compiled_graph = self.graph.compile()
+        logger.info(f"Compiling graph for the {self.backend} backend")
+        if self.graph is not None:
+            self.compiled_graph = self.graph.compile()
+        else:
+            self.compiled_graph = AsyncDAGExecutor(
+                self._node_funcs, self._edges, self._branches, self.start_node, AgentState
+            )
         return self.compiled_graph
     
-    async def run(self, initial_state: AgentState) -> AgentState:
+    async def run(
+        self,
+        initial_state: AgentState,
+        deadline_s: Optional[float] = None
+    ) -> AgentState:
         """
         Execute the workflow with the given initial state.
         
+        With a deadline, each node is cancelled once it uses up its share of
+        the deadline (see set_node_budget) and records a timeout issue, so the
+        run returns whatever findings are ready. The whole run is abandoned
+        shortly after the deadline as a hard ceiling.
+        
         Args:
             initial_state: Initial agent state
+            deadline_s: Optional request-level time budget in seconds
             
         Returns:
-            Final state after all agents have run
+            Final state after all agents have run, with the nodes that
+            did not run listed under skipped_nodes
         """
         if not self.compiled_graph:
             self.compile()
         
         logger.info(f"Starting workflow for job: {initial_state['job_id']}")
         
+        latest = {"state": initial_state}
+        executed = set()
+        
+        async def consume() -> None:
+            # Run the workflow, noting which nodes produced an update
+            async for mode, chunk in self.compiled_graph.astream(
+                initial_state, stream_mode=["updates", "values"]
+            ):
+                if mode == "updates":
+                    executed.update(chunk)
+                else:
+                    latest["state"] = chunk
+        
+        token = None
         try:
-            # Run the workflow
-            final_state = await self.compiled_graph.ainvoke(initial_state)
-            
-            logger.info(f"Workflow completed for job: {initial_state['job_id']}")
-            return final_state
-            
+            if deadline_s is None:
+                await consume()
+            else:
+                loop = asyncio.get_running_loop()
+                token = _run_deadline.set((loop.time() + deadline_s, deadline_s))
+                try:
+                    await asyncio.wait_for(consume(), timeout=deadline_s + DEADLINE_GRACE_S)
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        f"Workflow for job {initial_state['job_id']} hit its "
+                        f"{deadline_s * 1000:.0f}ms deadline, returning partial results"
+                    )
+                    latest["state"] = apply_update(
+                        latest["state"],
+                        _timeout_update("workflow", f"exceeded the {deadline_s * 1000:.0f}ms request deadline")
+                    )
         except Exception as e:
             logger.error(f"Workflow execution failed: {str(e)}")
             raise
+        finally:
+            if token is not None:
+                _run_deadline.reset(token)
+        
+        final_state = dict(latest["state"])
+        final_state["skipped_nodes"] = [node for node in self.nodes if node not in executed]
+        
+        logger.info(
+            f"Workflow completed for job: {initial_state['job_id']} "
+            f"(skipped: {final_state['skipped_nodes'] or 'none'})"
+        )
+        return final_state
+    
+    async def stream(
+        self,
+        initial_state: AgentState,
+        deadline_s: Optional[float] = None
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Execute the workflow, yielding each node's update as it finishes.
+        
+        Deadlines apply as in run(). Closing the iterator early cancels the
+        remaining nodes.
+        
+        Args:
+            initial_state: Initial agent state
+            deadline_s: Optional request-level time budget in seconds
+            
+        Yields:
+            An "update" event per executed node in completion order, then a
+            "final" event with the same final state run() returns
+        """
+        if not self.compiled_graph:
+            self.compile()
+        
+        logger.info(f"Streaming workflow for job: {initial_state['job_id']}")
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        finished = object()
+        latest = {"state": initial_state}
+        executed = set()
+        
+        async def produce() -> None:
+            try:
+                async for mode, chunk in self.compiled_graph.astream(
+                    initial_state, stream_mode=["updates", "values"]
+                ):
+                    if mode == "updates":
+                        executed.update(chunk)
+                        for node, update in chunk.items():
+                            queue.put_nowait((node, update or {}))
+                    else:
+                        latest["state"] = chunk
+            except Exception as e:
+                queue.put_nowait(e)
+            else:
+                queue.put_nowait(finished)
+        
+        # The producer task copies the context, so nodes see the deadline
+        loop = asyncio.get_running_loop()
+        token = None
+        if deadline_s is not None:
+            deadline_at = loop.time() + deadline_s
+            token = _run_deadline.set((deadline_at, deadline_s))
+        try:
+            producer = asyncio.ensure_future(produce())
+        finally:
+            if token is not None:
+                _run_deadline.reset(token)
+        
+        try:
+            while True:
+                try:
+                    if deadline_s is None:
+                        item = await queue.get()
+                    else:
+                        remaining = deadline_at + DEADLINE_GRACE_S - loop.time()
+                        item = await asyncio.wait_for(queue.get(), timeout=max(remaining, 0))
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        f"Workflow for job {initial_state['job_id']} hit its "
+                        f"{deadline_s * 1000:.0f}ms deadline, returning partial results"
+                    )
+                    update = _timeout_update("workflow", f"exceeded the {deadline_s * 1000:.0f}ms request deadline")
+                    latest["state"] = apply_update(latest["state"], update)
+                    yield StreamEvent("update", "workflow", update)
+                    break
+                
+                if item is finished:
+                    break
+                if isinstance(item, Exception):
+                    logger.error(f"Workflow execution failed: {str(item)}")
+                    raise item
+                node, update = item
+                yield StreamEvent("update", node, update)
+        finally:
+            producer.cancel()
+        
+        final_state = dict(latest["state"])
+        final_state["skipped_nodes"] = [node for node in self.nodes if node not in executed]
+        yield StreamEvent("final", None, final_state)
     
     def visualize(self) -> str:
         """
@@ -161,30 +493,103 @@ class SparkIntelligenceGraph:
             return "Graph visualization not available"
 
 
-def build_spark_optimization_graph(agents: Dict[str, Callable]) -> SparkIntelligenceGraph:
+ENTRY_AGENT = "metadata_agent"
+FINAL_AGENT = "cost_agent"
+TOPOLOGIES = ("sequential", "fan_out")
+SEQUENTIAL_ORDER = (
+    "metadata_agent",
+    "partition_agent",
+    "skew_agent",
+    "runtime_agent",
+    "delta_agent",
+    "cost_agent"
+)
+
+# Agents whose output depends entirely on one input are only scheduled when
+# that input makes them relevant; agents not listed here always run
+AGENT_PREDICATES: Dict[str, Callable[[AgentState], bool]] = {
+    "partition_agent": lambda state: (
+        state.get("partition_count", 0) > 0 or bool(state.get("shuffle_analysis"))
+    ),
+    "delta_agent": lambda state: state.get("source_type") == "delta",
+}
+
+
+def _should_run(name: str, state: AgentState) -> bool:
+    predicate = AGENT_PREDICATES.get(name)
+    return predicate is None or predicate(state)
+
+
+def _route_branches(branches: List[str]) -> Callable[[AgentState], List[str]]:
+    """Select the fan-out branches relevant to the state, or go straight to the final agent"""
+    def route(state: AgentState) -> List[str]:
+        return [name for name in branches if _should_run(name, state)] or [FINAL_AGENT]
+    
+    return route
+
+
+def _route_next(candidates: List[str]) -> Callable[[AgentState], str]:
+    """Select the first of the remaining sequential agents relevant to the state"""
+    def route(state: AgentState) -> str:
+        return next(name for name in candidates if _should_run(name, state))
+    
+    return route
+
+
+def build_spark_optimization_graph(
+    agents: Dict[str, Callable],
+    topology: str = "fan_out",
+    backend: str = "langgraph"
+) -> SparkIntelligenceGraph:
     """
     Factory function to build the standard Spark optimization workflow.
     
     Args:
         agents: Dictionary mapping agent names to agent functions
+        topology: Wiring of the agents, one of TOPOLOGIES
+        backend: Execution backend, one of BACKENDS
         
     Returns:
-        Configured and compiled SparkIntelligenceGraph
+        Configured SparkIntelligenceGraph
     """
-    graph = SparkIntelligenceGraph()
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown graph topology: {topology}")
+    
+    graph = SparkIntelligenceGraph(backend=backend)
     
     # Add all agent nodes
     for agent_name, agent_func in agents.items():
         graph.add_node(agent_name, agent_func)
     
-    # Set execution order
-    graph.set_entry_point("metadata_agent")
-    graph.add_edge("metadata_agent", "partition_agent")
-    graph.add_edge("partition_agent", "skew_agent")
-    graph.add_edge("skew_agent", "runtime_agent")
-    graph.add_edge("runtime_agent", "delta_agent")
-    graph.add_edge("delta_agent", "cost_agent")
-    graph.set_finish_point("cost_agent")
+    graph.set_entry_point(ENTRY_AGENT)
+    
+    if topology == "sequential":
+        # Each agent hands over to the next agent in order that is relevant
+        for position, node in enumerate(SEQUENTIAL_ORDER[:-1]):
+            candidates = list(SEQUENTIAL_ORDER[position + 1:])
+            graph.add_conditional_edge(
+                node, _route_next(candidates), {name: name for name in candidates}
+            )
+        for name in SEQUENTIAL_ORDER:
+            graph.set_node_budget(name, 1 / len(SEQUENTIAL_ORDER))
+    else:
+        # Every agent between the entry and final agent only needs metadata
+        # output, so the relevant ones fan out in parallel and fan back in
+        # to the final agent
+        branches = [name for name in agents if name not in (ENTRY_AGENT, FINAL_AGENT)]
+        graph.set_node_budget(ENTRY_AGENT, 0.25)
+        graph.set_node_budget(FINAL_AGENT, 0.25)
+        for branch in branches:
+            graph.set_node_budget(branch, 0.5)
+        graph.add_conditional_edge(
+            ENTRY_AGENT,
+            _route_branches(branches),
+            {name: name for name in branches + [FINAL_AGENT]}
+        )
+        for branch in branches:
+            graph.add_edge(branch, FINAL_AGENT)
+    
+    graph.set_finish_point(FINAL_AGENT)
     
-    logger.info("Built standard Spark optimization graph")
+    logger.info(f"Built {topology} Spark optimization graph ({backend} backend)")
     return graph
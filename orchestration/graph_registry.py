@@ -0,0 +1,170 @@
+"""Process-wide registry of compiled optimization graphs"""
+
+import hashlib
+import json
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from orchestration.graph_builder import (
+    NodeHook,
+    SparkIntelligenceGraph,
+    build_spark_optimization_graph
+)
+from rules_engine import rules_versions
+
+logger = logging.getLogger(__name__)
+
+GraphKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+
+class GraphRegistry:
+    """
+    Cache of compiled SparkIntelligenceGraph instances.
+
+    Graphs are keyed by topology, backend and the registered agent set, built once
+    and then shared. A compiled graph keeps no per-request state, so the same
+    instance can serve concurrent requests. Re-registering agents drops every
+    cached graph.
+    """
+
+    def __init__(self, builder: Callable[..., SparkIntelligenceGraph] = build_spark_optimization_graph):
+        """
+        Initialize the registry
+
+        Args:
+            builder: Factory called as builder(agents, topology=..., backend=...)
+                on a cache miss
+        """
+        self._builder = builder
+        self._lock = threading.Lock()
+        self._agents: Dict[str, Callable] = {}
+        self._graphs: Dict[GraphKey, SparkIntelligenceGraph] = {}
+        self._node_hooks: List[NodeHook] = []
+        self._version = self.version_fingerprint({})
+
+    @property
+    def agents(self) -> Dict[str, Callable]:
+        """Currently registered agents keyed by node name"""
+        return dict(self._agents)
+
+    @property
+    def version(self) -> str:
+        """Fingerprint of the registered agent and rule versions"""
+        return self._version
+
+    @staticmethod
+    def version_fingerprint(agents: Dict[str, Callable]) -> str:
+        """
+        Fingerprint the versions that determine analysis output.
+
+        Args:
+            agents: Agents keyed by node name
+
+        Returns:
+            Short hash that changes whenever an agent implementation or
+            version, or a rule version, changes
+        """
+        agent_ids = GraphRegistry.graph_key(agents, "")[-1]
+        agent_versions = {
+            name: [impl, getattr(agents[name], "version", "unversioned")]
+            for name, impl in agent_ids
+        }
+        payload = json.dumps({"agents": agent_versions, "rules": rules_versions()}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def graph_key(agents: Dict[str, Callable], topology: str, backend: str = "langgraph") -> GraphKey:
+        """
+        Build the cache key for an agent set, topology and backend.
+
+        Args:
+            agents: Agents keyed by node name
+            topology: Topology name passed to the builder
+            backend: Execution backend passed to the builder
+
+        Returns:
+            Hashable key identifying the graph
+        """
+        agent_ids = []
+        for name, agent in agents.items():
+            impl = getattr(agent, "__qualname__", None) or type(agent).__qualname__
+            module = getattr(agent, "__module__", None) or type(agent).__module__
+            agent_ids.append((name, f"{module}.{impl}"))
+        return topology, backend, tuple(sorted(agent_ids))
+
+    def register_agents(self, agents: Dict[str, Callable]) -> None:
+        """
+        Register the agent set and invalidate every cached graph.
+
+        Args:
+            agents: Agents keyed by node name
+        """
+        with self._lock:
+            self._agents = dict(agents)
+            self._version = self.version_fingerprint(self._agents)
+            self._graphs.clear()
+        logger.info(f"Registered {len(agents)} agents, graph cache invalidated")
+
+    def add_node_hook(self, hook: NodeHook) -> None:
+        """
+        Attach a node hook to every cached graph and every graph built later.
+
+        Args:
+            hook: Callable invoked as hook(node, seconds, outcome)
+        """
+        with self._lock:
+            if hook not in self._node_hooks:
+                self._node_hooks.append(hook)
+            for graph in self._graphs.values():
+                graph.add_node_hook(hook)
+
+    def invalidate(self, topology: Optional[str] = None) -> None:
+        """
+        Drop cached graphs.
+
+        Args:
+            topology: Only drop graphs for this topology; all graphs when None
+        """
+        with self._lock:
+            if topology is None:
+                self._graphs.clear()
+            else:
+                for key in [k for k in self._graphs if k[0] == topology]:
+                    del self._graphs[key]
+
+    def get(self, topology: str = "fan_out", backend: str = "langgraph") -> SparkIntelligenceGraph:
+        """
+        Return the compiled graph for the registered agents, building it on first use.
+
+        Args:
+            topology: Topology name passed to the builder
+            backend: Execution backend passed to the builder
+
+        Returns:
+            Compiled SparkIntelligenceGraph
+        """
+        agents = self._agents
+        if not agents:
+            raise RuntimeError("No agents registered with the graph registry")
+
+        key = self.graph_key(agents, topology, backend)
+        graph = self._graphs.get(key)
+        if graph is not None:
+            return graph
+
+        with self._lock:
+            # Another caller may have built it while we waited for the lock
+            key = self.graph_key(self._agents, topology, backend)
+            graph = self._graphs.get(key)
+            if graph is None:
+                graph = self._builder(self._agents, topology=topology, backend=backend)
+                for hook in self._node_hooks:
+                    graph.add_node_hook(hook)
+                graph.compile()
+                self._graphs[key] = graph
+                logger.info(f"Compiled and cached {topology} optimization graph ({backend} backend)")
+            return graph
+
+
+graph_registry = GraphRegistry()
@@ -0,0 +1,118 @@
+"""Columnar job batches for vectorized agent evaluation"""
+
+from dataclasses import dataclass
+from typing import Any, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from orchestration.state_model import AgentUpdate, apply_update
+
+
+@dataclass
+class JobBatch:
+    """
+    Metrics of many jobs stored as one NumPy array per metric.
+
+    Row i of every column belongs to job_ids[i]. Per-stage partition sizes
+    and the event-log analyses are ragged, so they are kept as one optional
+    mapping per job.
+    """
+    job_ids: List[str]
+    execution_time_ms: np.ndarray
+    cpu_utilization: np.ndarray
+    memory_used_mb: np.ndarray
+    partition_count: np.ndarray
+    stage_partition_sizes: Optional[List[Optional[Mapping[str, Any]]]] = None
+    stage_runtime: Optional[List[Optional[Mapping[str, Any]]]] = None
+    executor_timeline: Optional[List[Optional[Mapping[str, Any]]]] = None
+    shuffle_analysis: Optional[List[Optional[Mapping[str, Any]]]] = None
+    plan_analysis: Optional[List[Optional[Mapping[str, Any]]]] = None
+
+    def __post_init__(self):
+        for column in ("execution_time_ms", "cpu_utilization", "memory_used_mb", "partition_count"):
+            if len(getattr(self, column)) != len(self.job_ids):
+                raise ValueError(f"Column {column} does not have one value per job")
+        for column in (
+            "stage_partition_sizes", "stage_runtime", "executor_timeline", "shuffle_analysis", "plan_analysis"
+        ):
+            values = getattr(self, column)
+            if values is not None and len(values) != len(self.job_ids):
+                raise ValueError(f"Column {column} does not have one value per job")
+
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+    @classmethod
+    def from_states(cls, states: Sequence[Mapping[str, Any]]) -> "JobBatch":
+        """
+        Build a batch from AgentState-like mappings.
+
+        Args:
+            states: Job states; missing metrics default to 0
+
+        Returns:
+            JobBatch with one row per state
+        """
+        # Gather the numeric metrics, and whether the state has any
+        # event-log analysis, in one pass over the states; it is bound by
+        # fetching each state rather than by the lookups
+        values = np.array(
+            [
+                value
+                for state in states
+                for value in (
+                    state.get("execution_time_ms", 0), state.get("cpu_utilization", 0),
+                    state.get("memory_used_mb", 0), state.get("partition_count", 0),
+                    bool(
+                        state.get("stage_partition_sizes") or state.get("stage_runtime")
+                        or state.get("executor_timeline") or state.get("shuffle_analysis")
+                        or state.get("plan_analysis")
+                    )
+                )
+            ],
+            dtype=np.float64
+        ).reshape(len(states), 5)
+        has_ragged = bool(values[:, 4].any())
+
+        def ragged(key: str) -> Optional[List[Optional[Mapping[str, Any]]]]:
+            if not has_ragged:
+                return None
+            values = [state.get(key) or None for state in states]
+            return values if any(values) else None
+
+        return cls(
+            job_ids=[state.get("job_id") for state in states],
+            execution_time_ms=values[:, 0].copy(),
+            cpu_utilization=values[:, 1].copy(),
+            memory_used_mb=values[:, 2].copy(),
+            partition_count=values[:, 3].astype(np.int64),
+            stage_partition_sizes=ragged("stage_partition_sizes"),
+            stage_runtime=ragged("stage_runtime"),
+            executor_timeline=ragged("executor_timeline"),
+            shuffle_analysis=ragged("shuffle_analysis"),
+            plan_analysis=ragged("plan_analysis"),
+        )
+
+
+@dataclass
+class BatchUpdate:
+    """
+    Output of a batch agent for a JobBatch.
+
+    Job i receives templates[codes[i]], or nothing when codes[i] is -1.
+    Recommendations whose text depends on the job's own values are listed
+    per job in job_recommendations and follow the template's findings.
+    """
+    codes: np.ndarray
+    templates: List[AgentUpdate]
+    job_recommendations: Optional[List[str]] = None
+
+    def update_for(self, index: int) -> Optional[AgentUpdate]:
+        """Materialize the update of one job, None if the agent did not run for it"""
+        code = int(self.codes[index])
+        if code < 0:
+            return None
+        update = self.templates[code]
+        if self.job_recommendations is not None:
+            update = apply_update(update, {"recommendations": [self.job_recommendations[index]]})
+        return update
@@ -0,0 +1,159 @@
+"""Per-node memoization of agent updates keyed on input fingerprints"""
+
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence
+
+import numpy as np
+
+from orchestration.state_model import AgentState, AgentUpdate
+
+logger = logging.getLogger(__name__)
+
+# Sequences at least this long are tried as one numeric array before
+# falling back to fingerprinting element by element
+NUMERIC_FINGERPRINT_MIN_LEN = 256
+
+
+def fingerprint(value: Any) -> Hashable:
+    """
+    Hashable identity of a state value.
+
+    Scalars are tagged with their type, containers are fingerprinted
+    recursively (dicts independent of key order), and objects may provide
+    their own identity through a ``fingerprint`` attribute or method.
+    Long numeric sequences and NumPy arrays are hashed in one step from
+    their values as an array, so the element types within them are only
+    told apart through the array dtype.
+
+    Args:
+        value: State value
+
+    Returns:
+        Hashable fingerprint
+
+    Raises:
+        TypeError: If the value cannot be fingerprinted
+    """
+    if value is None or isinstance(value, (str, bytes, bool, int, float)):
+        return type(value).__name__, value
+    if isinstance(value, dict):
+        return "dict", frozenset((key, fingerprint(item)) for key, item in value.items())
+    if isinstance(value, np.ndarray):
+        array = _numeric_fingerprint(value)
+        if array is not None:
+            return array
+    if isinstance(value, (list, tuple)):
+        if len(value) >= NUMERIC_FINGERPRINT_MIN_LEN:
+            array = _numeric_fingerprint(value)
+            if array is not None:
+                return array
+        return "seq", tuple(fingerprint(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return "set", frozenset(fingerprint(item) for item in value)
+    custom = getattr(value, "fingerprint", None)
+    if custom is not None:
+        return "custom", custom() if callable(custom) else custom
+    raise TypeError(f"Cannot fingerprint {type(value).__name__}")
+
+
+def _numeric_fingerprint(value: Any) -> Optional[Hashable]:
+    """Digest of value as a numeric array, None if it is not one"""
+    try:
+        array = np.asarray(value)
+    except (ValueError, OverflowError):
+        return None
+    if array.dtype.kind not in "biuf":
+        return None
+    digest = hashlib.blake2b(np.ascontiguousarray(array).tobytes(), digest_size=16).digest()
+    return "array", array.dtype.str, array.shape, digest
+
+
+def _copy_update(update: AgentUpdate) -> AgentUpdate:
+    """Shallow-copy an update so callers cannot alter the cached lists"""
+    return {key: list(value) if isinstance(value, list) else value for key, value in update.items()}
+
+
+def _cacheable(update: Optional[AgentUpdate]) -> bool:
+    """Updates reporting an agent error may be transient and are not reused"""
+    issues = (update or {}).get("issues_detected") or ()
+    return not any(issue.get("severity") == "error" for issue in issues)
+
+
+class NodeMemo:
+    """
+    Bounded LRU cache of one node's updates.
+
+    The key is the fingerprint of the state keys the node declares it
+    reads, so a node is re-run only when one of its inputs changed. States
+    whose inputs cannot be fingerprinted bypass the cache.
+    """
+
+    def __init__(self, reads: Sequence[str], max_entries: int = 1024):
+        """
+        Initialize the memo
+
+        Args:
+            reads: AgentState keys the node's output depends on
+            max_entries: Updates kept before the least recently used is evicted
+        """
+        self.reads = tuple(reads)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, AgentUpdate]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    def key(self, state: AgentState) -> Optional[Hashable]:
+        """Fingerprint of the node's inputs, None if they cannot be fingerprinted"""
+        try:
+            return tuple(fingerprint(state.get(key)) for key in self.reads)
+        except TypeError as e:
+            logger.debug(f"Not memoizing node inputs: {str(e)}")
+            return None
+
+    def wrap(self, func: Callable) -> Callable:
+        """
+        Memoize an async node function.
+
+        Args:
+            func: Async function returning a partial AgentUpdate
+
+        Returns:
+            Async function serving unchanged inputs from the cache
+        """
+        async def node(state: AgentState) -> AgentUpdate:
+            key = self.key(state)
+            if key is None:
+                self.bypassed += 1
+                return await func(state)
+
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy_update(cached)
+
+            self.misses += 1
+            update = await func(state)
+            if _cacheable(update):
+                self._entries[key] = _copy_update(update or {})
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return update
+
+        return node
+
+    def clear(self) -> None:
+        """Drop every cached update"""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss, bypass and entry counters"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "entries": len(self._entries)
+        }
@@ -0,0 +1,167 @@
+"""Executor pool for CPU-bound agent work, kept off the event loop"""
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from orchestration.worker_pool import _TimingStats
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+EXECUTOR_KINDS = ("process", "thread")
+
+
+def _timed_call(func: Callable[..., T], args: Tuple[Any, ...]) -> Tuple[float, T]:
+    """Run func in the worker and report how long it computed"""
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+class CPUOffloadPool:
+    """
+    Shared executor for the CPU-heavy sections of agents.
+
+    Agents stay async and await run() around code that would otherwise
+    hold the event loop: the section runs in a process pool (or a thread
+    pool, for code that releases the GIL such as NumPy kernels) while the
+    loop keeps serving requests.
+
+    With the process executor, func and its arguments are pickled, so func
+    must be a module-level function and arguments should be the compact
+    inputs the section needs (NumPy arrays, tuples of numbers) rather than
+    the whole AgentState.
+    """
+
+    def __init__(self, kind: str = "process", workers: Optional[int] = None):
+        """
+        Initialize the pool
+
+        Args:
+            kind: "process" or "thread"
+            workers: Executor size, defaults to the CPU count
+        """
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor kind: {kind}. Expected one of {EXECUTOR_KINDS}")
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self._executor: Optional[Executor] = None
+        self._in_flight = 0
+        self._counters = {"submitted": 0, "completed": 0, "failed": 0, "saturated": 0}
+        self._wait_time = _TimingStats()
+        self._service_time = _TimingStats()
+
+    def configure(self, kind: str, workers: Optional[int] = None) -> None:
+        """
+        Change the executor kind and size; takes effect on the next start.
+
+        Args:
+            kind: "process" or "thread"
+            workers: Executor size, defaults to the CPU count
+        """
+        if self.running:
+            raise RuntimeError("Cannot reconfigure a running offload pool")
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor kind: {kind}. Expected one of {EXECUTOR_KINDS}")
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+
+    @property
+    def running(self) -> bool:
+        """Whether the executor has been created"""
+        return self._executor is not None
+
+    def start(self) -> None:
+        """Create the executor; worker processes start on first use"""
+        if self.running:
+            return
+        if self.kind == "process":
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="offload")
+        logger.info(f"Started CPU offload pool ({self.kind}, {self.workers} workers)")
+
+    async def stop(self) -> None:
+        """Shut the executor down, cancelling sections that have not started"""
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+        logger.info("Stopped CPU offload pool")
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run func(*args) on the executor.
+
+        Args:
+            func: Synchronous function; module-level for the process executor
+            *args: Positional arguments, pickled for the process executor
+
+        Returns:
+            Return value of func
+
+        Raises:
+            Exception: Whatever func raised
+        """
+        if not self.running:
+            self.start()
+
+        if self._in_flight >= self.workers:
+            self._counters["saturated"] += 1
+        self._counters["submitted"] += 1
+        self._in_flight += 1
+        start = time.perf_counter()
+        try:
+            service_s, result = await asyncio.get_running_loop().run_in_executor(
+                self._executor, _timed_call, func, args
+            )
+        except BrokenProcessPool:
+            # A worker died (OOM, signal); replace the executor for later calls
+            logger.error("CPU offload worker died, restarting the process pool")
+            self._counters["failed"] += 1
+            self._executor = None
+            raise
+        except Exception:
+            self._counters["failed"] += 1
+            raise
+        finally:
+            self._in_flight -= 1
+
+        self._counters["completed"] += 1
+        self._service_time.observe(service_s)
+        self._wait_time.observe(max(time.perf_counter() - start - service_s, 0.0))
+        return result
+
+    def metrics(self) -> Dict[str, Any]:
+        """Saturation counters and queue wait/compute time statistics"""
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "in_flight": self._in_flight,
+            **self._counters,
+            "wait_time": self._wait_time.summary(),
+            "service_time": self._service_time.summary(),
+        }
+
+
+offload_pool = CPUOffloadPool()
+
+
+async def run_cpu_bound(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run a CPU-heavy section of an agent on the shared offload pool.
+
+    Args:
+        func: Synchronous function; module-level for the process executor
+        *args: Positional arguments
+
+    Returns:
+        Return value of func
+    """
+    return await offload_pool.run(func, *args)
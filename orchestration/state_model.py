@@ -1,10 +1,74 @@
 """State model for LangGraph-based agent workflow"""
 
-from typing import Dict, List, Any, Optional, TypedDict
+from typing import Dict, List, Any, Hashable, Optional, TypedDict
 from typing_extensions import Annotated
-import operator
 from datetime import datetime
 
+# List fields that agents append to and that parallel branches merge
+FINDING_FIELDS = ("recommendations", "issues_detected")
+
+
+def _finding_key(item: Any) -> Hashable:
+    """Hashable identity of a recommendation or issue"""
+    if isinstance(item, dict):
+        try:
+            return frozenset(item.items())
+        except TypeError:
+            return repr(sorted(item.items(), key=lambda entry: entry[0]))
+    return item
+
+
+class FindingList(list):
+    """
+    List of findings that carries the membership index used by merge_findings.
+    
+    A node's own update list may also name the node that produced it in
+    source, so the same finding from two agents is kept once per agent.
+    """
+    
+    __slots__ = ("_keys", "source")
+
+
+def merge_findings(existing: List[Any], new: List[Any]) -> List[Any]:
+    """
+    Reducer for finding lists written by concurrent branches.
+    
+    Appends the entries of new that are not already present, so branches
+    that run in parallel merge without losing or duplicating findings.
+    An entry is keyed by its content and, when new was marked with
+    attribute_findings, by the node that produced it; the same finding
+    from two agents is kept for each of them.
+    
+    The key index travels with the merged list, so only the added entries
+    are hashed. A step that adds entries still copies the list and the
+    index, which is linear in the size of existing; a step that adds
+    nothing returns existing unchanged.
+    
+    Args:
+        existing: Current channel value
+        new: Entries written by a node
+        
+    Returns:
+        Merged list preserving first-seen order
+    """
+    if not new:
+        return existing
+    source = getattr(new, "source", None)
+    keys = getattr(existing, "_keys", None)
+    if keys is None:
+        keys = {(None, _finding_key(item)) for item in existing}
+    added = {}
+    for item in new:
+        key = (source, _finding_key(item))
+        if key not in keys and key not in added:
+            added[key] = item
+    if not added:
+        return existing
+    merged = FindingList(existing)
+    merged.extend(added.values())
+    merged._keys = keys | added.keys()
+    return merged
+
 
 class AgentState(TypedDict):
     """
@@ -24,20 +88,55 @@ class AgentState(TypedDict):
     partition_strategy: Optional[str]
     skewed_columns: List[str]
     
+    # Partition or task sizes of each stage, and their skew statistics
+    stage_partition_sizes: Dict[str, List[float]]
+    skew_statistics: Dict[str, Dict[str, Any]]
+    
     # Runtime metrics
     execution_time_ms: int
     cpu_utilization: float
     memory_used_mb: int
     
+    # Critical path and stragglers from the job's event log
+    stage_runtime: Dict[str, Any]
+    
+    # Executor slot utilization and idle capacity from the job's event log
+    executor_timeline: Dict[str, Any]
+    
+    # Per-stage shuffle and spill from the job's event log
+    shuffle_analysis: Dict[str, Any]
+    
+    # Join, scan and exchange findings from the job's SQL physical plans
+    plan_analysis: Dict[str, Any]
+    
     # Analysis results
-    recommendations: Annotated[List[str], operator.add]
-    issues_detected: Annotated[List[Dict[str, Any]], operator.add]
+    recommendations: Annotated[List[str], merge_findings]
+    issues_detected: Annotated[List[Dict[str, Any]], merge_findings]
+    
+    # Nodes that routing did not schedule for this job
+    skipped_nodes: List[str]
     
     # Metadata
     created_at: str
     updated_at: str
 
 
+class AgentUpdate(TypedDict, total=False):
+    """
+    Partial state update returned by an agent.
+    
+    Agents return only the keys they produce. Finding lists hold only the
+    entries the agent adds; the AgentState reducers merge them.
+    """
+    schema_info: Dict[str, Any]
+    partition_strategy: Optional[str]
+    skewed_columns: List[str]
+    skew_statistics: Dict[str, Dict[str, Any]]
+    recommendations: List[str]
+    issues_detected: List[Dict[str, Any]]
+    updated_at: str
+
+
 def create_agent_state(
     job_id: str,
     job_name: str,
@@ -48,6 +147,11 @@ def create_agent_state(
     execution_time_ms: int = 0,
     cpu_utilization: float = 0.0,
     memory_used_mb: int = 0,
+    stage_partition_sizes: Optional[Dict[str, List[float]]] = None,
+    stage_runtime: Optional[Dict[str, Any]] = None,
+    executor_timeline: Optional[Dict[str, Any]] = None,
+    shuffle_analysis: Optional[Dict[str, Any]] = None,
+    plan_analysis: Optional[Dict[str, Any]] = None,
 ) -> AgentState:
     """
     Factory function to create an AgentState.
@@ -62,6 +166,11 @@ def create_agent_state(
         execution_time_ms: Execution time in milliseconds
         cpu_utilization: CPU utilization ratio
         memory_used_mb: Memory used in MB
+        stage_partition_sizes: Optional partition or task sizes keyed by stage id
+        stage_runtime: Optional critical path and stragglers from stage_runtime_analysis
+        executor_timeline: Optional slot utilization from executor_timeline_summary
+        shuffle_analysis: Optional per-stage shuffle and spill from shuffle_analysis
+        plan_analysis: Optional physical-plan findings from plan_analysis
         
     Returns:
         AgentState instance
@@ -75,11 +184,58 @@ def create_agent_state(
         partition_count=partition_count,
         partition_strategy=None,
         skewed_columns=[],
+        stage_partition_sizes=stage_partition_sizes or {},
+        skew_statistics={},
         execution_time_ms=execution_time_ms,
         cpu_utilization=cpu_utilization,
         memory_used_mb=memory_used_mb,
+        stage_runtime=stage_runtime or {},
+        executor_timeline=executor_timeline or {},
+        shuffle_analysis=shuffle_analysis or {},
+        plan_analysis=plan_analysis or {},
         recommendations=[],
         issues_detected=[],
+        skipped_nodes=[],
         created_at=datetime.now().isoformat(),
         updated_at=datetime.now().isoformat(),
     )
+
+
+def attribute_findings(update: AgentUpdate, source: str) -> AgentUpdate:
+    """
+    Mark the finding lists of a node update with the node that wrote them.
+    
+    Args:
+        update: Partial update returned by a node
+        source: Name of the node
+        
+    Returns:
+        Update whose finding lists dedupe per producing node
+    """
+    attributed = dict(update)
+    for key in FINDING_FIELDS:
+        if update.get(key):
+            findings = FindingList(update[key])
+            findings.source = source
+            attributed[key] = findings
+    return attributed
+
+
+def apply_update(state: AgentState, update: AgentUpdate) -> AgentState:
+    """
+    Merge an agent update into a state outside of a compiled graph.
+    
+    Args:
+        state: Current state
+        update: Partial update returned by an agent
+        
+    Returns:
+        New state with the same reducer semantics as the workflow
+    """
+    merged = dict(state)
+    for key, value in update.items():
+        if key in FINDING_FIELDS:
+            merged[key] = merge_findings(state.get(key, []), value)
+        else:
+            merged[key] = value
+    return merged
@@ -0,0 +1,184 @@
+"""Bounded in-process worker pool for asynchronous job analyses"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when a submission would exceed the queue capacity"""
+
+
+@dataclass
+class Ticket:
+    """Status of a submitted analysis"""
+    ticket_id: str
+    status: str
+    submitted_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+
+
+class _TimingStats:
+    """Running count, total and maximum of a duration"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total_s += seconds
+        self.max_s = max(self.max_s, seconds)
+
+    def summary(self) -> Dict[str, float]:
+        mean_s = self.total_s / self.count if self.count else 0.0
+        return {"count": self.count, "mean_ms": mean_s * 1000, "max_ms": self.max_s * 1000}
+
+
+class AnalysisWorkerPool:
+    """
+    Fixed set of asyncio workers fed from a bounded queue.
+
+    Submissions get a ticket immediately and are rejected with QueueFullError
+    once max_queue jobs are waiting, which callers surface as backpressure.
+    Tickets are kept for polling up to max_tickets; once over, the tickets
+    that finished first are evicted, while queued and running ones stay.
+    """
+
+    def __init__(self, workers: int = 4, max_queue: int = 1000, max_tickets: int = 10000):
+        """
+        Initialize the worker pool
+
+        Args:
+            workers: Number of concurrent workers
+            max_queue: Maximum number of jobs waiting for a worker
+            max_tickets: Maximum number of tickets retained for polling
+        """
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_tickets = max(max_tickets, max_queue + workers)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._tickets: Dict[str, Ticket] = {}
+        # Finished ticket ids in finishing order, the eviction candidates
+        self._finished: "deque[str]" = deque()
+        self._busy = 0
+        self._counters = {"submitted": 0, "rejected": 0, "completed": 0, "failed": 0}
+        self._wait_time = _TimingStats()
+        self._service_time = _TimingStats()
+
+    @property
+    def running(self) -> bool:
+        """Whether the workers have been started"""
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """Start the workers on the running event loop"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [
+            asyncio.get_running_loop().create_task(self._worker(index))
+            for index in range(self.workers)
+        ]
+        logger.info(f"Started {self.workers} analysis workers (queue size {self.max_queue})")
+
+    async def stop(self) -> None:
+        """Cancel the workers; queued jobs are abandoned"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        logger.info("Stopped analysis workers")
+
+    def submit(self, job: Callable[[], Awaitable[Any]]) -> Ticket:
+        """
+        Queue a job for execution.
+
+        Args:
+            job: Zero-argument coroutine function producing the result
+
+        Returns:
+            Ticket for polling the job status
+
+        Raises:
+            QueueFullError: If max_queue jobs are already waiting
+        """
+        if not self.running:
+            self.start()
+
+        ticket = Ticket(ticket_id=uuid.uuid4().hex, status="queued", submitted_at=time.monotonic())
+        try:
+            self._queue.put_nowait((ticket, job))
+        except asyncio.QueueFull:
+            self._counters["rejected"] += 1
+            raise QueueFullError(f"Analysis queue is full ({self.max_queue} jobs waiting)")
+
+        self._counters["submitted"] += 1
+        self._remember(ticket)
+        return ticket
+
+    def status(self, ticket_id: str) -> Optional[Ticket]:
+        """Return the ticket for ticket_id, or None if unknown or evicted"""
+        return self._tickets.get(ticket_id)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, worker utilization, and wait/service time statistics"""
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_capacity": self.max_queue,
+            "workers": self.workers,
+            "busy_workers": self._busy,
+            **self._counters,
+            "wait_time": self._wait_time.summary(),
+            "service_time": self._service_time.summary(),
+        }
+
+    def _remember(self, ticket: Ticket) -> None:
+        self._tickets[ticket.ticket_id] = ticket
+        self._evict()
+
+    def _evict(self) -> None:
+        # Unfinished tickets are at most max_queue + workers <= max_tickets,
+        # so finished ones can always make room
+        while len(self._tickets) > self.max_tickets and self._finished:
+            del self._tickets[self._finished.popleft()]
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            ticket, job = await self._queue.get()
+            self._busy += 1
+            ticket.status = "running"
+            ticket.started_at = time.monotonic()
+            self._wait_time.observe(ticket.started_at - ticket.submitted_at)
+            try:
+                ticket.result = await job()
+                ticket.status = "completed"
+                self._counters["completed"] += 1
+            except asyncio.CancelledError:
+                ticket.status = "failed"
+                ticket.error = "Worker pool stopped"
+                raise
+            except Exception as e:
+                logger.error(f"Worker {index}: analysis {ticket.ticket_id} failed: {str(e)}")
+                ticket.status = "failed"
+                ticket.error = str(e)
+                self._counters["failed"] += 1
+            finally:
+                ticket.finished_at = time.monotonic()
+                self._service_time.observe(ticket.finished_at - ticket.started_at)
+                self._finished.append(ticket.ticket_id)
+                self._evict()
+                self._busy -= 1
+                self._queue.task_done()
@@ -1,7 +1,35 @@
-"""RAG (Retrieval-Augmented Generation) module for knowledge enhancement"""
+"""
+RAG (Retrieval-Augmented Generation) module for knowledge enhancement
+
+Submodules are imported on first attribute access (PEP 562) so that
+importing the package does not load embedding or vector store clients.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from rag.vectorstore import VectorStore
+    from rag.retriever import Retriever
+    from rag.reasoning_agent import ReasoningAgent
+
+_LAZY_ATTRIBUTES = {
+    "VectorStore": "rag.vectorstore",
+    "Retriever": "rag.retriever",
+    "ReasoningAgent": "rag.reasoning_agent",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
 
-from rag.vectorstore import VectorStore
-from rag.retriever import Retriever
-from rag.reasoning_agent import ReasoningAgent
 
 __all__ = ["VectorStore", "Retriever", "ReasoningAgent"]
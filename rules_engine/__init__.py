@@ -1,7 +1,14 @@
 """Rules engine for policy-based optimization"""
 
+from typing import Dict
 from rules_engine.partition_rules import PartitionRules
 from rules_engine.spark_config_rules import SparkConfigRules
 from rules_engine.skew_rules import SkewRules
 
-__all__ = ["PartitionRules", "SparkConfigRules", "SkewRules"]
+
+def rules_versions() -> Dict[str, str]:
+    """Version of every rule set, keyed by rule class name"""
+    return {rules.__name__: rules.VERSION for rules in (PartitionRules, SparkConfigRules, SkewRules)}
+
+
+__all__ = ["PartitionRules", "SparkConfigRules", "SkewRules", "rules_versions"]
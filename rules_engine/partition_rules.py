@@ -7,6 +7,8 @@ logger = logging.getLogger(__name__)
 class PartitionRules:
     """Rules for partition optimization"""
     
+    VERSION = "1.0.0"
+    
     @staticmethod
     def check_optimal_partition_count(partition_count: int, row_count: int) -> tuple:
         """
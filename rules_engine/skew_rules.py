@@ -1,30 +1,50 @@
 """Rules for handling data skew"""
 
 import logging
+from rules_engine.skew_statistics import SkewStatistics, skew_statistics
 
 logger = logging.getLogger(__name__)
 
 class SkewRules:
     """Rules for detecting and handling data skew"""
     
+    VERSION = "1.1.0"
+    
+    # Largest-to-median partition ratio from which a stage counts as skewed
+    # (spark.sql.adaptive.skewJoin.skewedPartitionFactor)
+    SKEW_FACTOR = 5.0
+    
     @staticmethod
     def detect_skew(partition_sizes: list) -> float:
         """
         Detect data skew ratio
         
         Args:
-            partition_sizes: List of partition sizes
+            partition_sizes: List or array of partition sizes
             
         Returns:
             Skew ratio (0-1)
         """
-        if not partition_sizes:
+        if len(partition_sizes) == 0:
             return 0.0
         
-        avg_size = sum(partition_sizes) / len(partition_sizes)
-        max_size = max(partition_sizes)
+        return skew_statistics(partition_sizes, top_k=0).skew_ratio
+    
+    @staticmethod
+    def is_skewed(stats: SkewStatistics) -> bool:
+        """
+        Check whether a stage is skewed
+        
+        Like Spark's adaptive skew join, a stage is skewed when its largest
+        partition is SKEW_FACTOR times the median partition.
         
-        return (max_size - avg_size) / max_size if max_size > 0 else 0.0
+        Args:
+            stats: Skew statistics of the stage
+            
+        Returns:
+            True if the stage is skewed
+        """
+        return stats.count > 1 and stats.max_to_median >= SkewRules.SKEW_FACTOR
     
     @staticmethod
     def get_skew_mitigation_strategies(skew_ratio: float) -> list:
@@ -0,0 +1,122 @@
+"""Vectorized skew statistics over partition or task sizes"""
+
+from typing import Any, Dict, Mapping, NamedTuple, Tuple
+
+import numpy as np
+
+# Heaviest partitions reported per stage
+DEFAULT_TOP_K = 5
+
+
+class SkewStatistics(NamedTuple):
+    """Distribution of the partition (or task) sizes of one stage"""
+    count: int
+    total: float
+    mean: float
+    median: float
+    max: float
+    cv: float
+    gini: float
+    max_to_median: float
+    p99_to_p50: float
+    skew_ratio: float
+    top_partitions: Tuple[Tuple[int, float], ...]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-friendly form stored in the workflow state"""
+        stats = self._asdict()
+        stats["top_partitions"] = [list(partition) for partition in self.top_partitions]
+        return stats
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    """numerator / denominator, 1.0 for 0/0 and inf for x/0"""
+    if denominator > 0:
+        return numerator / denominator
+    return float("inf") if numerator > 0 else 1.0
+
+
+def _quantile(ordered: np.ndarray, q: float) -> float:
+    """Linear-interpolated quantile of an already sorted array (numpy's default method)"""
+    position = q * (len(ordered) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return float(ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower))
+
+
+def skew_statistics(sizes: Any, top_k: int = DEFAULT_TOP_K) -> SkewStatistics:
+    """
+    Compute the skew statistics of one stage.
+
+    The sizes are sorted once; every order statistic and the Gini
+    coefficient are read from the sorted array. The heaviest partitions
+    are selected with a linear-time partition of the original order, so
+    their indices refer to the input.
+
+    Args:
+        sizes: Sizes of the stage's partitions or tasks (bytes, records or
+            durations, as long as they share a unit)
+        top_k: Number of heaviest partitions to report
+
+    Returns:
+        SkewStatistics of the stage
+
+    Raises:
+        ValueError: If sizes is empty or contains negative values
+    """
+    values = np.asarray(sizes, dtype=np.float64).ravel()
+    count = len(values)
+    if count == 0:
+        raise ValueError("Cannot compute skew statistics without sizes")
+
+    ordered = np.sort(values)
+    if ordered[0] < 0:
+        raise ValueError("Partition sizes must be non-negative")
+
+    total = float(ordered.sum())
+    mean = total / count
+    maximum = float(ordered[-1])
+    median = _quantile(ordered, 0.5)
+    std = float(np.sqrt(np.mean(np.square(ordered - mean))))
+    # Gini from the sorted sizes: sum((2i - n - 1) * x_i) / (n * total), i = 1..n
+    ranks = np.arange(1 - count, count + 1, 2, dtype=np.float64)
+    gini = float(np.dot(ranks, ordered)) / (count * total) if total > 0 else 0.0
+
+    k = min(top_k, count)
+    heaviest = np.argpartition(values, count - k)[count - k:] if k else np.empty(0, dtype=np.int64)
+    heaviest = heaviest[np.argsort(-values[heaviest], kind="stable")]
+
+    return SkewStatistics(
+        count=count,
+        total=total,
+        mean=mean,
+        median=median,
+        max=maximum,
+        cv=std / mean if mean > 0 else 0.0,
+        gini=gini,
+        max_to_median=_ratio(maximum, median),
+        p99_to_p50=_ratio(_quantile(ordered, 0.99), median),
+        skew_ratio=(maximum - mean) / maximum if maximum > 0 else 0.0,
+        top_partitions=tuple((int(index), float(values[index])) for index in heaviest),
+    )
+
+
+def stage_skew_statistics(
+    stage_sizes: Mapping[str, Any],
+    top_k: int = DEFAULT_TOP_K
+) -> Dict[str, SkewStatistics]:
+    """
+    Compute skew statistics for every stage of a job.
+
+    Args:
+        stage_sizes: Partition or task sizes keyed by stage id
+        top_k: Number of heaviest partitions to report per stage
+
+    Returns:
+        SkewStatistics keyed by stage id; stages without sizes are omitted
+    """
+    return {
+        str(stage): skew_statistics(sizes, top_k)
+        for stage, sizes in stage_sizes.items()
+        if len(sizes)
+    }
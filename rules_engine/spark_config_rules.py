@@ -1,12 +1,20 @@
 """Rules for Spark configuration optimization"""
 
 import logging
+import math
 
 logger = logging.getLogger(__name__)
 
+# Shuffle bytes each reduce partition should hold (in the range of
+# spark.sql.adaptive.advisoryPartitionSizeInBytes)
+TARGET_PARTITION_BYTES = 128 * 1024 * 1024
+MAX_SHUFFLE_PARTITIONS = 10000
+
 class SparkConfigRules:
     """Rules for optimizing Spark configurations"""
     
+    VERSION = "1.1.0"
+    
     @staticmethod
     def check_executor_memory(data_size_gb: float) -> dict:
         """
@@ -26,17 +34,28 @@ class SparkConfigRules:
             return {"executor_memory": "32g", "executor_cores": 16}
     
     @staticmethod
-    def check_shuffle_partitions(row_count: int) -> int:
+    def check_shuffle_partitions(
+        shuffle_bytes: int,
+        spilled_bytes: int = 0,
+        target_partition_bytes: int = TARGET_PARTITION_BYTES
+    ) -> int:
         """
         Check recommended shuffle partitions
         
+        A stage that spilled did not fit its partitions in execution memory;
+        its in-memory (spilled) size is then used when it exceeds the
+        serialized shuffle size.
+        
         Args:
-            row_count: Total number of rows
+            shuffle_bytes: Shuffle bytes read by the largest shuffle stage
+            spilled_bytes: Bytes that stage spilled from memory
+            target_partition_bytes: Bytes each partition should hold
             
         Returns:
             Recommended shuffle partitions
         """
-        return max(100, min(10000, row_count // 100000))
+        data_bytes = max(shuffle_bytes, spilled_bytes)
+        return max(1, min(MAX_SHUFFLE_PARTITIONS, math.ceil(data_bytes / target_partition_bytes)))
     
     @staticmethod
     def check_broadcast_threshold(table_size_mb: int) -> dict:
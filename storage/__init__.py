@@ -3,5 +3,12 @@
 from storage.metadata_repository import MetadataRepository
 from storage.metrics_repository import MetricsRepository
 from storage.db_connection import DBConnection
+from storage.result_cache import ResultCache, create_result_cache
 
-__all__ = ["MetadataRepository", "MetricsRepository", "DBConnection"]
+__all__ = [
+    "MetadataRepository",
+    "MetricsRepository",
+    "DBConnection",
+    "ResultCache",
+    "create_result_cache"
+]
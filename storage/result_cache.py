@@ -0,0 +1,253 @@
+"""Content-addressed cache of job analysis results"""
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(value: Any) -> Any:
+    """Normalize a JSON-like value so equal metrics serialize identically"""
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def canonical_hash(payload: Dict[str, Any], version: str) -> str:
+    """
+    Hash a request payload together with the analysis version.
+
+    Key order and integral floats (1.0 vs 1) do not change the hash.
+
+    Args:
+        payload: JSON-like request content
+        version: Fingerprint of the agent and rule versions
+
+    Returns:
+        Hex digest identifying the analysis
+    """
+    canonical = json.dumps(
+        {"payload": _normalize(payload), "version": version},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class InMemoryCacheBackend:
+    """Process-local LRU cache with per-entry TTL"""
+
+    shared = False
+    # Exceptions that mean the backend is unavailable; none for local memory
+    errors: Tuple[type, ...] = ()
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_s: float = 3600,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the in-memory backend
+
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+            ttl_s: Seconds an entry stays valid
+            clock: Monotonic time source
+        """
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        self._entries[key] = (self._clock() + self.ttl_s, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class RedisCacheBackend:
+    """
+    Redis-backed cache shared between processes.
+
+    Entries expire through Redis TTLs; configure the server with
+    maxmemory-policy allkeys-lru for LRU eviction.
+    """
+
+    shared = True
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        ttl_s: float = 3600,
+        namespace: str = "spark-copilot:analysis",
+        client: Any = None
+    ):
+        """
+        Initialize the Redis backend
+
+        Args:
+            url: Redis connection URL
+            ttl_s: Seconds an entry stays valid
+            namespace: Prefix for cache keys
+            client: Optional pre-built asyncio Redis client
+        """
+        if client is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError as e:
+                raise ImportError("The redis cache backend requires the 'redis' package") from e
+            client = redis.Redis.from_url(url)
+        # Outages surface as RedisError or, from the socket, as OSError
+        try:
+            from redis.exceptions import RedisError
+            self.errors: Tuple[type, ...] = (RedisError, OSError)
+        except ImportError:
+            self.errors = (OSError,)
+        self._client = client
+        self.ttl_s = ttl_s
+        self.namespace = namespace
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = await self._client.get(self._key(key))
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        await self._client.set(self._key(key), json.dumps(value), ex=int(self.ttl_s))
+
+    async def clear(self) -> None:
+        async for key in self._client.scan_iter(match=f"{self.namespace}:*"):
+            await self._client.delete(key)
+
+
+class ResultCache:
+    """
+    Analysis result cache keyed on request metrics plus analysis version.
+
+    The agent and rule version fingerprint is part of every key, so results
+    produced by older agents or rules are never served. A process-local
+    backend is also emptied when the version changes to free the memory.
+    The cache is only an optimization: when the backend is unavailable,
+    lookups count as misses and stores are dropped.
+    """
+
+    def __init__(self, backend: Any):
+        """
+        Initialize the result cache
+
+        Args:
+            backend: InMemoryCacheBackend, RedisCacheBackend or compatible
+        """
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._version: Optional[str] = None
+
+    async def _check_version(self, version: str) -> None:
+        if version != self._version:
+            if self._version is not None and not self.backend.shared:
+                logger.info("Analysis version changed, clearing result cache")
+                await self.backend.clear()
+            self._version = version
+
+    async def get(self, payload: Dict[str, Any], version: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result.
+
+        Args:
+            payload: JSON-like request content the result depends on
+            version: Fingerprint of the agent and rule versions
+
+        Returns:
+            Cached result, or None on a miss
+        """
+        await self._check_version(version)
+        try:
+            value = await self.backend.get(canonical_hash(payload, version))
+        except getattr(self.backend, "errors", ()) as e:
+            logger.warning(f"Result cache lookup failed, treating as a miss: {str(e)}")
+            self.errors += 1
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, payload: Dict[str, Any], version: str, value: Dict[str, Any]) -> None:
+        """
+        Store a result.
+
+        Args:
+            payload: JSON-like request content the result depends on
+            version: Fingerprint of the agent and rule versions
+            value: JSON-serializable result
+        """
+        await self._check_version(version)
+        try:
+            await self.backend.set(canonical_hash(payload, version), value)
+        except getattr(self.backend, "errors", ()) as e:
+            logger.warning(f"Result cache store failed, result not cached: {str(e)}")
+            self.errors += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss and backend error counters"""
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+
+def create_result_cache(
+    backend: str,
+    max_entries: int = 10000,
+    ttl_s: float = 3600,
+    redis_url: str = "redis://localhost:6379/0"
+) -> Optional[ResultCache]:
+    """
+    Build the configured result cache.
+
+    Args:
+        backend: "memory", "redis" or "none"
+        max_entries: Entry limit of the in-memory backend
+        ttl_s: Seconds an entry stays valid
+        redis_url: Connection URL of the redis backend
+
+    Returns:
+        ResultCache, or None when caching is disabled
+    """
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return ResultCache(InMemoryCacheBackend(max_entries=max_entries, ttl_s=ttl_s))
+    if backend == "redis":
+        return ResultCache(RedisCacheBackend(url=redis_url, ttl_s=ttl_s))
+    raise ValueError(f"Unknown result cache backend: {backend}")
@@ -17,7 +17,7 @@ async def test_langgraph_integration():
     try:
         # Test 1: Import state model
         print("✓ Testing state model import...")
-        from orchestration.state_model import create_agent_state, AgentState
+        from orchestration.state_model import create_agent_state, apply_update, AgentState
         print("  └─ AgentState imported successfully")
         
         # Test 2: Create initial state
@@ -31,6 +31,7 @@ async def test_langgraph_integration():
             execution_time_ms=3000,
             cpu_utilization=0.65,
             memory_used_mb=1024,
+            stage_partition_sizes={"3": [120, 110, 130, 2400]},
         )
         print(f"  └─ State created with {len(initial_state)} fields")
         print(f"  └─ Initial recommendations: {initial_state['recommendations']}")
@@ -50,28 +51,28 @@ async def test_langgraph_integration():
         print("✓ Testing individual agent execution...")
         
         # Test metadata agent
-        state = await metadata_agent(initial_state.copy())
+        state = apply_update(initial_state, await metadata_agent(initial_state))
         print(f"  └─ metadata_agent: Added schema_info = {bool(state.get('schema_info'))}")
         
         # Test partition agent
-        state = await partition_agent(state)
+        state = apply_update(state, await partition_agent(state))
         print(f"  └─ partition_agent: Partition strategy = {state.get('partition_strategy')}")
         print(f"    Recommendations count: {len(state['recommendations'])}")
         
         # Test runtime agent
-        state = await runtime_agent(state)
+        state = apply_update(state, await runtime_agent(state))
         print(f"  └─ runtime_agent: Issues detected = {len(state['issues_detected'])}")
         
         # Test skew agent
-        state = await skew_agent(state)
-        print(f"  └─ skew_agent: Skewed columns = {state.get('skewed_columns')}")
+        state = apply_update(state, await skew_agent(state))
+        print(f"  └─ skew_agent: Stages analyzed = {list(state.get('skew_statistics', {}))}")
         
         # Test delta agent
-        state = await delta_agent(state)
+        state = apply_update(state, await delta_agent(state))
         print(f"  └─ delta_agent: Recommendations now = {len(state['recommendations'])}")
         
         # Test cost agent
-        state = await cost_agent(state)
+        state = apply_update(state, await cost_agent(state))
         print(f"  └─ cost_agent: Final recommendations = {len(state['recommendations'])}")
         
         # Test 5: Import graph builder
@@ -0,0 +1,195 @@
+"""Test suite for vectorized batch analysis"""
+
+import numpy as np
+import pytest
+from agents import create_default_agents
+from orchestration import batch_runner
+from orchestration.batch_runner import BATCH_AGENTS, run_batch
+from orchestration.graph_builder import AGENT_PREDICATES
+from orchestration.job_batch import BatchUpdate, JobBatch
+from orchestration.state_model import apply_update, create_agent_state
+
+
+def _states(count=2000, seed=3):
+    rng = np.random.default_rng(seed)
+    # Mix random values with every threshold boundary
+    partitions = rng.choice([0, 1, 9, 10, 500, 1000, 1001, 5000], count)
+    runtimes = rng.choice([0, 59999, 60000, 60001, 3600000], count)
+    cpus = rng.choice([0.0, 0.49, 0.5, 0.7, 0.95, 0.96, 1.0], count)
+    memory = rng.choice([0, 8191, 8192, 8193, 65536], count)
+    return [
+        create_agent_state(
+            job_id=f"job_{i}",
+            job_name="Batch",
+            source_type="parquet",
+            partition_count=int(p),
+            execution_time_ms=int(r),
+            cpu_utilization=float(c),
+            memory_used_mb=int(m),
+        )
+        for i, (p, r, c, m) in enumerate(zip(partitions, runtimes, cpus, memory))
+    ]
+
+
+async def _per_job(state):
+    agents = create_default_agents()
+    update = {"recommendations": [], "issues_detected": []}
+    for name, _ in BATCH_AGENTS:
+        predicate = AGENT_PREDICATES.get(name)
+        if predicate is None or predicate(state):
+            update = apply_update(update, await agents[name](state))
+    return update
+
+
+@pytest.mark.asyncio
+async def test_batch_matches_per_job_agents():
+    """Test that vectorized thresholds scatter the same findings per job"""
+    states = _states()
+    
+    results = run_batch(JobBatch.from_states(states))
+    
+    assert results == [await _per_job(state) for state in states]
+
+
+@pytest.mark.asyncio
+async def test_batch_matches_per_job_agents_with_partition_sizes():
+    """Test that jobs with per-stage partition sizes get their own skew findings"""
+    states = _states(count=50)
+    for i, state in enumerate(states[::3]):
+        state["stage_partition_sizes"] = {"1": [10, 12, 11, 10 + 10 * i]}
+    
+    results = run_batch(JobBatch.from_states(states))
+    
+    assert results == [await _per_job(state) for state in states]
+    assert any("skew_statistics" in result for result in results)
+
+
+@pytest.mark.asyncio
+async def test_batch_matches_per_job_agents_with_stage_runtime():
+    """Test that jobs with a stage runtime or plan analysis get their own runtime findings"""
+    states = _states(count=20)
+    for state in states[1::3]:
+        state["plan_analysis"] = {
+            "broadcast_joins": [{"execution_id": 2, "join": "SortMergeJoin [a#1], [b#2], Inner",
+                                 "smaller_side_bytes": 3 * 1024 ** 2, "larger_side_bytes": 10 ** 10,
+                                 "broadcast_threshold": "3mb"}],
+            "repeated_scans": [{"execution_id": 2, "relation": "orders", "scans": 2}],
+            "removable_exchanges": [],
+        }
+    for i, state in enumerate(states[::4]):
+        state["stage_runtime"] = {
+            "critical_path": {"stages": [0, 1], "duration_ms": 9000 + i, "span_ms": 9000 + i},
+            "stragglers": {"1": {"stage_id": 1, "tasks": 8, "median_ms": 1000.0, "p90_ms": 1500.0,
+                                 "threshold_ms": 2000.0, "stragglers": 1, "max_ms": 6000,
+                                 "slowest_task_id": 7, "excess_ms": 5000}},
+        }
+    
+    results = run_batch(JobBatch.from_states(states))
+    
+    assert results == [await _per_job(state) for state in states]
+
+
+@pytest.mark.asyncio
+async def test_batch_matches_per_job_agents_with_executor_timeline():
+    """Test that jobs with an executor timeline use its utilization and idle findings"""
+    states = _states(count=20)
+    for i, state in enumerate(states[::3]):
+        state["executor_timeline"] = {
+            "slot_ms": 80_000.0, "slot_utilization": 0.1 * i, "executor_ms": 20_000.0,
+            "idle_executor_ms": 4000.0 * i, "idle_core_ms": 16_000.0 * i,
+        }
+    
+    results = run_batch(JobBatch.from_states(states))
+    
+    assert results == [await _per_job(state) for state in states]
+
+
+@pytest.mark.asyncio
+async def test_batch_matches_per_job_agents_with_shuffle_analysis():
+    """Test that jobs with a shuffle analysis get their own partition findings and routing"""
+    states = _states(count=30)
+    for i, state in enumerate(states[::2]):
+        state["shuffle_analysis"] = {
+            "stages": {"1": {"stage_id": 1, "partitions": 200, "shuffle_read_bytes": 10 ** 9 * (i + 1),
+                             "disk_spilled_bytes": 10 ** 8 * (i % 2), "memory_spilled_bytes": 10 ** 9,
+                             "fetch_wait_share": 0.1 * (i % 3)}},
+            "recommended_shuffle_partitions": 8 * (i + 1),
+            "sizing_stage": "1",
+        }
+    
+    results = run_batch(JobBatch.from_states(states))
+    
+    assert results == [await _per_job(state) for state in states]
+
+
+def test_batch_keeps_combinations_apart_past_int64(monkeypatch):
+    """Test jobs whose agent codes span more than 2**63 combinations"""
+    templates = 2 ** 16
+    # Codes whose mixed-radix key (radix templates + 1, -1 shifted to 0)
+    # is exactly 2**64, the same int64 as a job no agent ran for
+    digits, rest = [], 2 ** 64
+    for _ in range(4):
+        rest, digit = divmod(rest, templates + 1)
+        digits.insert(0, digit)
+    wrapped = [digit - 1 for digit in digits]
+    
+    def agent(index):
+        def run(batch):
+            codes = np.array([-1, wrapped[index]], dtype=np.int64)
+            return BatchUpdate(codes=codes, templates=[
+                {"recommendations": [f"agent {index} template {code}"], "issues_detected": []}
+                for code in range(templates)
+            ])
+        return (f"agent_{index}", run)
+    
+    monkeypatch.setattr(batch_runner, "BATCH_AGENTS", tuple(agent(index) for index in range(4)))
+    monkeypatch.setattr(batch_runner, "BATCH_PREDICATES", {})
+    states = _states(count=2)
+    
+    results = run_batch(JobBatch.from_states(states))
+    
+    assert results[0]["recommendations"] == []
+    assert results[1]["recommendations"] == [
+        f"agent {index} template {code}" for index, code in enumerate(wrapped) if code >= 0
+    ]
+
+
+@pytest.mark.parametrize("templates", [4, 200])
+def test_distinct_combinations_group_jobs_by_codes(templates):
+    """Test that both the dense and the sorted grouping match np.unique"""
+    rng = np.random.default_rng(5)
+    codes = [rng.integers(-1, templates, 1000) for _ in range(3)]
+    
+    representatives, inverse = batch_runner._distinct_combinations(codes)
+    
+    rows = np.stack(codes, axis=1)
+    unique, expected = np.unique(rows, axis=0, return_inverse=True)
+    assert len(representatives) == len(unique)
+    assert (rows[representatives][inverse] == rows).all()
+    assert len(set(zip(inverse.tolist(), expected.ravel().tolist()))) == len(unique)
+
+
+def test_batch_results_do_not_share_lists():
+    """Test that jobs with the same findings get independent lists"""
+    results = run_batch(JobBatch.from_states(_states(count=10)))
+    
+    results[0]["recommendations"].append("edited")
+    
+    assert all("edited" not in result["recommendations"] for result in results[1:])
+
+
+def test_job_batch_validates_column_lengths():
+    """Test that every column must have one value per job"""
+    with pytest.raises(ValueError):
+        JobBatch(
+            job_ids=["a", "b"],
+            execution_time_ms=np.zeros(2),
+            cpu_utilization=np.zeros(2),
+            memory_used_mb=np.zeros(1),
+            partition_count=np.zeros(2, dtype=np.int64),
+        )
+
+
+def test_empty_batch():
+    """Test that an empty batch yields no results"""
+    assert run_batch(JobBatch.from_states([])) == []
@@ -0,0 +1,131 @@
+"""Test suite for bulk job analysis"""
+
+import asyncio
+import json
+import pytest
+from fastapi.testclient import TestClient
+from orchestration.concurrency import map_unordered
+
+
+@pytest.mark.asyncio
+async def test_map_unordered_bounds_concurrency():
+    """Test that no more than limit calls run at once"""
+    running = 0
+    peak = 0
+    
+    async def work(item):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+        return item
+    
+    results = [r async for r in map_unordered(work, range(100), limit=8)]
+    
+    assert sorted(results) == list(range(100))
+    assert peak == 8
+
+
+@pytest.mark.asyncio
+async def test_map_unordered_yields_in_completion_order():
+    """Test that fast items are not held back by slow ones"""
+    async def work(delay):
+        await asyncio.sleep(delay)
+        return delay
+    
+    results = [r async for r in map_unordered(work, [0.05, 0.0, 0.01], limit=3)]
+    
+    assert results == [0.0, 0.01, 0.05]
+
+
+@pytest.mark.asyncio
+async def test_map_unordered_pulls_items_lazily():
+    """Test that items are consumed only as slots free up"""
+    pulled = []
+    
+    def items():
+        for i in range(1000):
+            pulled.append(i)
+            yield i
+    
+    async def work(item):
+        return item
+    
+    stream = map_unordered(work, items(), limit=4)
+    await stream.__anext__()
+    await stream.aclose()
+    
+    assert len(pulled) <= 5
+
+
+def test_analyze_jobs_streams_ndjson():
+    """Test that the bulk endpoint returns one NDJSON line per job"""
+    from app.main import app
+    
+    jobs = [
+        {"job_id": f"job_{i}", "job_name": "Nightly", "metrics": {"execution_time_ms": 90000}}
+        for i in range(20)
+    ]
+    client = TestClient(app)
+    response = client.post(
+        "/api/v1/analyze/jobs?concurrency=4",
+        content="".join(json.dumps(job) + "\n" for job in jobs),
+        headers={"content-type": "application/x-ndjson"}
+    )
+    
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert sorted(line["job_id"] for line in lines) == sorted(job["job_id"] for job in jobs)
+    assert all(line["recommendations"] for line in lines)
+
+
+@pytest.mark.asyncio
+async def test_analyze_jobs_reads_body_as_slots_free_up(monkeypatch):
+    """Test that only a bounded number of jobs are parsed ahead of their results"""
+    from app import api_routes
+    from app.main import app
+    
+    pulled = 0
+    finished = 0
+    peak_ahead = 0
+    
+    async def run_analysis(job, graph, cache=None, flight=None):
+        nonlocal finished, peak_ahead
+        peak_ahead = max(peak_ahead, pulled - finished)
+        await asyncio.sleep(0.001)
+        finished += 1
+        return api_routes.JobAnalysisResponse(
+            job_id=job.job_id, recommendations=[], optimization_score=0.0, estimated_savings={}
+        )
+    
+    monkeypatch.setattr(api_routes, "_run_analysis", run_analysis)
+    total = 200
+    
+    async def receive():
+        nonlocal pulled
+        if pulled == total:
+            await asyncio.sleep(3600)
+            return {"type": "http.disconnect"}
+        pulled += 1
+        line = json.dumps({"job_id": f"job_{pulled}", "job_name": "Nightly", "metrics": {}}) + "\n"
+        return {"type": "http.request", "body": line.encode(), "more_body": pulled < total}
+    
+    lines = []
+    
+    async def send(message):
+        if message["type"] == "http.response.body":
+            lines.extend(line for line in message.get("body", b"").decode().splitlines() if line)
+    
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": "/api/v1/analyze/jobs", "raw_path": b"/api/v1/analyze/jobs",
+        "root_path": "", "query_string": b"concurrency=4", "client": ("test", 1), "server": ("test", 80),
+        "headers": [(b"content-type", b"application/x-ndjson"), (b"host", b"test")],
+    }
+    await asyncio.wait_for(app(scope, receive, send), timeout=10)
+    
+    assert len(lines) == total
+    assert finished == total
+    assert peak_ahead <= 4 + 1
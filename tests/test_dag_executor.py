@@ -0,0 +1,86 @@
+"""Test suite for the pure-asyncio graph backend"""
+
+import asyncio
+import pytest
+from agents import create_default_agents
+from orchestration.dag_executor import InvalidUpdateError, state_reducers
+from orchestration.graph_builder import SparkIntelligenceGraph, build_spark_optimization_graph
+from orchestration.state_model import AgentState, create_agent_state, merge_findings
+
+JOBS = [
+    dict(source_type="delta", partition_count=5, execution_time_ms=90000,
+         cpu_utilization=0.3, memory_used_mb=9000),
+    dict(source_type="parquet", partition_count=0, execution_time_ms=1000),
+    dict(source_type="delta", partition_count=2000, cpu_utilization=0.95),
+]
+
+
+def _final(result):
+    return {k: v for k, v in result.items() if k not in ("created_at", "updated_at")}
+
+
+def test_reducers_are_read_from_the_state_schema():
+    """Test that Annotated reducers on AgentState are picked up"""
+    reducers = state_reducers(AgentState)
+    
+    assert reducers == {"recommendations": merge_findings, "issues_detected": merge_findings}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("topology", ["sequential", "fan_out"])
+@pytest.mark.parametrize("job", JOBS)
+async def test_asyncio_backend_matches_langgraph(topology, job):
+    """Test that both backends produce the same final state"""
+    results = {}
+    for backend in ("langgraph", "asyncio"):
+        graph = build_spark_optimization_graph(create_default_agents(), topology=topology, backend=backend)
+        state = create_agent_state(job_id="job_1", job_name="Backends", **job)
+        results[backend] = _final(await graph.run(state))
+    
+    assert results["asyncio"] == results["langgraph"]
+
+
+@pytest.mark.asyncio
+async def test_asyncio_backend_honours_deadlines():
+    """Test that node budgets apply to the asyncio backend"""
+    async def stuck_agent(state):
+        await asyncio.sleep(10)
+    
+    agents = create_default_agents()
+    agents["skew_agent"] = stuck_agent
+    graph = build_spark_optimization_graph(agents, backend="asyncio")
+    state = create_agent_state(job_id="job_1", job_name="Deadline", source_type="delta")
+    
+    result = await graph.run(state, deadline_s=0.2)
+    
+    timeouts = [i["node"] for i in result["issues_detected"] if i["type"] == "timeout"]
+    assert timeouts == ["skew_agent"]
+    assert any("cost savings" in r for r in result["recommendations"])
+
+
+@pytest.mark.asyncio
+async def test_parallel_writes_without_reducer_are_rejected():
+    """Test that two nodes in one step may not overwrite the same plain key"""
+    async def entry(state):
+        return {}
+    
+    async def left(state):
+        return {"partition_strategy": "left"}
+    
+    async def right(state):
+        return {"partition_strategy": "right"}
+    
+    graph = SparkIntelligenceGraph(backend="asyncio")
+    graph.add_node("entry", entry).add_node("left", left).add_node("right", right)
+    graph.set_entry_point("entry")
+    graph.add_edge("entry", "left").add_edge("entry", "right")
+    graph.set_finish_point("left").set_finish_point("right")
+    
+    with pytest.raises(InvalidUpdateError):
+        await graph.run(create_agent_state(job_id="job_1", job_name="Conflict", source_type="delta"))
+
+
+def test_unknown_backend_is_rejected():
+    """Test that only supported backends can be selected"""
+    with pytest.raises(ValueError):
+        SparkIntelligenceGraph(backend="threads")
@@ -0,0 +1,152 @@
+"""Test suite for incremental tailing of rolling event logs"""
+
+import gzip
+import json
+from connectors.event_log_tailer import EventLogTailer
+from connectors.spark_event_parser import SparkEventParser
+
+
+def _task_line(task_id):
+    return json.dumps({
+        "Event": "SparkListenerTaskEnd",
+        "Stage ID": task_id % 2,
+        "Stage Attempt ID": 0,
+        "Task End Reason": {"Reason": "Success"},
+        "Task Info": {"Task ID": task_id, "Executor ID": "1",
+                      "Launch Time": 1000 + task_id, "Finish Time": 1100 + task_id},
+        "Task Metrics": {"Shuffle Read Metrics": {"Remote Bytes Read": task_id}},
+    }) + "\n"
+
+
+def test_tailer_reads_only_new_complete_lines(tmp_path):
+    """Test that each poll consumes appended bytes up to the last complete line"""
+    log_dir = tmp_path / "eventlog_v2_app-1"
+    log_dir.mkdir()
+    (log_dir / "appstatus_app-1.inprogress").write_text("")
+    current = log_dir / "events_1_app-1"
+    partial = _task_line(2)
+    current.write_text(_task_line(0) + _task_line(1) + partial[:20])
+    
+    tailer = EventLogTailer(str(log_dir))
+    assert tailer.poll().tasks.tasks == 2
+    first_read = tailer.bytes_read
+    
+    with open(current, "a") as log:
+        log.write(partial[20:] + _task_line(3))
+    assert tailer.poll().tasks.tasks == 4
+    assert tailer.bytes_read == current.stat().st_size - first_read
+    
+    tailer.poll()
+    assert tailer.bytes_read == 0
+    assert tailer.aggregate.to_metrics() == SparkEventParser.parse_file(str(current)).to_metrics()
+
+
+def test_tailer_follows_rolled_files_and_resumes_from_checkpoint(tmp_path):
+    """Test rolled compressed files and a restart from the checkpoint"""
+    log_dir = tmp_path / "eventlog_v2_app-2"
+    log_dir.mkdir()
+    with gzip.open(log_dir / "events_1_app-2.gz", "wt") as rolled:
+        rolled.write(_task_line(0) + _task_line(1))
+    (log_dir / "events_2_app-2").write_text(_task_line(2))
+    checkpoint = str(tmp_path / "tailer.ckpt")
+    
+    assert EventLogTailer(str(log_dir), checkpoint).poll().tasks.tasks == 3
+    
+    with open(log_dir / "events_2_app-2", "a") as log:
+        log.write(_task_line(3))
+    (log_dir / "appstatus_app-2").write_text("")
+    resumed = EventLogTailer(str(log_dir), checkpoint)
+    assert resumed.poll().tasks.tasks == 4
+    assert resumed.bytes_read == len(_task_line(3))
+
+
+def test_tailer_reads_files_compacted_before_it_reached_them(tmp_path):
+    """Test that a compact file is read without the lines already delivered"""
+    log_dir = tmp_path / "eventlog_v2_app-4"
+    log_dir.mkdir()
+    (log_dir / "appstatus_app-4.inprogress").write_text("")
+    (log_dir / "events_1_app-4").write_text(_task_line(0) + _task_line(1))
+    (log_dir / "events_2_app-4").write_text(_task_line(2))
+    tailer = EventLogTailer(str(log_dir), str(tmp_path / "tailer.ckpt"))
+    assert tailer.poll().tasks.tasks == 3
+    
+    # Files 3 and 4 are written, then 1..3 are compacted before the next
+    # poll; compaction keeps the original lines of tasks 1, 2 and 3 only
+    (log_dir / "events_4_app-4").write_text(_task_line(5))
+    (log_dir / "events_3_app-4.compact").write_text(_task_line(1) + _task_line(2) + _task_line(3))
+    for index in (1, 2):
+        (log_dir / f"events_{index}_app-4").unlink()
+    resumed = EventLogTailer(str(log_dir), str(tmp_path / "tailer.ckpt"))
+    assert resumed.poll().tasks.tasks == 5
+    
+    # Once every file it replaces was read, a compact file is skipped
+    (log_dir / "appstatus_app-4.inprogress").rename(log_dir / "appstatus_app-4")
+    resumed.poll()
+    (log_dir / "events_4_app-4.compact").write_text(_task_line(1) + _task_line(5))
+    (log_dir / "events_3_app-4.compact").unlink()
+    (log_dir / "events_4_app-4").unlink()
+    assert resumed.poll().tasks.tasks == 5
+    assert resumed.bytes_read == 0
+
+
+def test_compact_file_keeps_repeated_identical_lines(tmp_path):
+    """Test that a delivered line is skipped once, not every identical copy"""
+    log_dir = tmp_path / "eventlog_v2_app-5"
+    log_dir.mkdir()
+    (log_dir / "appstatus_app-5.inprogress").write_text("")
+    (log_dir / "events_1_app-5").write_text(_task_line(0))
+    tailer = EventLogTailer(str(log_dir))
+    assert tailer.poll().tasks.tasks == 1
+    
+    # File 2 repeated file 1's line and was compacted before it was read
+    (log_dir / "events_3_app-5").write_text(_task_line(2))
+    (log_dir / "events_2_app-5.compact").write_text(_task_line(0) + _task_line(0) + _task_line(1))
+    (log_dir / "events_1_app-5").unlink()
+    
+    assert tailer.poll().tasks.tasks == 4
+
+
+def test_checkpoint_writes_only_new_fingerprints(tmp_path):
+    """Test that polls append fingerprints and compaction frees the replaced ones"""
+    log_dir = tmp_path / "eventlog_v2_app-6"
+    log_dir.mkdir()
+    (log_dir / "appstatus_app-6.inprogress").write_text("")
+    (log_dir / "events_1_app-6").write_text(_task_line(0) + _task_line(1))
+    (log_dir / "events_2_app-6").write_text(_task_line(2))
+    checkpoint = tmp_path / "tailer.ckpt"
+    tailer = EventLogTailer(str(log_dir), str(checkpoint))
+    tailer.poll()
+    
+    with open(log_dir / "events_2_app-6", "a") as log:
+        log.write(_task_line(3))
+    tailer.poll()
+    lines_dir = tmp_path / "tailer.ckpt.lines"
+    assert json.loads(checkpoint.read_text())["fingerprints"] == {
+        "1": ["1.1.u64", 2], "2": ["2.2.u64", 2],
+    }
+    assert sorted(f.stat().st_size for f in lines_dir.iterdir()) == [16, 16]
+    
+    # Compaction of the fully read file 1 keeps one of its lines
+    (log_dir / "events_1_app-6.compact").write_text(_task_line(1))
+    (log_dir / "events_1_app-6").unlink()
+    tailer.poll()
+    assert sorted(f.name for f in lines_dir.iterdir()) == ["1.3.u64", "2.2.u64"]
+    
+    resumed = EventLogTailer(str(log_dir), str(checkpoint))
+    assert sum(len(hashes) for chunks in resumed.delivered.values() for hashes in chunks) == 3
+    assert resumed.poll().to_metrics() == tailer.aggregate.to_metrics()
+    assert resumed.bytes_read == 0
+
+
+def test_tailer_follows_single_file_rename(tmp_path):
+    """Test that an .inprogress log keeps being read after Spark renames it"""
+    log = tmp_path / "app-3.inprogress"
+    log.write_text(_task_line(0))
+    tailer = EventLogTailer(str(log))
+    tailer.poll()
+    
+    log.rename(tmp_path / "app-3")
+    with open(tmp_path / "app-3", "a") as renamed:
+        renamed.write(_task_line(1))
+    assert tailer.poll().tasks.tasks == 2
+    assert tailer.bytes_read == len(_task_line(1))
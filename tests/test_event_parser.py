@@ -0,0 +1,144 @@
+"""Test suite for the streaming Spark event-log parser"""
+
+import gzip
+import json
+import numpy as np
+import pytest
+from connectors.event_log_aggregate import EXECUTOR_ADDED, TASK_END
+from connectors.quantile_sketch import QuantileSketch
+from connectors.spark_event_parser import SparkEventParser
+
+
+def _task_end(task_id, stage_id, duration, executor="1", reason="Success"):
+    return {
+        "Event": "SparkListenerTaskEnd",
+        "Stage ID": stage_id,
+        "Stage Attempt ID": 0,
+        "Task End Reason": {"Reason": reason},
+        "Task Info": {
+            "Task ID": task_id,
+            "Executor ID": executor,
+            "Launch Time": 1000 + task_id,
+            "Finish Time": 1000 + task_id + duration,
+        },
+        "Task Executor Metrics": {"JVMHeapMemory": (100 + task_id) * 1024 * 1024},
+        "Task Metrics": {
+            "Executor Run Time": duration,
+            "Executor CPU Time": duration * 500000,
+            "JVM GC Time": 2,
+            "Memory Bytes Spilled": 10,
+            "Disk Bytes Spilled": 5,
+            "Shuffle Read Metrics": {"Remote Bytes Read": 100, "Local Bytes Read": 20},
+            "Shuffle Write Metrics": {"Shuffle Bytes Written": 50},
+        },
+    }
+
+
+def _events():
+    yield {"Event": "SparkListenerExecutorAdded", "Timestamp": 900, "Executor ID": "1",
+           "Executor Info": {"Host": "worker-1", "Total Cores": 4}}
+    for task_id in range(20):
+        yield {"Event": "SparkListenerTaskStart", "Stage ID": task_id % 2}
+        yield _task_end(task_id, task_id % 2, 10 * (task_id + 1), reason="Success" if task_id else "ExceptionFailure")
+    yield {"Event": "SparkListenerStageCompleted",
+           "Stage Info": {"Stage ID": 1, "Stage Attempt ID": 0, "Stage Name": "count", "Number of Tasks": 10}}
+    yield {"Event": "org.apache.spark.sql.execution.ui.SparkListenerSQLExecutionStart", "executionId": 0, "time": 950}
+    yield {"Event": "org.apache.spark.sql.execution.ui.SparkListenerSQLExecutionEnd", "executionId": 0, "time": 1450}
+
+
+def _write_log(path, codec=None):
+    data = "".join(json.dumps(event) + "\n" for event in _events()).encode()
+    if codec == "gzip":
+        data = gzip.compress(data)
+    elif codec == "zstd":
+        zstandard = pytest.importorskip("zstandard")
+        data = zstandard.ZstdCompressor().compress(data)
+    path.write_bytes(data)
+    return str(path)
+
+
+@pytest.mark.parametrize("codec", [None, "gzip", "zstd"])
+def test_parse_file_aggregates_task_stage_executor_and_sql_metrics(tmp_path, codec):
+    """Test that every codec yields the same real metrics"""
+    aggregate = SparkEventParser.parse_file(_write_log(tmp_path / "eventlog", codec))
+    metrics = aggregate.to_metrics()
+    
+    assert metrics["total_tasks"] == 20
+    assert metrics["failed_tasks"] == 1
+    assert metrics["successful_tasks"] == 19
+    assert metrics["total_time_ms"] == sum(10 * (i + 1) for i in range(20))
+    assert metrics["execution_time_ms"] == (1000 + 19 + 200) - 1000
+    assert metrics["cpu_utilization"] == pytest.approx(0.5)
+    assert metrics["memory_used_mb"] == 119
+    assert metrics["shuffle_read_bytes"] == 20 * 120
+    assert metrics["sql_executions"] == 1
+    assert aggregate.stages[(1, 0)].name == "count"
+    assert aggregate.stages[(1, 0)].tasks == 10
+    assert aggregate.executors["1"].cores == 4
+    assert aggregate.executors["1"].tasks == 20
+    assert aggregate.events == 24  # TaskStart events are filtered out
+
+
+def test_event_type_filter_and_malformed_lines():
+    """Test that unwanted types are skipped and malformed lines are counted"""
+    lines = [json.dumps(event).encode() for event in _events()] + [b'{"Event":"SparkListenerTaskEnd", "Sta']
+    
+    aggregate = SparkEventParser.aggregate_lines(lines, event_types={TASK_END})
+    
+    assert aggregate.tasks.tasks == 20
+    assert aggregate.executors["1"].cores is None
+    assert aggregate.sql_executions == 0
+    assert aggregate.malformed_lines == 1
+    assert [e["Event"] for e in SparkEventParser.iter_events(lines, {EXECUTOR_ADDED})] == [EXECUTOR_ADDED]
+
+
+def test_extract_metrics_from_parsed_events():
+    """Test the in-memory entry point"""
+    metrics = SparkEventParser.extract_metrics(list(_events()))
+    
+    assert metrics["total_tasks"] == 20
+    assert metrics["failed_tasks"] == 1
+
+
+def test_quantile_sketch_accuracy_and_merge():
+    """Test relative error bounds and that merged sketches equal one sketch"""
+    values = np.random.default_rng(5).lognormal(5, 2, 20000).round().astype(int)
+    whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for index, value in enumerate(values.tolist()):
+        whole.add(value)
+        (left if index % 3 else right).add(value)
+    
+    left.merge(right)
+    
+    assert left == whole
+    for q in (0.5, 0.9, 0.99):
+        expected = np.quantile(values, q, method="lower")
+        assert whole.quantile(q) == pytest.approx(expected, rel=0.011)
+
+
+def test_split_ranges_align_to_lines(tmp_path):
+    """Test that ranges cover the log and start at line beginnings"""
+    path = _write_log(tmp_path / "eventlog")
+    data = open(path, "rb").read()
+    
+    ranges = SparkEventParser.split_ranges(path, 7)
+    
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+    assert all(data[start - 1:start] == b"\n" for start, _ in ranges[1:])
+
+
+def test_parallel_parse_equals_serial_parse(tmp_path):
+    """Test that merged range aggregates equal the serial aggregate exactly"""
+    path = _write_log(tmp_path / "eventlog")
+    
+    serial = SparkEventParser.parse_file(path)
+    parallel = SparkEventParser.parse_file_parallel(path, workers=3)
+    ranges = SparkEventParser.split_ranges(path, 11)
+    merged = SparkEventParser.parse_range(path, *ranges[0])
+    for start, end in ranges[1:]:
+        merged.merge(SparkEventParser.parse_range(path, start, end))
+    
+    assert parallel == serial
+    assert merged == serial
+    assert merged.sql_open_starts == {} and merged.sql_executions == 1
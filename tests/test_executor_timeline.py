@@ -0,0 +1,84 @@
+"""Test suite for executor timeline reconstruction"""
+
+import numpy as np
+import pytest
+from agents.cost_agent import cost_agent
+from analysis.executor_timeline import build_timeline, executor_timeline_summary
+from connectors.event_log_aggregate import EventLogAggregate
+from connectors.task_table import TASK_DTYPE, TaskTable
+from orchestration.state_model import create_agent_state
+
+
+def _aggregate(executors):
+    aggregate = EventLogAggregate()
+    for executor_id, (added, removed, cores) in executors.items():
+        aggregate.add_event({"Event": "SparkListenerExecutorAdded", "Executor ID": executor_id,
+                             "Timestamp": added, "Executor Info": {"Total Cores": cores}})
+        if removed is not None:
+            aggregate.add_event({"Event": "SparkListenerExecutorRemoved", "Executor ID": executor_id,
+                                 "Timestamp": removed})
+    return aggregate
+
+
+def _tasks(executor_codes, launches, durations):
+    tasks = np.zeros(len(launches), dtype=TASK_DTYPE)
+    tasks["executor"] = executor_codes
+    tasks["launch_time_ms"] = launches
+    tasks["duration_ms"] = durations
+    return tasks
+
+
+def test_timeline_matches_a_millisecond_scan():
+    """Test the sweep line against counting slots and tasks at every millisecond"""
+    rng = np.random.default_rng(5)
+    aggregate = _aggregate({"1": (0, 4000, 4), "2": (500, None, 2), "3": (1000, 2500, 4)})
+    codes = rng.integers(0, 3, 300)
+    # Tasks run within their executor's lifetime
+    launches = rng.integers(np.array([0, 500, 1000])[codes], np.array([3800, 3800, 2300])[codes])
+    durations = rng.integers(1, 200, 300)
+    timeline = build_timeline(aggregate, TaskTable(tasks=_tasks(codes, launches, durations),
+                                                   executors=["1", "2", "3"]))
+    summary = timeline.summary()
+    
+    end = max(4000, int((launches + durations).max()))
+    clock = np.arange(end)
+    slots = sum(cores * ((clock >= added) & (clock < (removed if removed is not None else end)))
+                for added, removed, cores in [(0, 4000, 4), (500, None, 2), (1000, 2500, 4)])
+    running = ((clock[:, None] >= launches) & (clock[:, None] < launches + durations))
+    busy = running.sum(axis=1)
+    assert summary["slot_ms"] == slots.sum()
+    assert summary["busy_slot_ms"] == np.minimum(busy, slots).sum()
+    assert summary["peak_busy_slots"] == busy.max()
+    for code in range(3):
+        assert timeline.busy_ms[code] == running[:, codes == code].any(axis=1).sum()
+
+
+def test_busy_time_survives_missing_launch_times():
+    """Test that a launch time of 0 next to epoch times does not mix up executors"""
+    epoch_ms = 3_000_000_000_000
+    table = TaskTable(tasks=_tasks([0, 0, 1, 1], [0, epoch_ms, 0, epoch_ms + 100], [1000, 500, 300, 50]),
+                      executors=["1", "2"])
+    
+    timeline = build_timeline(_aggregate({}), table)
+    
+    assert timeline.busy_ms.tolist() == [1500, 350]
+
+
+@pytest.mark.asyncio
+async def test_cost_agent_reports_idle_executors_from_the_timeline():
+    """Test that measured utilization and idle cost replace the reported utilization"""
+    aggregate = _aggregate({"1": (0, 10_000, 4), "2": (0, 10_000, 4)})
+    table = TaskTable(tasks=_tasks([0, 0], [0, 2000], [2000, 2000]), executors=["1", "2"])
+    timeline = executor_timeline_summary(aggregate, table)
+    
+    assert timeline["slot_utilization"] == pytest.approx(4000 / 80_000)
+    assert timeline["idle_executor_ms"] == 16_000
+    
+    state = create_agent_state("job", "Job", "parquet", execution_time_ms=10_000,
+                               cpu_utilization=0.9, executor_timeline=timeline)
+    update = await cost_agent(state)
+    
+    assert update["issues_detected"][0]["severity"] == "warning"
+    assert "80% of their lifetime" in update["issues_detected"][0]["description"]
+    assert any("dynamicAllocation" in recommendation for recommendation in update["recommendations"])
+    assert update["recommendations"][-1] == "Estimated cost savings: $0.01 (30%)"
@@ -0,0 +1,142 @@
+"""Test suite for the optimization graph topologies"""
+
+import asyncio
+import time
+import pytest
+from agents import create_default_agents
+from orchestration.graph_builder import build_spark_optimization_graph
+from orchestration.state_model import create_agent_state, merge_findings
+
+
+def _job_state():
+    return create_agent_state(
+        job_id="graph_job",
+        job_name="Graph Job",
+        source_type="delta",
+        table_name="events",
+        partition_count=5,
+        execution_time_ms=90000,
+        cpu_utilization=0.3,
+        memory_used_mb=9000,
+        stage_partition_sizes={"1": [100, 90, 110, 105], "2": [10, 12, 9, 11, 250]},
+    )
+
+
+def test_merge_findings_drops_duplicates():
+    """Test that the findings reducer keeps each entry once"""
+    issue = {"type": "skew", "severity": "warning", "description": "skewed"}
+    
+    merged = merge_findings(["a", "b"], ["b", "c", "c"])
+    issues = merge_findings([issue], [dict(issue)])
+    
+    assert merged == ["a", "b", "c"]
+    assert issues == [issue]
+
+
+@pytest.mark.asyncio
+async def test_fan_out_matches_sequential_findings():
+    """Test that parallel branches neither lose nor duplicate findings"""
+    sequential = build_spark_optimization_graph(create_default_agents(), topology="sequential")
+    fan_out = build_spark_optimization_graph(create_default_agents(), topology="fan_out")
+    
+    expected = await sequential.run(_job_state())
+    result = await fan_out.run(_job_state())
+    
+    assert sorted(result["recommendations"]) == sorted(expected["recommendations"])
+    assert len(result["recommendations"]) == len(set(result["recommendations"]))
+    assert len(result["issues_detected"]) == len(expected["issues_detected"])
+    assert result["partition_strategy"] == "under-partitioned"
+    assert sorted(result["skew_statistics"]) == ["1", "2"]
+    assert [issue["stage"] for issue in result["issues_detected"] if issue["type"] == "skew"] == ["2"]
+
+
+@pytest.mark.asyncio
+async def test_fan_out_runs_branches_concurrently():
+    """Test that every branch agent is running at the same time"""
+    branches = ["partition_agent", "runtime_agent", "skew_agent", "delta_agent"]
+    # Each branch waits until all of them have started; run one after
+    # another, the first would wait forever
+    barrier = asyncio.Barrier(len(branches))
+    
+    def meeting(agent):
+        async def branch_agent(state):
+            await asyncio.wait_for(barrier.wait(), timeout=5)
+            return await agent(state)
+        return branch_agent
+    
+    agents = create_default_agents()
+    agents.update({name: meeting(agents[name]) for name in branches})
+    graph = build_spark_optimization_graph(agents, topology="fan_out")
+    
+    result = await graph.run(_job_state())
+    
+    assert barrier.n_waiting == 0
+    assert result["partition_strategy"] == "under-partitioned"
+    assert not [issue for issue in result["issues_detected"] if issue.get("type") == "timeout"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("topology", ["sequential", "fan_out"])
+async def test_routing_skips_irrelevant_agents(topology):
+    """Test that parquet jobs without partition info skip delta and partition agents"""
+    graph = build_spark_optimization_graph(create_default_agents(), topology=topology)
+    state = create_agent_state(
+        job_id="parquet_job",
+        job_name="Parquet Job",
+        source_type="parquet",
+        partition_count=0,
+        execution_time_ms=90000,
+    )
+    
+    result = await graph.run(state)
+    
+    assert result["skipped_nodes"] == ["partition_agent", "delta_agent"]
+    assert result["partition_strategy"] is None
+    assert not any("Delta Lake" in r for r in result["recommendations"])
+    assert any("cost savings" in r for r in result["recommendations"])
+
+
+@pytest.mark.asyncio
+async def test_routing_runs_every_relevant_agent():
+    """Test that a partitioned delta job runs every agent"""
+    graph = build_spark_optimization_graph(create_default_agents())
+    
+    result = await graph.run(_job_state())
+    
+    assert result["skipped_nodes"] == []
+    assert any("Delta Lake" in r for r in result["recommendations"])
+
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_slow_node_and_keeps_partial_results():
+    """Test that a node over its budget is cancelled and recorded as an issue"""
+    async def stuck_agent(state):
+        await asyncio.sleep(10)
+        return {"recommendations": ["never produced"]}
+    
+    agents = create_default_agents()
+    agents["runtime_agent"] = stuck_agent
+    graph = build_spark_optimization_graph(agents)
+    
+    start = time.perf_counter()
+    result = await graph.run(_job_state(), deadline_s=0.2)
+    elapsed = time.perf_counter() - start
+    
+    timeouts = [i for i in result["issues_detected"] if i["type"] == "timeout"]
+    assert elapsed < 0.5
+    assert [i["node"] for i in timeouts] == ["runtime_agent"]
+    assert "never produced" not in result["recommendations"]
+    assert any("Delta Lake" in r for r in result["recommendations"])
+    assert any("cost savings" in r for r in result["recommendations"])
+
+
+@pytest.mark.asyncio
+async def test_deadline_does_not_affect_fast_runs():
+    """Test that a generous deadline leaves results unchanged"""
+    graph = build_spark_optimization_graph(create_default_agents())
+    
+    unbounded = await graph.run(_job_state())
+    bounded = await graph.run(_job_state(), deadline_s=5)
+    
+    assert bounded["recommendations"] == unbounded["recommendations"]
+    assert not any(i["type"] == "timeout" for i in bounded["issues_detected"])
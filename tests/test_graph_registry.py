@@ -0,0 +1,77 @@
+"""Test suite for the compiled graph registry"""
+
+import threading
+import pytest
+from agents import create_default_agents
+from orchestration.graph_builder import build_spark_optimization_graph
+from orchestration.graph_registry import GraphRegistry
+from orchestration.state_model import create_agent_state
+
+
+@pytest.fixture
+def registry():
+    """Create a registry with the default agents"""
+    registry = GraphRegistry()
+    registry.register_agents(create_default_agents())
+    return registry
+
+
+def test_registry_reuses_compiled_graph(registry):
+    """Test that repeated lookups return the same compiled graph"""
+    graph = registry.get()
+    
+    assert graph.compiled_graph is not None
+    assert registry.get() is graph
+
+
+def test_registry_invalidates_on_reregistration(registry):
+    """Test that re-registering agents drops cached graphs"""
+    graph = registry.get()
+    registry.register_agents(create_default_agents())
+    
+    assert registry.get() is not graph
+
+
+def test_registry_rejects_unknown_topology(registry):
+    """Test that unknown topologies are reported"""
+    with pytest.raises(ValueError):
+        registry.get("unknown")
+
+
+def test_registry_builds_once_under_concurrency():
+    """Test that concurrent lookups compile the graph only once"""
+    builds = []
+    
+    def counting_builder(agents, topology, backend):
+        builds.append(topology)
+        return build_spark_optimization_graph(agents, topology=topology, backend=backend)
+    
+    registry = GraphRegistry(builder=counting_builder)
+    registry.register_agents(create_default_agents())
+    graphs = []
+    threads = [threading.Thread(target=lambda: graphs.append(registry.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(builds) == 1
+    assert all(graph is graphs[0] for graph in graphs)
+
+
+@pytest.mark.asyncio
+async def test_registry_graph_runs_requests(registry):
+    """Test that the shared graph serves a request"""
+    state = create_agent_state(
+        job_id="registry_job",
+        job_name="Registry Job",
+        source_type="parquet",
+        partition_count=100,
+        execution_time_ms=120000,
+        cpu_utilization=0.4,
+    )
+    
+    result = await registry.get().run(state)
+    
+    assert result["job_id"] == "registry_job"
+    assert len(result["recommendations"]) > 0
@@ -0,0 +1,77 @@
+"""Test suite for latency metrics"""
+
+import statistics
+import time
+import pytest
+from fastapi.testclient import TestClient
+from agents import create_default_agents
+from orchestration.graph_builder import SparkIntelligenceGraph, build_spark_optimization_graph
+from orchestration.state_model import create_agent_state
+
+
+@pytest.mark.asyncio
+async def test_node_hooks_time_every_executed_agent():
+    """Test that hooks observe each executed node with its outcome"""
+    observed = []
+    graph = build_spark_optimization_graph(create_default_agents())
+    graph.add_node_hook(lambda node, seconds, outcome: observed.append((node, seconds, outcome)))
+    
+    state = create_agent_state(job_id="job_1", job_name="Hooks", source_type="delta", partition_count=5)
+    await graph.run(state)
+    
+    assert sorted(node for node, _, _ in observed) == sorted(create_default_agents())
+    assert all(seconds >= 0 and outcome == "ok" for _, seconds, outcome in observed)
+
+
+def test_metrics_endpoint_exposes_agent_and_request_latency():
+    """Test that /metrics reports per-agent and per-route histograms"""
+    from app.main import app
+    
+    client = TestClient(app)
+    client.post(
+        "/api/v1/analyze/job",
+        json={"job_id": "job_1", "job_name": "Nightly", "metrics": {"partition_count": 4}}
+    )
+    body = client.get("/metrics").text
+    
+    assert 'spark_copilot_agent_duration_seconds_count{agent="metadata_agent",outcome="ok"}' in body
+    assert 'route="/api/v1/analyze/job"' in body
+    assert "spark_copilot_analysis_executions_total" in body
+    assert "spark_copilot_worker_queue_depth" in body
+
+
+def test_agent_observation_overhead_is_small():
+    """Test that recording one agent execution costs well under 20us"""
+    from app.metrics import observe_agent
+    
+    calls = 20000
+    start = time.perf_counter()
+    for i in range(calls):
+        observe_agent("metadata_agent", 0.001, "ok")
+    per_call = (time.perf_counter() - start) / calls
+    
+    assert per_call < 20e-6
+
+
+@pytest.mark.asyncio
+async def test_agent_metrics_stay_within_overhead_budget():
+    """Test that the metrics hook adds under 10us to each agent execution"""
+    from app.metrics import observe_agent
+    
+    async def noop_agent(state):
+        return {}
+    
+    async def per_call(graph):
+        node = graph._timed("metadata_agent", noop_agent)
+        batches = []
+        for _ in range(15):
+            start = time.perf_counter()
+            for _ in range(2000):
+                await node({})
+            batches.append((time.perf_counter() - start) / 2000)
+        return statistics.median(batches)
+    
+    plain = await per_call(SparkIntelligenceGraph())
+    hooked = await per_call(SparkIntelligenceGraph().add_node_hook(observe_agent))
+    
+    assert hooked - plain < 10e-6
@@ -0,0 +1,122 @@
+"""Test suite for per-node memoization"""
+
+import time
+import numpy as np
+import pytest
+from agents import create_default_agents
+from orchestration.graph_builder import build_spark_optimization_graph
+from orchestration.node_memo import NodeMemo, fingerprint
+from orchestration.state_model import create_agent_state
+
+
+def _state(**overrides):
+    values = dict(
+        job_id="memo_job",
+        job_name="Memo Job",
+        source_type="delta",
+        table_name="events",
+        partition_count=5,
+        execution_time_ms=90000,
+        cpu_utilization=0.3,
+        memory_used_mb=9000,
+    )
+    values.update(overrides)
+    return create_agent_state(**values)
+
+
+def _final(result):
+    return {k: v for k, v in result.items() if k not in ("created_at", "updated_at")}
+
+
+def test_fingerprint_ignores_dict_order_and_distinguishes_types():
+    """Test that equal values fingerprint equally and 1 differs from True"""
+    assert fingerprint({"a": [1, 2], "b": None}) == fingerprint({"b": None, "a": [1, 2]})
+    assert fingerprint(1) != fingerprint(True)
+    with pytest.raises(TypeError):
+        fingerprint(object())
+
+
+def test_fingerprint_hashes_long_numeric_sequences_by_value():
+    """Test that long numeric sequences fingerprint by value, dtype and shape"""
+    sizes = list(range(1000))
+    changed = sizes[:-1] + [0]
+    
+    assert fingerprint({"1": sizes}) == fingerprint({"1": list(sizes)})
+    assert fingerprint({"1": sizes}) != fingerprint({"1": changed})
+    assert fingerprint(sizes) != fingerprint([float(size) for size in sizes])
+    assert fingerprint(sizes) == fingerprint(np.arange(1000))
+    assert fingerprint(["a"] * 1000) != fingerprint(["b"] * 1000)
+
+
+@pytest.mark.asyncio
+async def test_fingerprinting_large_inputs_costs_less_than_the_agent():
+    """Test that the memo key of 1M partition sizes is cheaper than the skew analysis"""
+    skew_agent = create_default_agents()["skew_agent"]
+    sizes = np.random.default_rng(0).integers(1, 1000, 1_000_000).tolist()
+    state = _state(stage_partition_sizes={"1": sizes})
+    memo = NodeMemo(skew_agent.reads)
+    
+    key_s, agent_s = [], []
+    for _ in range(3):
+        start = time.perf_counter()
+        memo.key(state)
+        key_s.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        await skew_agent(state)
+        agent_s.append(time.perf_counter() - start)
+    
+    assert min(key_s) < min(agent_s)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["langgraph", "asyncio"])
+async def test_only_nodes_with_changed_inputs_rerun(backend):
+    """Test that changing one metric re-runs only the agents that read it"""
+    graph = build_spark_optimization_graph(create_default_agents(), backend=backend)
+    await graph.run(_state())
+    
+    result = await graph.run(_state(execution_time_ms=1000))
+    
+    stats = graph.memo_stats()
+    rerun = sorted(name for name, counts in stats.items() if counts["misses"] == 2)
+    assert rerun == ["cost_agent", "runtime_agent"]
+    assert all(counts["hits"] == 1 for name, counts in stats.items() if name not in rerun)
+    
+    fresh = build_spark_optimization_graph(create_default_agents(), backend=backend)
+    assert _final(result) == _final(await fresh.run(_state(execution_time_ms=1000)))
+
+
+@pytest.mark.asyncio
+async def test_memo_is_bounded_lru():
+    """Test that the least recently used inputs are evicted first"""
+    calls = []
+    
+    async def agent(state):
+        calls.append(state["partition_count"])
+        return {"recommendations": [f"count {state['partition_count']}"]}
+    
+    node = NodeMemo(reads=("partition_count",), max_entries=2).wrap(agent)
+    for count in (1, 2, 1, 3, 1, 2):
+        await node(_state(partition_count=count))
+    
+    # 2 was evicted by 3 because 1 was used more recently
+    assert calls == [1, 2, 3, 2]
+
+
+@pytest.mark.asyncio
+async def test_unfingerprintable_inputs_and_errors_are_not_cached():
+    """Test that opaque inputs bypass the memo and error updates are not reused"""
+    memo = NodeMemo(reads=("schema_info",))
+    runs = []
+    
+    async def agent(state):
+        runs.append(1)
+        return {"issues_detected": [{"type": "metadata", "severity": "error", "description": "x"}]}
+    
+    node = memo.wrap(agent)
+    await node({"schema_info": {"columns": object()}})
+    await node({"schema_info": {"columns": []}})
+    await node({"schema_info": {"columns": []}})
+    
+    assert len(runs) == 3
+    assert memo.stats() == {"hits": 0, "misses": 2, "bypassed": 1, "entries": 0}
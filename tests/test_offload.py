@@ -0,0 +1,95 @@
+"""Test suite for the CPU offload pool"""
+
+import asyncio
+import time
+import httpx
+import pytest
+from orchestration.offload import CPUOffloadPool
+
+
+def _spin(seconds):
+    """Hold the CPU (and the GIL) for the given time"""
+    end = time.perf_counter() + seconds
+    count = 0
+    while time.perf_counter() < end:
+        count += 1
+    return count
+
+
+def _fail():
+    raise ValueError("bad input")
+
+
+@pytest.mark.asyncio
+async def test_offload_pool_returns_results_and_counts_saturation():
+    """Test that results come back from worker processes and saturation is counted"""
+    pool = CPUOffloadPool(kind="process", workers=1)
+    
+    results = await asyncio.gather(*(pool.run(_spin, 0.01) for _ in range(3)))
+    
+    assert all(count > 0 for count in results)
+    metrics = pool.metrics()
+    assert metrics["completed"] == 3
+    assert metrics["saturated"] == 2
+    assert metrics["in_flight"] == 0
+    assert metrics["service_time"]["count"] == 3
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_offload_pool_propagates_errors():
+    """Test that an exception raised in the worker reaches the caller"""
+    pool = CPUOffloadPool(kind="thread", workers=1)
+    
+    with pytest.raises(ValueError, match="bad input"):
+        await pool.run(_fail)
+    
+    assert pool.metrics()["failed"] == 1
+    await pool.stop()
+
+
+async def _health_checks_during(client, work):
+    """Count /health answers the event loop completes while work runs"""
+    served = 0
+    
+    async def probe():
+        nonlocal served
+        while True:
+            response = await client.get("/health")
+            assert response.status_code == 200
+            served += 1
+            await asyncio.sleep(0.005)
+    
+    prober = asyncio.ensure_future(probe())
+    await asyncio.sleep(0.02)  # let the probes get going
+    try:
+        before = served
+        await work()
+        return served - before
+    finally:
+        prober.cancel()
+
+
+@pytest.mark.asyncio
+async def test_health_checks_keep_being_served_while_offloaded_work_runs():
+    """Test that /health keeps answering while heavy sections run off the loop"""
+    from app.main import app
+    
+    pool = CPUOffloadPool(kind="process", workers=2)
+    await pool.run(_spin, 0)  # fork the workers before measuring
+    
+    async def offloaded_work():
+        await asyncio.gather(*(pool.run(_spin, 0.3) for _ in range(4)))
+    
+    async def inline_work():
+        _spin(0.3)  # the same work run on the loop
+    
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        offloaded = await _health_checks_during(client, offloaded_work)
+        blocked = await _health_checks_during(client, inline_work)
+    await pool.stop()
+    
+    # The loop answers probes for as long as the workers are busy, but not
+    # a single one while the work holds it
+    assert offloaded >= 10
+    assert blocked == 0
@@ -0,0 +1,140 @@
+"""Test suite for the physical-plan analyzer"""
+
+import json
+import logging
+import time
+import pytest
+from agents.runtime_agent import runtime_agent
+from analysis.physical_plan import compile_plan, plan_analysis
+from orchestration.state_model import create_agent_state
+
+MB = 1024 ** 2
+
+
+def _node(name, children=(), simple=None, size_metric=None, location=None):
+    node = {"nodeName": name, "simpleString": simple or name, "children": list(children), "metadata": {},
+            "metrics": [{"name": "number of output rows", "accumulatorId": 1000, "metricType": "sum"}]}
+    if size_metric is not None:
+        node["metrics"].append({"name": "data size", "accumulatorId": size_metric, "metricType": "size"})
+    if location is not None:
+        node["metadata"]["Location"] = location
+    return node
+
+
+def _exchange(keys, size_metric, child):
+    return _node("Exchange", [child], simple=f"Exchange hashpartitioning({keys}, 200), ENSURE_REQUIREMENTS, "
+                                             f"[plan_id=1]", size_metric=size_metric)
+
+
+def _stage(stage_id, attempt, customers_bytes):
+    return {"Event": "SparkListenerStageCompleted", "Stage Info": {
+        "Stage ID": stage_id, "Stage Attempt ID": attempt, "Accumulables": [
+            {"ID": 11, "Name": "data size", "Value": 6000 * MB},
+            {"ID": 12, "Name": "data size", "Value": str(customers_bytes)},
+        ]}}
+
+
+def _log(tmp_path, stages=None):
+    orders = _node("Scan parquet orders", location="InMemoryFileIndex[s3://lake/orders]")
+    customers = _node("Scan parquet customers", location="InMemoryFileIndex[s3://lake/customers]")
+    join = _node("SortMergeJoin", [
+        _node("Sort", [_exchange("customer_id#1", 11, orders)]),
+        _node("Sort", [_exchange("id#2", 12, customers)]),
+    ], simple="SortMergeJoin [customer_id#1], [id#2], Inner")
+    # orders is scanned again, and shuffled twice in a row
+    reshuffled = _exchange("region#3", 13, _node("Project", [_exchange("customer_id#1", 14, orders)]))
+    plan = _node("Union", [join, reshuffled])
+    events = [
+        {"Event": "org.apache.spark.sql.execution.ui.SparkListenerSQLExecutionStart",
+         "executionId": 4, "time": 0, "sparkPlanInfo": plan},
+        {"Event": "SparkListenerTaskEnd", "Stage ID": 0},
+    ] + (stages or [_stage(0, 0, 30 * MB)])
+    path = tmp_path / "eventlog"
+    path.write_text("".join(json.dumps(event) + "\n" for event in events))
+    return str(path)
+
+
+def test_plan_analysis_finds_joins_scans_and_exchanges(tmp_path):
+    """Test the three findings on a small plan with metric values from the stages"""
+    findings = plan_analysis(_log(tmp_path))
+    
+    [join] = findings["broadcast_joins"]
+    assert join["execution_id"] == 4
+    assert join["smaller_side_bytes"] == 30 * MB
+    assert join["larger_side_bytes"] == 6000 * MB
+    assert join["broadcast_threshold"] == "30mb"
+    assert findings["repeated_scans"] == [
+        {"execution_id": 4, "relation": "InMemoryFileIndex[s3://lake/orders]", "scans": 2}
+    ]
+    [exchange] = findings["removable_exchanges"]
+    assert exchange["exchange"] == "hashpartitioning(customer_id#1, 200)"
+
+
+def test_plan_analysis_keeps_final_accumulator_values_of_retried_stages(tmp_path):
+    """Test that repeated cumulative accumulator values are not added up"""
+    # The first attempt failed part way; the retry and a later stage reading
+    # the same exchange report the same running totals again
+    stages = [_stage(0, 0, 18 * MB), _stage(0, 1, 30 * MB), _stage(1, 0, 30 * MB)]
+    
+    [join] = plan_analysis(_log(tmp_path, stages))["broadcast_joins"]
+    
+    assert join["smaller_side_bytes"] == 30 * MB
+    assert join["larger_side_bytes"] == 6000 * MB
+
+
+def test_compile_plan_is_linear_on_deep_plans():
+    """Test a plan tens of thousands of nodes deep without recursion"""
+    plan = _node("Scan parquet events", location="events")
+    for depth in range(50_000):
+        plan = _node("Filter" if depth % 2 else "Project", [plan])
+    
+    start = time.perf_counter()
+    compiled = compile_plan(plan)
+    elapsed = time.perf_counter() - start
+    
+    assert len(compiled.parents) == 50_001
+    assert compiled.parents[-1] == 49_999
+    assert elapsed < 1.0
+
+
+def test_plan_analysis_decodes_plans_deeper_than_the_json_depth_limit(tmp_path, caplog):
+    """Test a left-deep chain of 2000 joins read from an actual event log"""
+    joins = 2000
+    # json.dumps recurses too, so the nested plan is written as text
+    def shuffled_scan(table):
+        return json.dumps(_node("Sort", [_exchange(f"k#{table}", table, _node(
+            "Scan parquet", location=f"InMemoryFileIndex[s3://lake/t{table % 100}]"
+        ))]))
+    
+    left, right = json.dumps(_node("SortMergeJoin", ["LEFT", "RIGHT"])).split('"LEFT"')
+    plan = left * joins + shuffled_scan(0) + "".join(
+        right.replace('"RIGHT"', shuffled_scan(table)) for table in range(1, joins + 1)
+    )
+    start = {"Event": "org.apache.spark.sql.execution.ui.SparkListenerSQLExecutionStart",
+             "executionId": 7, "time": 0, "sparkPlanInfo": "PLAN"}
+    stage = {"Event": "SparkListenerStageCompleted", "Stage Info": {"Stage ID": 0, "Accumulables": [
+        {"ID": table, "Name": "data size", "Value": 10 * MB} for table in range(joins + 1)
+    ]}}
+    path = tmp_path / "eventlog"
+    path.write_text(json.dumps(start).replace('"PLAN"', plan) + "\n" + json.dumps(stage) + "\n")
+    
+    with caplog.at_level(logging.WARNING):
+        findings = plan_analysis(str(path))
+    
+    assert findings["malformed_lines"] == 0
+    assert len(findings["broadcast_joins"]) == joins
+    assert len(findings["repeated_scans"]) == 100
+    assert not caplog.records
+
+
+@pytest.mark.asyncio
+async def test_runtime_agent_reports_plan_findings(tmp_path):
+    """Test that plan findings become join, scan and exchange issues"""
+    state = create_agent_state("job", "Job", "parquet", plan_analysis=plan_analysis(_log(tmp_path)))
+    
+    update = await runtime_agent(state)
+    
+    types = [issue["type"] for issue in update["issues_detected"]]
+    assert types.count("join") == 1 and "scan" in types and "exchange" in types
+    assert any("autoBroadcastJoinThreshold=30mb" in recommendation
+               for recommendation in update["recommendations"])
@@ -0,0 +1,177 @@
+"""Test suite for the analysis result cache"""
+
+import fnmatch
+import pytest
+from fastapi.testclient import TestClient
+from redis import exceptions as redis_exceptions
+from storage.result_cache import (
+    InMemoryCacheBackend,
+    RedisCacheBackend,
+    ResultCache,
+    canonical_hash,
+)
+
+
+class FakeRedis:
+    """Minimal in-process stand-in for redis.asyncio.Redis"""
+    
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+    
+    async def get(self, key):
+        return self.data.get(key)
+    
+    async def set(self, key, value, ex=None):
+        self.data[key] = value.encode()
+        self.expiry[key] = ex
+    
+    async def delete(self, key):
+        self.data.pop(key, None)
+    
+    async def scan_iter(self, match):
+        for key in list(self.data):
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+
+class UnavailableRedis(FakeRedis):
+    """Fake client whose server cannot be reached"""
+    
+    async def get(self, key):
+        raise redis_exceptions.ConnectionError("Connection refused")
+    
+    async def set(self, key, value, ex=None):
+        raise redis_exceptions.ConnectionError("Connection refused")
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+def test_canonical_hash_ignores_key_order_and_integral_floats():
+    """Test that equivalent metrics hash identically"""
+    a = canonical_hash({"metrics": {"cpu_utilization": 0.5, "partition_count": 10}}, "v1")
+    b = canonical_hash({"metrics": {"partition_count": 10.0, "cpu_utilization": 0.5}}, "v1")
+    
+    assert a == b
+    assert a != canonical_hash({"metrics": {"partition_count": 11, "cpu_utilization": 0.5}}, "v1")
+    assert a != canonical_hash({"metrics": {"partition_count": 10, "cpu_utilization": 0.5}}, "v2")
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_least_recently_used():
+    """Test LRU eviction once max_entries is reached"""
+    backend = InMemoryCacheBackend(max_entries=2)
+    await backend.set("a", {"v": 1})
+    await backend.set("b", {"v": 2})
+    await backend.get("a")
+    await backend.set("c", {"v": 3})
+    
+    assert await backend.get("a") == {"v": 1}
+    assert await backend.get("b") is None
+    assert await backend.get("c") == {"v": 3}
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_expires_entries():
+    """Test that entries are dropped after their TTL"""
+    clock = FakeClock()
+    backend = InMemoryCacheBackend(ttl_s=10, clock=clock)
+    await backend.set("a", {"v": 1})
+    
+    clock.now = 9
+    assert await backend.get("a") == {"v": 1}
+    clock.now = 10
+    assert await backend.get("a") is None
+    assert len(backend) == 0
+
+
+@pytest.mark.asyncio
+async def test_version_change_invalidates_results():
+    """Test that a new agent/rule version misses and clears local entries"""
+    cache = ResultCache(InMemoryCacheBackend())
+    payload = {"metrics": {"execution_time_ms": 90000}}
+    await cache.set(payload, "v1", {"recommendations": ["old"]})
+    
+    assert await cache.get(payload, "v1") == {"recommendations": ["old"]}
+    assert await cache.get(payload, "v2") is None
+    assert len(cache.backend) == 0
+    assert cache.stats() == {"hits": 1, "misses": 1, "errors": 0}
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_round_trip():
+    """Test the redis backend against a fake client"""
+    client = FakeRedis()
+    cache = ResultCache(RedisCacheBackend(ttl_s=60, client=client))
+    payload = {"metrics": {"execution_time_ms": 90000}}
+    await cache.set(payload, "v1", {"recommendations": ["cached"]})
+    
+    assert await cache.get(payload, "v1") == {"recommendations": ["cached"]}
+    assert list(client.expiry.values()) == [60]
+    assert await cache.get(payload, "v2") is None
+    
+    await cache.backend.clear()
+    assert client.data == {}
+
+
+@pytest.mark.asyncio
+async def test_redis_outage_degrades_to_a_miss():
+    """Test that an unreachable redis server makes the analysis run uncached"""
+    from app.api_routes import JobAnalysisRequest, _run_analysis
+    from app.dependencies import init_graph_registry
+    
+    cache = ResultCache(RedisCacheBackend(client=UnavailableRedis()))
+    request = JobAnalysisRequest(job_id="job", job_name="Nightly", metrics={"execution_time_ms": 90000})
+    
+    response = await _run_analysis(request, init_graph_registry(), cache)
+    
+    assert response.recommendations
+    assert not response.cached
+    assert cache.stats() == {"hits": 0, "misses": 1, "errors": 2}
+
+
+@pytest.mark.asyncio
+async def test_results_with_agent_errors_are_not_cached():
+    """Test that a response reporting an agent error is run again next time"""
+    from agents import create_default_agents
+    from app.api_routes import JobAnalysisRequest, _run_analysis
+    from orchestration.graph_builder import build_spark_optimization_graph
+    
+    async def failing_cost_agent(state):
+        return {"issues_detected": [{"type": "cost", "severity": "error", "description": "pricing unavailable"}]}
+    
+    agents = create_default_agents()
+    agents["cost_agent"] = failing_cost_agent
+    graph = build_spark_optimization_graph(agents)
+    cache = ResultCache(InMemoryCacheBackend())
+    request = JobAnalysisRequest(job_id="job", job_name="Nightly", metrics={"execution_time_ms": 90000})
+    
+    first = await _run_analysis(request, graph, cache)
+    second = await _run_analysis(request, graph, cache)
+    
+    assert any(issue["severity"] == "error" for issue in first.issues_detected)
+    assert not second.cached
+    assert cache.stats() == {"hits": 0, "misses": 2, "errors": 0}
+
+
+def test_analyze_job_serves_repeated_metrics_from_cache():
+    """Test that a recurring job with identical metrics is served from cache"""
+    from app.main import app
+    
+    metrics = {"execution_time_ms": 90000, "cpu_utilization": 0.4}
+    client = TestClient(app)
+    first = client.post("/api/v1/analyze/job", json={"job_id": "run_1", "job_name": "Nightly", "metrics": metrics})
+    second = client.post("/api/v1/analyze/job", json={"job_id": "run_2", "job_name": "Nightly", "metrics": metrics})
+    
+    assert first.json()["cached"] is False
+    assert second.json()["cached"] is True
+    assert second.json()["job_id"] == "run_2"
+    assert second.json()["recommendations"] == first.json()["recommendations"]
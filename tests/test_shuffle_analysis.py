@@ -0,0 +1,77 @@
+"""Test suite for shuffle and spill analysis"""
+
+import json
+import pytest
+from agents.partition_agent import partition_agent
+from analysis.shuffle import shuffle_analysis
+from connectors.spark_event_parser import SparkEventParser
+from orchestration.state_model import create_agent_state
+from rules_engine.spark_config_rules import SparkConfigRules
+
+MB = 1024 ** 2
+
+
+def _task_end(task_id, stage_id, read_bytes=0, write_bytes=0, disk_spill=0, memory_spill=0, fetch_wait=0):
+    return {
+        "Event": "SparkListenerTaskEnd",
+        "Stage ID": stage_id,
+        "Stage Attempt ID": 0,
+        "Task End Reason": {"Reason": "Success"},
+        "Task Info": {"Task ID": task_id, "Executor ID": "1", "Launch Time": 0, "Finish Time": 1000},
+        "Task Metrics": {
+            "Executor Run Time": 1000,
+            "Memory Bytes Spilled": memory_spill,
+            "Disk Bytes Spilled": disk_spill,
+            "Shuffle Read Metrics": {"Remote Bytes Read": read_bytes, "Total Records Read": 10,
+                                     "Fetch Wait Time": fetch_wait},
+            "Shuffle Write Metrics": {"Shuffle Bytes Written": write_bytes, "Shuffle Records Written": 5},
+        },
+    }
+
+
+def _log(tmp_path):
+    # Stage 0 writes 8 GB of shuffle data that stage 1 reads in 8 partitions
+    events = [_task_end(task_id, 0, write_bytes=256 * MB) for task_id in range(32)]
+    events += [
+        _task_end(100 + task_id, 1, read_bytes=1024 * MB, disk_spill=300 * MB,
+                  memory_spill=2048 * MB, fetch_wait=400)
+        for task_id in range(8)
+    ]
+    path = tmp_path / "eventlog"
+    path.write_text("".join(json.dumps(event) + "\n" for event in events))
+    return str(path)
+
+
+def test_shuffle_partitions_are_sized_by_bytes():
+    """Test the bytes-per-partition rule, using the spilled size when it is larger"""
+    assert SparkConfigRules.check_shuffle_partitions(0) == 1
+    assert SparkConfigRules.check_shuffle_partitions(1000 * MB) == 8
+    assert SparkConfigRules.check_shuffle_partitions(1000 * MB, spilled_bytes=4000 * MB) == 32
+    assert SparkConfigRules.check_shuffle_partitions(10 ** 15) == 10000
+
+
+def test_shuffle_analysis_aggregates_stages_from_the_streaming_parser(tmp_path):
+    """Test per-stage shuffle totals and the recommendation from the aggregate alone"""
+    analysis = shuffle_analysis(SparkEventParser.parse_file(_log(tmp_path)))
+    
+    writer, reader = analysis["stages"]["0"], analysis["stages"]["1"]
+    assert writer["shuffle_write_bytes"] == 8192 * MB
+    assert writer["shuffle_write_records"] == 160
+    assert reader["shuffle_read_records"] == 80
+    assert reader["disk_spilled_bytes"] == 2400 * MB
+    assert reader["fetch_wait_share"] == pytest.approx(0.4)
+    assert analysis["sizing_stage"] == "1"
+    assert analysis["recommended_shuffle_partitions"] == 128
+
+
+@pytest.mark.asyncio
+async def test_partition_agent_recommends_shuffle_partitions(tmp_path):
+    """Test that jobs without a partition count are analyzed from their shuffle"""
+    analysis = shuffle_analysis(SparkEventParser.parse_file(_log(tmp_path)))
+    state = create_agent_state("job", "Job", "parquet", shuffle_analysis=analysis)
+    
+    update = await partition_agent(state)
+    
+    assert "partition_strategy" not in update
+    assert "Set spark.sql.shuffle.partitions to 128" in update["recommendations"]
+    assert {issue["type"] for issue in update["issues_detected"]} == {"partition", "spill", "shuffle"}
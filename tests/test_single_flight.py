@@ -0,0 +1,102 @@
+"""Test suite for coalescing identical concurrent analyses"""
+
+import asyncio
+import pytest
+from orchestration.concurrency import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_identical_calls_share_one_execution():
+    """Test that concurrent callers with the same key get one execution's result"""
+    flight = SingleFlight()
+    calls = 0
+    
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"call": calls}
+    
+    results = await asyncio.gather(*(flight.do("job_1", work) for _ in range(10)))
+    
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"executions": 1, "coalesced": 9, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_distinct_and_sequential_calls_are_not_coalesced():
+    """Test that different keys, and calls after completion, execute separately"""
+    flight = SingleFlight()
+    
+    async def work():
+        await asyncio.sleep(0)
+        return "done"
+    
+    await asyncio.gather(flight.do("a", work), flight.do("b", work))
+    await flight.do("a", work)
+    
+    assert flight.executions == 3
+    assert flight.coalesced == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_every_caller():
+    """Test that a failed execution raises in all coalesced callers"""
+    flight = SingleFlight()
+    
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+    
+    results = await asyncio.gather(
+        *(flight.do("job_1", work) for _ in range(3)), return_exceptions=True
+    )
+    
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.executions == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_execution():
+    """Test that remaining callers still get the result when one gives up"""
+    flight = SingleFlight()
+    
+    async def work():
+        await asyncio.sleep(0.02)
+        return "done"
+    
+    leader = asyncio.ensure_future(flight.do("job_1", work))
+    follower = asyncio.ensure_future(flight.do("job_1", work))
+    await asyncio.sleep(0)
+    leader.cancel()
+    
+    assert await follower == "done"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_run_graph_once():
+    """Test that identical job analyses are coalesced onto one workflow run"""
+    from app.api_routes import JobAnalysisRequest, _run_analysis
+    
+    runs = 0
+    
+    class SlowGraph:
+        async def run(self, state, deadline_s=None):
+            nonlocal runs
+            runs += 1
+            await asyncio.sleep(0.01)
+            return {"recommendations": ["Increase partitions"], "skipped_nodes": []}
+    
+    flight = SingleFlight()
+    request = JobAnalysisRequest(job_id="job_1", job_name="Nightly", metrics={"partition_count": 8})
+    other = JobAnalysisRequest(job_id="job_2", job_name="Nightly", metrics={"partition_count": 8})
+    
+    responses = await asyncio.gather(
+        *(_run_analysis(request, SlowGraph(), flight=flight) for _ in range(5)),
+        _run_analysis(other, SlowGraph(), flight=flight)
+    )
+    
+    assert runs == 2
+    assert [r.job_id for r in responses] == ["job_1"] * 5 + ["job_2"]
+    assert flight.coalesced == 4
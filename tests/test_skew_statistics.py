@@ -0,0 +1,82 @@
+"""Test suite for vectorized skew statistics"""
+
+import numpy as np
+import pytest
+from agents.skew_agent import OFFLOAD_MIN_SIZES, skew_agent
+from orchestration.offload import offload_pool
+from orchestration.state_model import create_agent_state
+from rules_engine.skew_rules import SkewRules
+from rules_engine.skew_statistics import skew_statistics, stage_skew_statistics
+
+
+def test_skew_statistics_match_reference_formulas():
+    """Test every statistic against a direct NumPy computation"""
+    sizes = np.random.default_rng(7).lognormal(10, 1.5, 10001)
+    ordered = np.sort(sizes)
+    n = len(sizes)
+    
+    stats = skew_statistics(sizes, top_k=3)
+    
+    median = np.median(sizes)
+    assert stats.median == pytest.approx(median)
+    assert stats.cv == pytest.approx(sizes.std() / sizes.mean())
+    assert stats.gini == pytest.approx(
+        2 * np.sum(np.arange(1, n + 1) * ordered) / (n * ordered.sum()) - (n + 1) / n
+    )
+    assert stats.max_to_median == pytest.approx(sizes.max() / median)
+    assert stats.p99_to_p50 == pytest.approx(np.percentile(sizes, 99) / median)
+    assert [index for index, _ in stats.top_partitions] == list(np.argsort(-sizes)[:3])
+    assert stats.skew_ratio == pytest.approx(SkewRules.detect_skew(list(sizes)))
+
+
+def test_uniform_sizes_are_not_skewed():
+    """Test the degenerate distributions"""
+    even = skew_statistics([64] * 100)
+    empty = skew_statistics([0, 0, 0])
+    
+    assert (even.cv, even.gini, even.max_to_median) == (0.0, 0.0, 1.0)
+    assert not SkewRules.is_skewed(even)
+    assert (empty.gini, empty.max_to_median) == (0.0, 1.0)
+    with pytest.raises(ValueError):
+        skew_statistics([])
+
+
+@pytest.mark.asyncio
+async def test_skew_agent_reports_skewed_stages_only():
+    """Test that only the stage with a heavy partition is reported"""
+    state = create_agent_state(
+        job_id="skew_job",
+        job_name="Skew",
+        source_type="parquet",
+        stage_partition_sizes={"4": [100, 95, 105, 110], "7": [100, 95, 105, 110, 2000]},
+    )
+    
+    update = await skew_agent(state)
+    
+    assert sorted(update["skew_statistics"]) == ["4", "7"]
+    assert [issue["stage"] for issue in update["issues_detected"]] == ["7"]
+    assert update["recommendations"][0].startswith("Stage 7: partitions [4, ")
+
+
+@pytest.mark.asyncio
+async def test_skew_agent_without_sizes_reports_nothing():
+    """Test that jobs without partition sizes get no skew findings"""
+    state = create_agent_state(job_id="plain", job_name="Plain", source_type="parquet")
+    
+    assert await skew_agent(state) == {"recommendations": [], "issues_detected": []}
+
+
+@pytest.mark.asyncio
+async def test_large_stages_are_offloaded():
+    """Test that statistics over many sizes run on the offload pool"""
+    sizes = np.random.default_rng(1).exponential(1.0, OFFLOAD_MIN_SIZES)
+    state = create_agent_state(
+        job_id="big", job_name="Big", source_type="parquet", stage_partition_sizes={"0": sizes}
+    )
+    completed = offload_pool.metrics()["completed"]
+    
+    update = await skew_agent(state)
+    
+    assert offload_pool.metrics()["completed"] == completed + 1
+    assert update["skew_statistics"]["0"] == stage_skew_statistics({"0": sizes})["0"].as_dict()
+    await offload_pool.stop()
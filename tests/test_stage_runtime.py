@@ -0,0 +1,121 @@
+"""Test suite for critical-path and straggler analysis"""
+
+import json
+import numpy as np
+import pytest
+from agents.runtime_agent import runtime_agent
+from analysis.executor_timeline import executor_timeline_of_log, executor_timeline_summary
+from analysis.stage_runtime import (
+    critical_path,
+    find_stragglers,
+    stage_runtime_analysis,
+    stage_runtime_of_log,
+    stage_spans,
+)
+from connectors.spark_event_parser import SparkEventParser
+from connectors.task_table import TASK_DTYPE, TaskTable, TaskTableBuilder, TaskTableCache
+from orchestration.state_model import create_agent_state
+
+
+def _stage_completed(stage_id, start, end, parents):
+    return {
+        "Event": "SparkListenerStageCompleted",
+        "Stage Info": {"Stage ID": stage_id, "Stage Attempt ID": 0, "Submission Time": start,
+                       "Completion Time": end, "Parent IDs": parents},
+    }
+
+
+def _task_end(task_id, stage_id, duration):
+    return {
+        "Event": "SparkListenerTaskEnd",
+        "Stage ID": stage_id,
+        "Stage Attempt ID": 0,
+        "Task End Reason": {"Reason": "Success"},
+        "Task Info": {"Task ID": task_id, "Executor ID": "1", "Launch Time": 0, "Finish Time": duration},
+    }
+
+
+def _log(tmp_path):
+    # Stages 0 and 1 run in parallel; 2 joins them, 3 runs after 2
+    events = [
+        _stage_completed(0, 0, 10_000, []),
+        _stage_completed(1, 0, 30_000, []),
+        _stage_completed(2, 30_000, 35_000, [0, 1]),
+        _stage_completed(3, 35_000, 80_000, [2]),
+    ]
+    durations = [2000] * 9 + [45_000]
+    events += [_task_end(task_id, 3, duration) for task_id, duration in enumerate(durations)]
+    events += [_task_end(100 + task_id, 0, 2000 + task_id) for task_id in range(10)]
+    path = tmp_path / "eventlog"
+    path.write_text("".join(json.dumps(event) + "\n" for event in events))
+    return str(path)
+
+
+def test_critical_path_follows_the_longest_chain_of_stages(tmp_path):
+    """Test that the path goes through the slower parent of a join"""
+    aggregate = SparkEventParser.parse_file(_log(tmp_path))
+    
+    path = critical_path(stage_spans(aggregate))
+    
+    assert path.stages == (1, 2, 3)
+    assert path.duration_ms == 80_000
+    assert path.span_ms == 80_000
+
+
+def test_stragglers_match_per_stage_numpy_quantiles():
+    """Test the vectorized per-stage medians and straggler counts on many stages"""
+    rng = np.random.default_rng(7)
+    tasks = np.zeros(20_000, dtype=TASK_DTYPE)
+    tasks["stage_id"] = rng.integers(0, 50, len(tasks))
+    tasks["task_id"] = np.arange(len(tasks))
+    tasks["duration_ms"] = rng.lognormal(8, 0.6, len(tasks)).astype(np.int64)
+    tasks["failed"] = rng.random(len(tasks)) < 0.01
+    
+    stragglers = find_stragglers(TaskTable(tasks=tasks, executors=["1"]))
+    
+    assert stragglers
+    for stage, stats in stragglers.items():
+        durations = tasks["duration_ms"][(tasks["stage_id"] == stage) & ~tasks["failed"]]
+        median = np.median(durations)
+        assert stats.median_ms == pytest.approx(median)
+        assert stats.p90_ms == pytest.approx(np.quantile(durations, 0.9))
+        assert stats.stragglers == np.count_nonzero(durations > max(1.5 * median, median + 1000))
+        assert stats.max_ms == durations.max()
+
+
+@pytest.mark.asyncio
+async def test_runtime_agent_reports_stragglers_on_the_critical_path(tmp_path):
+    """Test that the analysis of a log becomes runtime issues"""
+    log = _log(tmp_path)
+    builder = TaskTableBuilder()
+    aggregate = SparkEventParser.parse_file(log, task_sink=builder)
+    analysis = stage_runtime_analysis(aggregate, builder.build())
+    state = create_agent_state("job", "Job", "parquet", execution_time_ms=60_000,
+                               cpu_utilization=0.7, stage_runtime=analysis)
+    
+    update = await runtime_agent(state)
+    
+    stragglers = [issue for issue in update["issues_detected"] if issue["type"] == "straggler"]
+    assert [(issue["stage"], issue["severity"]) for issue in stragglers] == [("3", "warning")]
+    assert any(issue["type"] == "critical_path" for issue in update["issues_detected"])
+    assert any("spark.speculation" in recommendation for recommendation in update["recommendations"])
+    assert any("task 9" in recommendation for recommendation in update["recommendations"])
+
+
+def test_analyses_of_a_cached_log_do_not_parse_it_again(tmp_path, monkeypatch):
+    """Test that the aggregate is cached with the task table for later analyses"""
+    log = _log(tmp_path)
+    cache = TaskTableCache(str(tmp_path / "cache"))
+    builder = TaskTableBuilder()
+    aggregate = SparkEventParser.parse_file(log, task_sink=builder)
+    table = builder.build()
+    
+    first = stage_runtime_of_log(log, cache)
+    parses = []
+    monkeypatch.setattr(SparkEventParser, "parse_file", lambda *args, **kwargs: parses.append(args))
+    second = stage_runtime_of_log(log, cache)
+    timeline = executor_timeline_of_log(log, cache)
+    
+    assert parses == []
+    assert first == second == stage_runtime_analysis(aggregate, table)
+    assert timeline == executor_timeline_summary(aggregate, table)
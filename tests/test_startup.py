@@ -0,0 +1,47 @@
+"""Test suite for API process startup cost"""
+
+import json
+import subprocess
+import sys
+
+# Modules the API process must not pay for at import time
+HEAVY_MODULES = (
+    "torch",
+    "transformers",
+    "pandas",
+    "sklearn",
+    "langchain",
+    "pinecone",
+    "kafka",
+    "google.cloud",
+    "sqlalchemy",
+    "ml",
+    "rag",
+    "connectors.gcs_client",
+    "connectors.bigquery_client",
+)
+
+
+def _modules_loaded_by(statement: str):
+    code = f"import json, sys; {statement}; print(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return set(json.loads(result.stdout.splitlines()[-1]))
+
+
+def test_app_import_does_not_load_heavy_dependencies():
+    """Test that importing app.main leaves ML, RAG and cloud clients unloaded"""
+    loaded = _modules_loaded_by("import app.main")
+    
+    assert [name for name in HEAVY_MODULES if name in loaded] == []
+
+
+def test_lazy_packages_load_submodules_on_first_use():
+    """Test that package attributes are resolved only when accessed"""
+    loaded = _modules_loaded_by("import ml, rag, connectors")
+    assert "ml.model_training" not in loaded
+    assert "rag.vectorstore" not in loaded
+    assert "connectors.gcs_client" not in loaded
+    
+    loaded = _modules_loaded_by("from connectors import SparkEventParser")
+    assert "connectors.spark_event_parser" in loaded
+    assert "connectors.gcs_client" not in loaded
@@ -0,0 +1,110 @@
+"""Test suite for agent state updates and reducers"""
+
+import pytest
+from agents import create_default_agents
+from orchestration.graph_builder import build_spark_optimization_graph
+from orchestration.state_model import (
+    AgentUpdate,
+    attribute_findings,
+    create_agent_state,
+    merge_findings,
+)
+
+
+@pytest.fixture
+def test_state():
+    """Create a test state"""
+    return create_agent_state(
+        job_id="state_job",
+        job_name="State Job",
+        source_type="delta",
+        table_name="test_table",
+        partition_count=5,
+        execution_time_ms=120000,
+        cpu_utilization=0.3,
+        memory_used_mb=9000,
+    )
+
+
+@pytest.mark.asyncio
+async def test_agents_return_only_partial_updates(test_state):
+    """Test that agents emit their own keys and leave the input untouched"""
+    allowed = set(AgentUpdate.__annotations__)
+    
+    for agent in create_default_agents().values():
+        update = await agent(test_state)
+        
+        assert set(update) <= allowed
+        assert test_state["recommendations"] == []
+        assert test_state["issues_detected"] == []
+
+
+@pytest.mark.asyncio
+async def test_graph_does_not_duplicate_findings(test_state):
+    """Test that the workflow result holds each agent finding exactly once"""
+    graph = build_spark_optimization_graph(create_default_agents())
+    
+    result = await graph.run(test_state)
+    
+    assert result["recommendations"] == [
+        "Enable Delta Lake Z-ordering for faster scans",
+        "Run OPTIMIZE command to compact small files",
+        "Configure auto-compaction for WRITE operations",
+        "Increase partition count for better parallelism",
+        "Consider caching intermediate results",
+        "Enable adaptive query execution",
+        "CPU utilization is low - consider reducing executor count",
+        "High memory usage - consider data compression",
+        "Estimated cost savings: $16.90 (30%)",
+    ]
+    assert result["issues_detected"] == [
+        {"type": "runtime", "severity": "warning", "description": "Long execution time detected"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_graph_keeps_same_finding_from_two_agents(test_state):
+    """Test that an identical finding reported by two agents is kept for each"""
+    issue = {"type": "memory", "severity": "warning", "description": "spill"}
+    
+    async def spill_agent(state):
+        return {"recommendations": ["Increase executor memory"], "issues_detected": [dict(issue)]}
+    
+    agents = create_default_agents()
+    agents["runtime_agent"] = spill_agent
+    agents["cost_agent"] = spill_agent
+    graph = build_spark_optimization_graph(agents)
+    
+    result = await graph.run(test_state)
+    
+    assert result["recommendations"].count("Increase executor memory") == 2
+    assert result["issues_detected"] == [issue, issue]
+
+
+def test_merge_findings_keeps_index_across_steps():
+    """Test that chained merges dedupe against every earlier step"""
+    issue = {"type": "runtime", "severity": "warning", "description": "slow"}
+    
+    merged = merge_findings([], [issue])
+    merged = merge_findings(merged, ["Enable AQE"])
+    merged = merge_findings(merged, [dict(issue), "Enable AQE", "Cache results"])
+    
+    assert merged == [issue, "Enable AQE", "Cache results"]
+
+
+def test_merge_findings_handles_unhashable_values():
+    """Test that issues with nested values are still compared by content"""
+    issue = {"type": "skew", "columns": ["id"]}
+    
+    merged = merge_findings([issue], [{"type": "skew", "columns": ["id"]}])
+    
+    assert merged == [issue]
+
+
+def test_merge_findings_dedupes_per_source():
+    """Test that attributed findings dedupe within an agent but not across agents"""
+    merged = merge_findings([], attribute_findings({"recommendations": ["Enable AQE"]}, "a")["recommendations"])
+    merged = merge_findings(merged, attribute_findings({"recommendations": ["Enable AQE"]}, "a")["recommendations"])
+    merged = merge_findings(merged, attribute_findings({"recommendations": ["Enable AQE"]}, "b")["recommendations"])
+    
+    assert merged == ["Enable AQE", "Enable AQE"]
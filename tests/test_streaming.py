@@ -0,0 +1,110 @@
+"""Test suite for streaming per-agent progress"""
+
+import asyncio
+import json
+import time
+import pytest
+from fastapi.testclient import TestClient
+from agents import create_default_agents
+from orchestration.graph_builder import build_spark_optimization_graph
+from orchestration.state_model import create_agent_state
+
+
+def _state():
+    return create_agent_state(
+        job_id="stream_job",
+        job_name="Stream Job",
+        source_type="delta",
+        partition_count=5,
+        execution_time_ms=90000,
+        cpu_utilization=0.3,
+    )
+
+
+def _parse_sse(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["langgraph", "asyncio"])
+async def test_stream_yields_updates_before_slow_agents_finish(backend):
+    """Test that the first agent's update arrives without waiting for the rest"""
+    agents = create_default_agents()
+    fast_skew = agents["skew_agent"]
+    
+    async def slow_runtime(state):
+        await asyncio.sleep(0.2)
+        return await create_default_agents()["runtime_agent"](state)
+    
+    agents["runtime_agent"] = slow_runtime
+    agents["skew_agent"] = fast_skew
+    graph = build_spark_optimization_graph(agents, backend=backend)
+    
+    start = time.perf_counter()
+    arrivals = []
+    async for event in graph.stream(_state()):
+        arrivals.append((event.kind, event.node, time.perf_counter() - start))
+    
+    assert arrivals[0][:2] == ("update", "metadata_agent")
+    assert arrivals[0][2] < 0.1
+    assert [kind for kind, _, _ in arrivals].count("final") == 1
+    assert arrivals[-1][0] == "final"
+
+
+@pytest.mark.asyncio
+async def test_stream_final_state_matches_run():
+    """Test that the streamed final state equals the state run() returns"""
+    graph = build_spark_optimization_graph(create_default_agents())
+    
+    events = [event async for event in graph.stream(_state())]
+    result = await graph.run(_state())
+    
+    final = events[-1].data
+    assert final["recommendations"] == result["recommendations"]
+    assert final["skipped_nodes"] == result["skipped_nodes"]
+    assert sorted(e.node for e in events[:-1]) == sorted(create_default_agents())
+
+
+@pytest.mark.asyncio
+async def test_stream_deadline_reports_workflow_timeout():
+    """Test that the hard deadline ends the stream with partial results"""
+    agents = create_default_agents()
+    
+    async def stuck_metadata(state):
+        # Ignores cancellation once, outliving its node budget
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            await asyncio.sleep(10)
+    
+    agents["metadata_agent"] = stuck_metadata
+    graph = build_spark_optimization_graph(agents, backend="asyncio")
+    
+    events = [event async for event in graph.stream(_state(), deadline_s=0.1)]
+    
+    assert events[-2].node == "workflow"
+    assert events[-1].kind == "final"
+
+
+def test_sse_endpoint_streams_agent_and_complete_events():
+    """Test that the endpoint emits one agent event per agent, then the response"""
+    from app.main import app
+    
+    client = TestClient(app)
+    response = client.post(
+        "/api/v1/analyze/job/stream",
+        json={"job_id": "sse_job", "job_name": "SSE", "metrics": {"partition_count": 4, "source_type": "delta"}}
+    )
+    
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(response.text)
+    assert events[-1][0] == "complete"
+    assert events[-1][1]["job_id"] == "sse_job"
+    agent_events = [data for kind, data in events if kind == "agent"]
+    assert sorted(e["agent"] for e in agent_events) == sorted(create_default_agents())
+    streamed = {r for e in agent_events for r in e["recommendations"]}
+    assert streamed == set(events[-1][1]["recommendations"])
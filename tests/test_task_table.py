@@ -0,0 +1,108 @@
+"""Test suite for the columnar task-metrics cache"""
+
+import json
+import os
+import numpy as np
+from connectors.spark_event_parser import SparkEventParser
+from connectors.task_table import TaskTableCache
+
+
+def _write_log(path, tasks=30):
+    lines = []
+    for task_id in range(tasks):
+        lines.append({
+            "Event": "SparkListenerTaskEnd",
+            "Stage ID": task_id % 3,
+            "Stage Attempt ID": 0,
+            "Task End Reason": {"Reason": "TaskKilled" if task_id == 4 else "Success"},
+            "Task Info": {"Task ID": task_id, "Executor ID": str(task_id % 2),
+                          "Launch Time": 100, "Finish Time": 100 + task_id},
+            "Task Metrics": {"JVM GC Time": 1,
+                             "Shuffle Read Metrics": {"Remote Bytes Read": task_id * 10}},
+        })
+    path.write_text("".join(json.dumps(line) + "\n" for line in lines))
+    return str(path)
+
+
+def test_task_table_is_built_once_and_memory_mapped(tmp_path, monkeypatch):
+    """Test that a cached log is loaded from disk instead of parsed again"""
+    log = _write_log(tmp_path / "eventlog")
+    cache = TaskTableCache(str(tmp_path / "cache"))
+    
+    table = cache.get(log)
+    parses = []
+    monkeypatch.setattr(SparkEventParser, "parse_file", lambda *args, **kwargs: parses.append(args))
+    cached = cache.get(log)
+    
+    assert parses == []
+    assert isinstance(cached.tasks, np.memmap)
+    assert len(cached) == 30
+    assert cached.tasks["task_id"].tolist() == list(range(30))
+    assert cached.tasks["duration_ms"].tolist() == list(range(30))
+    assert [cached.executors[i] for i in cached.tasks["executor"][:3]] == ["0", "1", "0"]
+    assert np.array_equal(cached.tasks, table.tasks)
+
+
+def test_rewritten_log_gets_a_new_table(tmp_path):
+    """Test that the key follows mtime/size and stale tables are removed"""
+    log = _write_log(tmp_path / "eventlog")
+    cache = TaskTableCache(str(tmp_path / "cache"))
+    first_key = cache.key(log)
+    cache.get(log)
+    
+    _write_log(tmp_path / "eventlog", tasks=40)
+    os.utime(log, ns=(1, 10 ** 18))
+    table = cache.get(log)
+    
+    assert cache.key(log) != first_key
+    assert len(table) == 40
+    assert os.listdir(tmp_path / "cache") == [cache.key(log)]
+
+
+def test_stage_sizes_feed_the_skew_statistics(tmp_path):
+    """Test per-stage grouping of a metric, without killed attempts"""
+    table = TaskTableCache(str(tmp_path / "cache")).get(_write_log(tmp_path / "eventlog"))
+    
+    sizes = table.stage_sizes("shuffle_read_bytes")
+    
+    assert sorted(sizes) == ["0", "1", "2"]
+    assert sizes["1"].tolist() == [task_id * 10 for task_id in range(1, 30, 3) if task_id != 4]
+
+
+def test_aggregate_is_cached_as_json_in_a_private_directory(tmp_path, monkeypatch):
+    """Test that the aggregate round-trips through JSON and no pickle is written"""
+    log = _write_log(tmp_path / "eventlog")
+    with open(log, "a") as out:
+        out.write(json.dumps({"Event": "SparkListenerStageCompleted", "Stage Info": {
+            "Stage ID": 1, "Stage Attempt ID": 0, "Stage Name": "map", "Parent IDs": [0]}}) + "\n")
+        out.write(json.dumps({"Event": "SparkListenerExecutorAdded", "Executor ID": "1", "Timestamp": 50,
+                              "Executor Info": {"Host": "worker-1", "Total Cores": 4}}) + "\n")
+        out.write(json.dumps({"Event": "org.apache.spark.sql.execution.ui.SparkListenerSQLExecutionStart",
+                              "executionId": 7, "time": 90}) + "\n")
+    cache = TaskTableCache(str(tmp_path / "cache"))
+    
+    parsed, _ = cache.get_with_aggregate(log)
+    monkeypatch.setattr(SparkEventParser, "parse_file", lambda *args, **kwargs: None)
+    cached, _ = cache.get_with_aggregate(log)
+    
+    files = os.listdir(tmp_path / "cache" / cache.key(log))
+    assert cached == parsed
+    assert cached.stages[(1, 0)].parent_ids == (0,)
+    assert cached.sql_open_starts == {7: 90}
+    assert sorted(files) == ["aggregate.json", "executors.npy", "tasks.npy"]
+    assert os.stat(tmp_path / "cache").st_mode & 0o777 == 0o700
+
+
+def test_cache_directory_writable_by_others_is_not_used(tmp_path):
+    """Test that a directory another user could write to is neither read nor written"""
+    log = _write_log(tmp_path / "eventlog")
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    cache = TaskTableCache(str(shared))
+    
+    table = cache.get(log)
+    
+    assert len(table) == 30
+    assert os.listdir(shared) == []
+    assert cache.load(log) is None
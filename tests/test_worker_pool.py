@@ -0,0 +1,109 @@
+"""Test suite for the background analysis worker pool"""
+
+import asyncio
+import time
+import pytest
+from fastapi.testclient import TestClient
+from orchestration.worker_pool import AnalysisWorkerPool, QueueFullError
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_completes_jobs():
+    """Test that submitted jobs run and their result is kept on the ticket"""
+    pool = AnalysisWorkerPool(workers=2, max_queue=10)
+    
+    async def job():
+        return "done"
+    
+    ticket = pool.submit(job)
+    await asyncio.sleep(0.01)
+    
+    assert pool.status(ticket.ticket_id).status == "completed"
+    assert pool.status(ticket.ticket_id).result == "done"
+    assert pool.metrics()["completed"] == 1
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_applies_backpressure():
+    """Test that submissions beyond the queue capacity are rejected"""
+    pool = AnalysisWorkerPool(workers=1, max_queue=1)
+    release = asyncio.Event()
+    
+    async def blocked_job():
+        await release.wait()
+    
+    pool.submit(blocked_job)
+    await asyncio.sleep(0)  # the worker picks up the first job
+    pool.submit(blocked_job)
+    with pytest.raises(QueueFullError):
+        pool.submit(blocked_job)
+    
+    metrics = pool.metrics()
+    assert metrics["queue_depth"] == 1
+    assert metrics["busy_workers"] == 1
+    assert metrics["rejected"] == 1
+    release.set()
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_records_failures():
+    """Test that a failing job marks its ticket as failed"""
+    pool = AnalysisWorkerPool(workers=1, max_queue=10)
+    
+    async def failing_job():
+        raise RuntimeError("boom")
+    
+    ticket = pool.submit(failing_job)
+    await asyncio.sleep(0.01)
+    
+    assert ticket.status == "failed"
+    assert ticket.error == "boom"
+    assert pool.metrics()["service_time"]["count"] == 1
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_evicts_finished_tickets_past_a_running_one():
+    """Test that a long-running job does not stop finished tickets from being evicted"""
+    pool = AnalysisWorkerPool(workers=2, max_queue=2, max_tickets=4)
+    release = asyncio.Event()
+    
+    async def long_job():
+        await release.wait()
+    
+    async def job():
+        return "done"
+    
+    long_ticket = pool.submit(long_job)
+    for _ in range(50):
+        pool.submit(job)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+    
+    assert len(pool._tickets) <= pool.max_tickets
+    assert pool.status(long_ticket.ticket_id).status == "running"
+    release.set()
+    await pool.stop()
+
+
+def test_analyze_job_async_submit_and_poll():
+    """Test that async=true returns a ticket that can be polled to completion"""
+    from app.main import app
+    
+    payload = {"job_id": "async_job", "job_name": "Async", "metrics": {"execution_time_ms": 90000}}
+    with TestClient(app) as client:
+        submitted = client.post("/api/v1/analyze/job?async=true", json=payload)
+        assert submitted.status_code == 202
+        
+        status_url = submitted.json()["status_url"]
+        for _ in range(50):
+            status = client.get(status_url).json()
+            if status["status"] == "completed":
+                break
+            time.sleep(0.01)
+        
+        assert status["result"]["job_id"] == "async_job"
+        assert client.get("/api/v1/analyze/status/unknown").status_code == 404
+        assert client.get("/api/v1/analyze/queue").json()["completed"] >= 1